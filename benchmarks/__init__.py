@@ -0,0 +1,4 @@
+"""
+Benchmarks for the trace parsing and call tree building paths, using large synthetic traces.
+Run them using ``python -m benchmarks``, see ``benchmarks/README.md``.
+"""
@@ -0,0 +1,314 @@
+"""
+Deterministic generators of large synthetic traces, in the formats of the supported RPCs.
+Every generator derives the same call tree from the same :class:`CallShape` and seed,
+so the results of the different paths can be compared.
+"""
+
+import json
+import random
+from dataclasses import dataclass, field
+
+CALL_KINDS = ("CALL", "STATICCALL", "DELEGATECALL")
+ROOT_ADDRESS = "0x274b028b03a250ca03644e6c578d81f019ee1323"
+SENDER_ADDRESS = "0x1e59ce931b4cfea3fe4b875411e280e173cb7a9c"
+START_GAS = 30_000_000
+
+
+@dataclass
+class CallShape:
+    """
+    The shape of a synthetic call tree.
+    """
+
+    num_calls: int = 100
+    """The number of sub-calls, besides the root call and the CREATE chain."""
+
+    max_depth: int = 16
+    """The depth of the deepest sub-call, which is always reached."""
+
+    create_chain: int = 4
+    """The number of nested ``CREATE`` calls, each deploying from the previous one."""
+
+    ops_per_call: int = 20
+    """The number of other operations executed by each call."""
+
+    logs_per_call: int = 2
+    """The number of ``LOG2`` operations executed by each call."""
+
+    memory_words: int = 32
+    """The size of the memory of each call, in 32-byte words."""
+
+    seed: int = 0
+    """The seed of the random generator, the same seed gives the same traces."""
+
+
+@dataclass
+class SyntheticCall:
+    kind: str
+    address: str
+    depth: int
+    selector: str
+    gas_used: int
+    calls: list["SyntheticCall"] = field(default_factory=list)
+
+
+def generate_calltree(shape: CallShape) -> SyntheticCall:
+    """
+    Generate the synthetic call tree every trace format is derived from.
+    """
+    rng = random.Random(shape.seed)
+
+    def new_call(kind: str, parent: SyntheticCall) -> SyntheticCall:
+        call = SyntheticCall(
+            kind=kind,
+            address=f"0x{rng.getrandbits(160):040x}",
+            depth=parent.depth + 1,
+            selector=f"{rng.getrandbits(32):08x}",
+            gas_used=rng.randint(100, 5_000),
+        )
+        parent.calls.append(call)
+        return call
+
+    root = SyntheticCall("CALL", ROOT_ADDRESS, 0, f"{rng.getrandbits(32):08x}", 21_000)
+    calls = [root]
+
+    # A single deep branch, so the maximum depth is always reached.
+    parent = root
+    for _ in range(min(shape.max_depth, shape.num_calls)):
+        parent = new_call(rng.choice(CALL_KINDS), parent)
+        calls.append(parent)
+
+    # The other calls attach to random calls, shallow enough.
+    while len(calls) <= shape.num_calls:
+        parent = rng.choice(calls)
+        if parent.depth < shape.max_depth:
+            calls.append(new_call(rng.choice(CALL_KINDS), parent))
+
+    parent = root
+    for _ in range(shape.create_chain):
+        parent = new_call("CREATE", parent)
+
+    # Gas used includes the sub-calls.
+    for call in reversed(_walk(root)):
+        call.gas_used += sum(c.gas_used for c in call.calls)
+
+    return root
+
+
+def generate_struct_logs(shape: CallShape) -> list[dict]:
+    """
+    Generate the struct logs of ``debug_traceTransaction``, with memory enabled.
+    """
+    rng = random.Random(shape.seed)
+    frames: list[dict] = []
+    gas = START_GAS
+
+    def frame(op: str, depth: int, stack: list[str], memory: list[str], cost: int = 3):
+        nonlocal gas
+        frames.append(
+            {
+                "pc": len(frames) % 0x6000,
+                "op": op,
+                "gas": gas,
+                "gasCost": cost,
+                "depth": depth,
+                "stack": stack,
+                "memory": memory,
+            }
+        )
+        gas = max(gas - cost, 0)
+
+    def emit(call: SyntheticCall):
+        depth = call.depth + 1
+        memory = [f"{rng.getrandbits(256):064x}" for _ in range(shape.memory_words)]
+        steps = len(call.calls) + 1
+        for index in range(steps):
+            for _ in range(shape.ops_per_call // steps):
+                frame("PUSH1", depth, ["0x20", "0x0"], memory)
+
+            for _ in range(shape.logs_per_call // steps + (index < shape.logs_per_call % steps)):
+                topics = [f"0x{rng.getrandbits(256):064x}" for _ in range(2)]
+                frame("LOG2", depth, ["0x0", *reversed(topics), "0x40", "0x0"], memory, 1_500)
+
+            if index == len(call.calls):
+                break
+
+            sub_call = call.calls[index]
+            if sub_call.kind == "CREATE":
+                frame("CREATE", depth, ["0x44", "0x0", "0x0"], memory, 32_000)
+                emit(sub_call)
+                # The address is pushed, above the offset and size of the init code.
+                frame("POP", depth, ["0x44", "0x0", "0x0", "0x0", sub_call.address], memory)
+                continue
+
+            stack = ["0x20", "0x0", "0x44", "0x0", sub_call.address, "0xffff"]
+            if sub_call.kind == "CALL":
+                stack.insert(4, "0x0")
+
+            frame(sub_call.kind, depth, stack, memory, 2_600)
+            emit(sub_call)
+            frame("POP", depth, ["0x1"], memory)
+
+        frame("RETURN", depth, ["0x20", "0x0"], memory, 0)
+
+    emit(generate_calltree(shape))
+    return frames
+
+
+def generate_call_tracer_trace(shape: CallShape) -> dict:
+    """
+    Generate the response of ``debug_traceTransaction`` using ``tracer=callTracer``.
+    """
+
+    def to_data(call: SyntheticCall, sender: str) -> dict:
+        data = {
+            "type": call.kind,
+            "from": sender,
+            "to": call.address,
+            "value": "0x0",
+            "gas": hex(START_GAS >> call.depth),
+            "gasUsed": hex(call.gas_used),
+            "input": f"0x{call.selector}{'00' * 64}",
+            "output": f"0x{'00' * 31}01",
+            "calls": [],
+        }
+        # Built iteratively, deeper than the recursion limit is fine.
+        stack.extend((c, data) for c in reversed(call.calls))
+        return data
+
+    root_call = generate_calltree(shape)
+    stack: list[tuple[SyntheticCall, dict]] = []
+    root = to_data(root_call, SENDER_ADDRESS)
+    while stack:
+        call, parent = stack.pop()
+        parent["calls"].append(to_data(call, parent["to"]))
+
+    return root
+
+
+def generate_parity_trace_list(shape: CallShape) -> list[dict]:
+    """
+    Generate the response of ``trace_transaction``, with a trace per call.
+    """
+    root = generate_calltree(shape)
+    traces: list[dict] = []
+    stack: list[tuple[SyntheticCall, str, list[int]]] = [(root, SENDER_ADDRESS, [])]
+    while stack:
+        call, sender, trace_address = stack.pop()
+        trace: dict = {
+            "subtraces": len(call.calls),
+            "traceAddress": trace_address,
+            "transactionHash": f"0x{'ab' * 32}",
+            "transactionPosition": 0,
+            "blockHash": f"0x{'cd' * 32}",
+            "blockNumber": 1,
+        }
+        if call.kind == "CREATE":
+            trace["type"] = "create"
+            trace["action"] = {"from": sender, "gas": "0xffff", "init": "0x6000", "value": "0x0"}
+            trace["result"] = {
+                "address": call.address,
+                "code": "0x6000",
+                "gasUsed": hex(call.gas_used),
+            }
+        else:
+            trace["type"] = "call"
+            trace["action"] = {
+                "callType": call.kind.lower(),
+                "from": sender,
+                "to": call.address,
+                "gas": "0xffff",
+                "input": f"0x{call.selector}{'00' * 64}",
+                "value": "0x0",
+            }
+            trace["result"] = {"gasUsed": hex(call.gas_used), "output": f"0x{'00' * 31}01"}
+
+        traces.append(trace)
+        stack.extend(
+            (c, call.address, [*trace_address, i]) for i, c in reversed(list(enumerate(call.calls)))
+        )
+
+    return traces
+
+
+def generate_vmtrace_response(shape: CallShape) -> bytes:
+    """
+    Generate the raw response of ``trace_replayTransaction`` with a ``vmTrace``.
+    """
+    rng = random.Random(shape.seed)
+    gas = START_GAS
+
+    def op(ops: list, name: str, push: list[str] | None = None, cost: int = 3, **kwargs):
+        nonlocal gas
+        gas = max(gas - cost, 0)
+        executed = {"used": gas, "push": push or [], "mem": kwargs.get("mem"), "store": None}
+        ops.append(
+            {
+                "pc": len(ops),
+                "cost": cost,
+                "ex": executed,
+                "sub": kwargs.get("sub"),
+                "op": name,
+                "idx": str(len(ops)),
+            }
+        )
+
+    def push(ops: list, *values: str):
+        for value in values:
+            op(ops, "PUSH1", [value])
+
+    def to_vmtrace(call: SyntheticCall) -> dict:
+        ops: list[dict] = []
+        memory = f"0x{rng.getrandbits(256 * shape.memory_words):0{64 * shape.memory_words}x}"
+        push(ops, f"0x{32 * shape.memory_words:x}", "0x0", "0x0")
+        op(ops, "CALLDATACOPY", mem={"off": 0, "data": memory})
+        steps = len(call.calls) + 1
+        for index in range(steps):
+            for _ in range(shape.ops_per_call // (2 * steps)):
+                push(ops, "0x1")
+                op(ops, "POP", cost=2)
+
+            for _ in range(shape.logs_per_call // steps + (index < shape.logs_per_call % steps)):
+                push(ops, *(f"0x{rng.getrandbits(256):x}" for _ in range(2)), "0x40", "0x0")
+                op(ops, "LOG2", cost=1_500)
+
+            if index == len(call.calls):
+                break
+
+            sub_call = call.calls[index]
+            if sub_call.kind == "CREATE":
+                push(ops, "0x44", "0x0", "0x0")
+                op(ops, "CREATE", [sub_call.address], 32_000, sub=to_vmtrace(sub_call))
+            else:
+                push(ops, "0x20", "0x0", "0x44", "0x0")
+                if sub_call.kind == "CALL":
+                    push(ops, "0x0")
+
+                push(ops, sub_call.address, "0xffff")
+                op(ops, sub_call.kind, ["0x1"], 2_600, sub=to_vmtrace(sub_call))
+
+            op(ops, "POP", cost=2)
+
+        push(ops, "0x20", "0x0")
+        op(ops, "RETURN", cost=0)
+        return {"code": "0x", "ops": ops}
+
+    vmtrace = to_vmtrace(generate_calltree(shape))
+    response = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": {"output": "0x", "stateDiff": None, "trace": [], "vmTrace": vmtrace},
+    }
+    return json.dumps(response).encode()
+
+
+def _walk(root: SyntheticCall) -> list[SyntheticCall]:
+    # Every call, parents before their sub-calls.
+    calls = []
+    stack = [root]
+    while stack:
+        call = stack.pop()
+        calls.append(call)
+        stack.extend(call.calls)
+
+    return calls
@@ -0,0 +1,315 @@
+"""
+Measure the throughput and peak memory of each benchmark case, as JSON results
+that can be compared between runs.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any
+
+from benchmarks.generators import (
+    ROOT_ADDRESS,
+    CallShape,
+    generate_call_tracer_trace,
+    generate_parity_trace_list,
+    generate_struct_logs,
+    generate_vmtrace_response,
+)
+from evm_trace.base import CallTreeNode
+from evm_trace.codec import decode, encode
+from evm_trace.display import get_tree_display
+from evm_trace.gas import get_gas_report
+from evm_trace.geth import (
+    create_trace_frames,
+    get_calltree_from_geth_call_trace,
+    get_calltree_from_geth_trace,
+)
+from evm_trace.parity import ParityTraceList, get_calltree_from_parity_trace
+from evm_trace.vmtrace import from_rpc_response, to_trace_frames
+
+SCALES = {
+    "tiny": CallShape(num_calls=8, max_depth=4, create_chain=2, ops_per_call=4, memory_words=2),
+    "small": CallShape(),
+    "medium": CallShape(num_calls=1_000, max_depth=64, create_chain=16, memory_words=64),
+    "large": CallShape(
+        num_calls=5_000, max_depth=128, create_chain=32, logs_per_call=8, memory_words=256
+    ),
+}
+
+
+@dataclass
+class Case:
+    name: str
+    """The name of the case, such as the function measured."""
+
+    setup: Callable[[CallShape], Any]
+    """Generate the input, which is not measured."""
+
+    run: Callable[[Any], Any]
+    """The measured operation."""
+
+    size: Callable[[Any], int]
+    """The number of items in the input, for the throughput."""
+
+    unit: str
+    """The name of the items."""
+
+
+def _consume(iterator: Iterable):
+    # Only one item is kept at a time, like when streaming.
+    deque(iterator, maxlen=0)
+
+
+def _count_calls(calltree: Any) -> int:
+    # Either the callTracer data or a call tree.
+    count = 0
+    stack = [calltree]
+    while stack:
+        call = stack.pop()
+        count += 1
+        stack.extend((call.get("calls") if isinstance(call, dict) else call.calls) or [])
+
+    return count
+
+
+def _get_calltree(shape: CallShape):
+    return get_calltree_from_geth_call_trace(generate_call_tracer_trace(shape))
+
+
+CASES = [
+    Case(
+        name="create_trace_frames",
+        setup=generate_struct_logs,
+        run=lambda logs: _consume(create_trace_frames(logs)),
+        size=len,
+        unit="frames",
+    ),
+    Case(
+        name="get_calltree_from_geth_trace",
+        setup=generate_struct_logs,
+        run=lambda logs: get_calltree_from_geth_trace(
+            create_trace_frames(logs), address=ROOT_ADDRESS
+        ),
+        size=len,
+        unit="frames",
+    ),
+    Case(
+        name="get_calltree_from_geth_call_trace",
+        setup=generate_call_tracer_trace,
+        run=get_calltree_from_geth_call_trace,
+        size=_count_calls,
+        unit="calls",
+    ),
+    Case(
+        name="ParityTraceList.model_validate",
+        setup=generate_parity_trace_list,
+        run=ParityTraceList.model_validate,
+        size=len,
+        unit="traces",
+    ),
+    Case(
+        name="get_calltree_from_parity_trace",
+        setup=lambda shape: ParityTraceList.model_validate(generate_parity_trace_list(shape)),
+        run=get_calltree_from_parity_trace,
+        size=lambda traces: len(traces.root),
+        unit="traces",
+    ),
+    Case(
+        name="from_rpc_response",
+        setup=generate_vmtrace_response,
+        run=from_rpc_response,
+        size=len,
+        unit="bytes",
+    ),
+    Case(
+        name="to_trace_frames",
+        setup=lambda shape: from_rpc_response(generate_vmtrace_response(shape)),
+        run=lambda vmtrace: _consume(to_trace_frames(vmtrace, address=ROOT_ADDRESS)),
+        size=lambda vmtrace: sum(1 for _ in to_trace_frames(vmtrace, copy_memory=False)),
+        unit="frames",
+    ),
+    Case(
+        name="get_gas_report",
+        setup=_get_calltree,
+        run=get_gas_report,
+        size=_count_calls,
+        unit="calls",
+    ),
+    Case(
+        name="get_tree_display",
+        setup=_get_calltree,
+        run=get_tree_display,
+        size=_count_calls,
+        unit="calls",
+    ),
+    # The codec compared with the pydantic JSON serialization it replaces.
+    Case(
+        name="codec.encode",
+        setup=_get_calltree,
+        run=encode,
+        size=_count_calls,
+        unit="calls",
+    ),
+    Case(
+        name="CallTreeNode.model_dump_json",
+        setup=_get_calltree,
+        run=lambda calltree: calltree.model_dump_json(),
+        size=_count_calls,
+        unit="calls",
+    ),
+    Case(
+        name="codec.decode",
+        setup=lambda shape: encode(_get_calltree(shape)),
+        run=decode,
+        size=lambda data: _count_calls(decode(data)),
+        unit="calls",
+    ),
+    Case(
+        name="codec.decode(compact=True)",
+        setup=lambda shape: encode(_get_calltree(shape)),
+        run=lambda data: decode(data, compact=True),
+        size=lambda data: _count_calls(decode(data)),
+        unit="calls",
+    ),
+    Case(
+        name="CallTreeNode.model_validate_json",
+        setup=lambda shape: _get_calltree(shape).model_dump_json(),
+        run=CallTreeNode.model_validate_json,
+        size=lambda data: _count_calls(CallTreeNode.model_validate_json(data)),
+        unit="calls",
+    ),
+]
+
+
+def run_case(case: Case, shape: CallShape, repeat: int = 3) -> dict:
+    """
+    Measure a case, using the best and median of ``repeat`` runs after a warm-up run.
+    The peak memory is measured separately, since tracing memory slows down the run.
+
+    Args:
+        case (:class:`~benchmarks.runner.Case`): The case to measure.
+        shape (:class:`~benchmarks.generators.CallShape`): The shape of the input.
+        repeat (int): The number of measured runs.
+
+    Returns:
+        dict: The result of the case.
+    """
+    data = case.setup(shape)
+    size = case.size(data)
+    case.run(data)
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.run(data)
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        case.run(data)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(durations)
+    return {
+        "name": case.name,
+        "size": size,
+        "unit": case.unit,
+        "repeat": repeat,
+        "min_seconds": min(durations),
+        "median_seconds": median,
+        "throughput": size / median if median else None,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def run_benchmarks(
+    shape: CallShape, repeat: int = 3, cases: Iterable[Case] = CASES, scale: str = "custom"
+) -> dict:
+    """
+    Run the benchmark cases.
+
+    Returns:
+        dict: The environment of the run and the result of each case.
+    """
+    try:
+        package_version = version("evm-trace")
+    except PackageNotFoundError:
+        package_version = None
+
+    return {
+        "metadata": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "evm_trace_version": package_version,
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "scale": scale,
+            "shape": asdict(shape),
+        },
+        "results": [run_case(case, shape, repeat=repeat) for case in cases],
+    }
+
+
+def compare_results(baseline: dict, results: dict) -> list[str]:
+    """
+    Compare the results of two runs, as the ratio of their median times and peak memory,
+    where a ratio above ``1`` is slower or bigger than the baseline.
+    """
+    baseline_cases = {r["name"]: r for r in baseline["results"]}
+    lines = [f"{'case':<36} {'time':>8} {'memory':>8}"]
+    for result in results["results"]:
+        if not (base := baseline_cases.get(result["name"])):
+            continue
+
+        time_ratio = result["median_seconds"] / base["median_seconds"]
+        memory_ratio = result["peak_memory_bytes"] / max(base["peak_memory_bytes"], 1)
+        lines.append(f"{result['name']:<36} {time_ratio:>7.2f}x {memory_ratio:>7.2f}x")
+
+    return lines
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark evm-trace using synthetic traces."
+    )
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-k", "--filter", help="Only run the cases containing this text.")
+    parser.add_argument("-o", "--output", help="Write the JSON results to this file.")
+    parser.add_argument("--compare", help="Compare with the JSON results of a previous run.")
+    args = parser.parse_args(argv)
+
+    shape = replace(SCALES[args.scale], seed=args.seed)
+    cases = [c for c in CASES if not args.filter or args.filter in c.name]
+    results = run_benchmarks(shape, repeat=args.repeat, cases=cases, scale=args.scale)
+    for result in results["results"]:
+        print(
+            f"{result['name']:<36} {result['median_seconds'] * 1000:>10.2f} ms "
+            f"{result['throughput'] or 0:>14,.0f} {result['unit']}/s "
+            f"{result['peak_memory_bytes'] / 2**20:>9.2f} MiB",
+            file=sys.stderr,
+        )
+
+    if args.compare:
+        with open(args.compare) as file:
+            print("\n".join(compare_results(json.load(file), results)), file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    else:
+        print(output)
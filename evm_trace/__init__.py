@@ -1,12 +1,44 @@
-from evm_trace.base import CallTreeNode
-from evm_trace.enums import CallType
-from evm_trace.geth import (
-    TraceFrame,
-    create_trace_frames,
-    get_calltree_from_geth_call_trace,
-    get_calltree_from_geth_trace,
-)
-from evm_trace.parity import ParityTrace, ParityTraceList, get_calltree_from_parity_trace
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from evm_trace.base import CallTreeNode
+    from evm_trace.enums import CallType
+    from evm_trace.geth import (
+        TraceFrame,
+        create_trace_frames,
+        get_calltree_from_geth_call_trace,
+        get_calltree_from_geth_trace,
+    )
+    from evm_trace.parity import ParityTrace, ParityTraceList, get_calltree_from_parity_trace
+
+# NOTE: Submodules (and their dependencies, such as pydantic and py-evm)
+#   are only imported when one of their members is first accessed.
+_LAZY_IMPORTS = {
+    "CallTreeNode": "evm_trace.base",
+    "CallType": "evm_trace.enums",
+    "create_trace_frames": "evm_trace.geth",
+    "get_calltree_from_geth_trace": "evm_trace.geth",
+    "get_calltree_from_geth_call_trace": "evm_trace.geth",
+    "get_calltree_from_parity_trace": "evm_trace.parity",
+    "ParityTrace": "evm_trace.parity",
+    "ParityTraceList": "evm_trace.parity",
+    "TraceFrame": "evm_trace.geth",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if module_name := _LAZY_IMPORTS.get(name):
+        value = getattr(import_module(module_name), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
+
 
 __all__ = [
     "CallTreeNode",
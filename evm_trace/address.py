@@ -0,0 +1,181 @@
+from typing import TYPE_CHECKING
+
+from eth_utils import keccak
+
+from evm_trace.base import _to_bytes
+from evm_trace.enums import CallType
+
+if TYPE_CHECKING:
+    from evm_trace.geth import TraceFrame
+
+
+def get_create_address(sender: bytes, nonce: int) -> bytes:
+    """
+    Compute the address of a contract deployed using ``CREATE``, which is the last 20 bytes
+    of the keccak hash of the RLP-encoded sender and nonce.
+
+    Args:
+        sender (bytes): The address of the deploying account or contract.
+        nonce (int): The nonce of the sender when deploying.
+
+    Returns:
+        bytes: The contract address.
+    """
+    payload = _rlp_encode_bytes(sender) + _rlp_encode_int(nonce)
+    return keccak(_rlp_encode_length(len(payload), 0xC0) + payload)[12:]
+
+
+def get_create2_address(sender: bytes, salt: bytes, init_code: bytes) -> bytes:
+    """
+    Compute the address of a contract deployed using ``CREATE2``, see EIP-1014.
+
+    Args:
+        sender (bytes): The address of the deploying contract.
+        salt (bytes): The 32-byte salt.
+        init_code (bytes): The code executed to deploy the contract.
+
+    Returns:
+        bytes: The contract address.
+    """
+    return keccak(b"\xff" + sender + salt.rjust(32, b"\x00") + keccak(init_code))[12:]
+
+
+class CreateAddressResolver:
+    """
+    Compute the addresses of ``CREATE`` and ``CREATE2`` calls at the frame they are made,
+    instead of looking ahead to the frame they return to. The nonces of the senders are
+    tracked as contracts are deployed, and contracts deployed during the transaction start
+    at nonce ``1``. ``CREATE2`` only needs memory, for the init code. Since reverted calls
+    also revert the nonces, take a :meth:`checkpoint` before each call and :meth:`rollback`
+    to it if the call fails. Pass the depth of every frame to :meth:`observe`, since a
+    ``CREATE`` that fails before running does not use the nonce.
+
+    Usage example::
+
+        resolver = CreateAddressResolver({tx.receiver: contract_nonce})
+        frames = create_trace_frames(struct_logs, lookahead=False)
+        calltree = get_calltree_from_geth_trace(
+            frames, create_resolver=resolver, address=tx.receiver
+        )
+    """
+
+    def __init__(self, nonces: dict[str | bytes, int] | None = None):
+        """
+        Args:
+            nonces (dict[str | bytes, int] | None): The nonces of the contracts deploying
+              with ``CREATE``, before the transaction.
+        """
+        self.nonces: dict[bytes, int] = {
+            _to_bytes(address): nonce for address, nonce in (nonces or {}).items()
+        }
+        # The previous nonce of each change, to undo them.
+        self._journal: list[tuple[bytes, int | None]] = []
+        # The checkpoint and depth of the last CREATE, until the next frame.
+        self._pending: tuple[int, int] | None = None
+
+    @property
+    def pending(self) -> bool:
+        """
+        Whether the last ``CREATE`` or ``CREATE2`` needs the depth of the next frame.
+        """
+        return self._pending is not None
+
+    def observe(self, depth: int) -> bool:
+        """
+        Confirm the last ``CREATE`` or ``CREATE2`` using the depth of the frame after it.
+        The nonce is only used when the deployment runs, which increases the depth. One
+        failing before running, such as without enough balance or at the maximum call
+        depth, is followed by a frame at the same depth instead.
+
+        Args:
+            depth (int): The depth of the frame.
+
+        Returns:
+            bool: Whether the last ``CREATE`` or ``CREATE2`` did not run.
+        """
+        if self._pending is None:
+            return False
+
+        checkpoint, create_depth = self._pending
+        self._pending = None
+        if depth > create_depth:
+            return False
+
+        self.rollback(checkpoint)
+        return True
+
+    def checkpoint(self) -> int:
+        """
+        Get a checkpoint of the nonces, such as before a call.
+        """
+        return len(self._journal)
+
+    def rollback(self, checkpoint: int):
+        """
+        Undo the changes to the nonces since a checkpoint, such as when a call reverts.
+        """
+        while len(self._journal) > checkpoint:
+            address, nonce = self._journal.pop()
+            if nonce is None:
+                del self.nonces[address]
+            else:
+                self.nonces[address] = nonce
+
+    def resolve(self, frame: "TraceFrame", sender: bytes | None) -> bytes | None:
+        """
+        Compute the address of a ``CREATE`` or ``CREATE2`` frame.
+
+        Args:
+            frame (:class:`~evm_trace.geth.TraceFrame`): The ``CREATE`` or ``CREATE2`` frame.
+            sender (bytes | None): The address of the contract executing the frame.
+
+        Returns:
+            bytes | None: The address of the contract, or ``None`` when it cannot be computed,
+            such as without the nonce of the sender or the memory.
+        """
+        if sender is None:
+            return None
+
+        sender = bytes(sender)
+        nonce = self.nonces.get(sender)
+        address = None
+        if frame.op == CallType.CREATE.value and nonce is not None:
+            address = get_create_address(sender, nonce)
+
+        elif frame.op == CallType.CREATE2.value and frame.has_memory and len(frame.stack) >= 4:
+            init_code = frame.memory.get(frame.stack[-2], frame.stack[-3])
+            address = get_create2_address(sender, bytes(frame.stack[-4]), bytes(init_code))
+
+        # Deploying increments the nonce of the sender, even if the deployment reverts,
+        # once it runs.
+        self._pending = (len(self._journal), frame.depth)
+        if nonce is not None:
+            self._set_nonce(sender, nonce + 1)
+        if address is not None and address not in self.nonces:
+            self._set_nonce(address, 1)
+
+        return address
+
+    def _set_nonce(self, address: bytes, nonce: int):
+        self._journal.append((address, self.nonces.get(address)))
+        self.nonces[address] = nonce
+
+
+def _rlp_encode_bytes(value: bytes) -> bytes:
+    if len(value) == 1 and value[0] < 0x80:
+        return value
+
+    return _rlp_encode_length(len(value), 0x80) + value
+
+
+def _rlp_encode_int(value: int) -> bytes:
+    # Integers are encoded as big-endian bytes without leading zeroes, so `0` is empty.
+    return _rlp_encode_bytes(value.to_bytes((value.bit_length() + 7) // 8, "big"))
+
+
+def _rlp_encode_length(length: int, offset: int) -> bytes:
+    if length < 56:
+        return bytes((offset + length,))
+
+    length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes((offset + 55 + len(length_bytes),)) + length_bytes
@@ -0,0 +1,201 @@
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Collection, Iterable, Sequence
+from typing import Any
+
+from eth_pydantic_types import HexBytes
+from msgspec import Struct
+
+from evm_trace.base import CallTreeNode, CompactCallTreeNode, _to_bytes
+from evm_trace.enums import CALL_OPCODE_VALUES, CallType
+from evm_trace.geth import GethCallTreeStream, TraceFrame
+from evm_trace.stream import CallTreeBuilder, dispatch
+
+
+class Analyzer(ABC):
+    """
+    Base class for analyses over ``debug_traceTransaction`` struct logs, run
+    together in a single pass using :meth:`~evm_trace.analysis.analyze_geth_trace`.
+
+    Set ``opcodes`` to only receive the frames using one of those opcodes. Each frame is
+    decoded into a :class:`~evm_trace.geth.TraceFrame` at most once, and only if an analyzer
+    wants it. Set ``raw`` to receive the undecoded struct log ``dict`` instead.
+    """
+
+    opcodes: Collection[str] | None = None
+    """The opcodes of the frames to analyze, or ``None`` for every frame."""
+
+    raw: bool = False
+    """Whether to receive the undecoded struct log instead of a ``TraceFrame``."""
+
+    @abstractmethod
+    def on_frame(self, frame: Any):
+        """
+        Analyze a frame. **NOTE**: Frames are shared between analyzers, do not modify them.
+        """
+
+    @abstractmethod
+    def result(self) -> Any:
+        """
+        The result of the analysis, once every frame was analyzed.
+        """
+
+
+def analyze_geth_trace(data: Iterable[dict], analyzers: Sequence[Analyzer]) -> list[Any]:
+    """
+    Run analyzers over ``debug_traceTransaction`` struct logs in a single pass.
+
+    Usage example::
+
+        calltree, sstores, revert_locations = analyze_geth_trace(
+            struct_logs, [CallTreeAnalyzer(), SStoreCounter(), RevertLocator()]
+        )
+
+    Args:
+        data (Iterable[dict]): The response struct logs.
+        analyzers (Sequence[:class:`~evm_trace.analysis.Analyzer`]): The analyzers to run.
+
+    Returns:
+        list: The result of each analyzer, in order.
+    """
+    for raw_frame in data:
+        op = raw_frame["op"]
+        frame = None
+        for analyzer in analyzers:
+            opcodes = analyzer.opcodes
+            if opcodes is not None and op not in opcodes:
+                continue
+
+            elif analyzer.raw:
+                analyzer.on_frame(raw_frame)
+                continue
+
+            elif frame is None:
+                frame = TraceFrame.model_validate(raw_frame)
+
+            analyzer.on_frame(frame)
+
+    return [analyzer.result() for analyzer in analyzers]
+
+
+class CallTreeAnalyzer(Analyzer):
+    """
+    Build the call tree, like :meth:`~evm_trace.geth.get_calltree_from_geth_trace`.
+    Only the frames affecting the call tree are decoded.
+    """
+
+    def __init__(self, compact: bool = False, **root_node_kwargs):
+        self._stream = GethCallTreeStream(compact=compact, **root_node_kwargs)
+        self._builder = CallTreeBuilder()
+        dispatch(self._stream.start(), self._builder)
+
+    @property
+    def opcodes(self) -> Collection[str] | None:  # type: ignore[override]
+        return frozenset() if self._stream.done else self._stream.opcodes
+
+    def on_frame(self, frame: TraceFrame):
+        dispatch(self._stream.feed(frame), self._builder)
+
+    def result(self) -> CallTreeNode | CompactCallTreeNode:
+        dispatch(self._stream.finish(), self._builder)
+        return self._builder.root
+
+
+class SStoreCounter(Analyzer):
+    """
+    Count the ``SSTORE`` operations by contract address and storage slot.
+    The address is the one whose storage is written, which is the caller's in
+    ``DELEGATECALL`` and ``CALLCODE`` calls. It is ``None`` when unknown, such as for
+    the root call without ``address`` or for contracts deployed using ``CREATE``.
+    Frames without a stack are skipped.
+
+    Args:
+        address (str | bytes | None): The address of the contract called by the transaction.
+    """
+
+    opcodes = frozenset(("SSTORE", *CALL_OPCODE_VALUES))
+
+    def __init__(self, address: str | bytes | None = None) -> None:
+        self.counts: Counter[tuple[bytes | None, HexBytes]] = Counter()
+        # The storage address of each call in progress, the root call first.
+        self._addresses: list[bytes | None] = [_to_bytes(address) if address else None]
+
+    def on_frame(self, frame: TraceFrame):
+        # Back in a caller, or in a call entered without any frames received yet.
+        del self._addresses[frame.depth :]
+        while len(self._addresses) < frame.depth:
+            self._addresses.append(None)
+
+        if frame.op != "SSTORE":
+            # A call, its frames use the next address.
+            self._addresses.append(self._get_sub_address(frame))
+
+        elif frame.has_stack:
+            self.counts[(self._addresses[-1], frame.stack[-1])] += 1
+
+    def result(self) -> Counter[tuple[bytes | None, HexBytes]]:
+        return self.counts
+
+    def _get_sub_address(self, frame: TraceFrame) -> bytes | None:
+        if frame.op in (CallType.DELEGATECALL.value, CallType.CALLCODE.value):
+            return self._addresses[-1]
+
+        address = frame.address
+        return bytes(address) if address else None
+
+
+class OpcodeGasHistogram(Analyzer):
+    """
+    Total the gas cost of every opcode. The number of times each opcode
+    was executed is available as ``counts``.
+    """
+
+    raw = True
+
+    def __init__(self) -> None:
+        self.gas: Counter[str] = Counter()
+        self.counts: Counter[str] = Counter()
+
+    def on_frame(self, frame: dict):
+        op = frame["op"]
+        gas_cost = frame["gasCost"]
+        self.gas[op] += int(gas_cost, 16) if isinstance(gas_cost, str) else gas_cost
+        self.counts[op] += 1
+
+    def result(self) -> Counter[str]:
+        return self.gas
+
+
+class RevertLocation(Struct):
+    pc: int
+    """The program counter of the ``REVERT``."""
+
+    depth: int
+    """The depth of the reverted call."""
+
+    returndata: HexBytes
+    """The revert data, such as an error message."""
+
+
+class RevertLocator(Analyzer):
+    """
+    Find every ``REVERT``, innermost calls first.
+    The first location is usually where a failed transaction originally reverted.
+    """
+
+    opcodes = frozenset(("REVERT",))
+
+    def __init__(self) -> None:
+        self.locations: list[RevertLocation] = []
+
+    def on_frame(self, frame: TraceFrame):
+        self.locations.append(
+            RevertLocation(
+                pc=frame.pc,
+                depth=frame.depth,
+                returndata=frame.memory.get(frame.stack[-1], frame.stack[-2]),
+            )
+        )
+
+    def result(self) -> list[RevertLocation]:
+        return self.locations
@@ -1,10 +1,11 @@
 from functools import cached_property, singledispatchmethod
+from typing import Any
 
 from eth_pydantic_types import HexBytes
+from msgspec import Struct
 from pydantic import BaseModel as _BaseModel
 from pydantic import ConfigDict, Field, field_validator
 
-from evm_trace.display import get_tree_display
 from evm_trace.enums import CallType
 
 
@@ -87,13 +88,22 @@ class CallTreeNode(BaseModel):
     """All events made in the call."""
 
     def __str__(self) -> str:
+        # NOTE: Imported here so checksumming libraries only load when displaying.
+        from evm_trace.display import get_tree_display
+
         try:
             return get_tree_display(self)
         except Exception as err:
             return f"CallTreeNode (display_err={err})"
 
     def __repr__(self) -> str:
-        return str(self)
+        # NOTE: Bounded, so huge call trees stay cheap to log or inspect.
+        from evm_trace.display import get_tree_summary
+
+        try:
+            return get_tree_summary(self)
+        except Exception as err:
+            return f"CallTreeNode (display_err={err})"
 
     def __getitem__(self, index: int) -> "CallTreeNode":
         return self.calls[index]
@@ -109,3 +119,344 @@ class CallTreeNode(BaseModel):
     @field_validator("gas_limit", "gas_cost", mode="before")
     def validate_optional_ints(cls, value):
         return int(value, 16) if isinstance(value, str) else value
+
+
+class LazyHexBytes:
+    """
+    A bytes-like value that keeps a reference to the hex str it came from, such as an
+    ``input`` or ``output`` in a decoded RPC response, and only decodes it when needed.
+    Reading the ``selector`` (or any other slice) only decodes the characters it needs.
+    Once fully decoded, the hex str is released.
+
+    Use ``bytes(value)`` where real ``bytes`` are required.
+    """
+
+    __slots__ = ("_hex", "_start", "_value")
+
+    def __init__(self, hex_str: str):
+        self._hex = hex_str
+        # NOTE: Skip the prefix by offset instead of slicing, which would copy the str.
+        self._start = 2 if hex_str[:2] in ("0x", "0X") else 0
+        self._value: bytes | None = None
+
+    def __bytes__(self) -> bytes:
+        if self._value is None:
+            self._value = _to_bytes(self._hex)
+            self._hex = ""
+
+        return self._value
+
+    def __len__(self) -> int:
+        if self._value is not None:
+            return len(self._value)
+
+        return (len(self._hex) - self._start + 1) // 2
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, key):
+        if (
+            self._value is None
+            and isinstance(key, slice)
+            and key.step in (None, 1)
+            and (len(self._hex) - self._start) % 2 == 0
+        ):
+            start, stop, _ = key.indices(len(self))
+            if stop <= start:
+                return b""
+
+            offset = self._start
+            return bytes.fromhex(self._hex[offset + 2 * start : offset + 2 * stop])
+
+        return bytes(self)[key]
+
+    def __iter__(self):
+        return iter(bytes(self))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyHexBytes):
+            return bytes(self) == bytes(other)
+
+        elif isinstance(other, (bytes, bytearray, memoryview)):
+            return bytes(self) == other
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(bytes(self))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.hex()!r})"
+
+    @property
+    def selector(self) -> bytes:
+        """
+        The first 4 bytes, such as the method selector of calldata.
+        """
+        return self[:4]
+
+    def hex(self) -> str:
+        return bytes(self).hex()
+
+    def _get_undecoded(self) -> str | None:
+        # The hex str, or ``None`` once decoded. Equal strs are equal values.
+        return self._hex if self._value is None else None
+
+
+class CompactEventNode(Struct, gc=False):
+    """
+    A slotted, validation-free alternative to :class:`~evm_trace.base.EventNode`.
+    """
+
+    depth: int
+    topics: list[bytes]
+    data: bytes = b""
+    call_type: CallType = CallType.EVENT
+
+    @property
+    def selector(self) -> bytes:
+        """
+        The selector is always the first topic.
+        """
+        return self.topics[0]
+
+    @classmethod
+    def from_kwargs(cls, **kwargs) -> "CompactEventNode":
+        """
+        Create a node from the same kwargs :class:`~evm_trace.base.EventNode` accepts.
+        """
+        return cls(
+            depth=_to_int(kwargs["depth"]),
+            topics=[_to_bytes(t) for t in kwargs["topics"]],
+            data=_to_bytes(kwargs.get("data")),
+        )
+
+    @classmethod
+    def from_pydantic(cls, event: EventNode) -> "CompactEventNode":
+        return cls(
+            depth=event.depth, topics=[bytes(t) for t in event.topics], data=bytes(event.data)
+        )
+
+    def to_pydantic(self) -> EventNode:
+        return EventNode(
+            depth=self.depth, topics=[HexBytes(t) for t in self.topics], data=HexBytes(self.data)
+        )
+
+
+class CompactCallTreeNode(Struct, gc=False):
+    """
+    A slotted, validation-free alternative to :class:`~evm_trace.base.CallTreeNode`
+    for keeping large amounts of call trees in memory. The tree builders emit
+    these when given ``compact=True``. Byte fields are plain ``bytes``, except
+    ``calldata`` and ``returndata`` may be :class:`~evm_trace.base.LazyHexBytes`.
+    """
+
+    call_type: CallType
+    address: bytes = b""
+    value: int = 0
+    depth: int = 0
+    gas_limit: int | None = None
+    gas_cost: int | None = None
+    calldata: bytes | LazyHexBytes = b""
+    returndata: bytes | LazyHexBytes = b""
+    calls: list["CompactCallTreeNode"] = []
+    selfdestruct: bool = False
+    failed: bool = False
+    events: list[CompactEventNode] = []
+
+    def __str__(self) -> str:
+        from evm_trace.display import get_tree_display
+
+        try:
+            return get_tree_display(self)  # type: ignore[arg-type]
+        except Exception as err:
+            return f"CompactCallTreeNode (display_err={err})"
+
+    def __repr__(self) -> str:
+        from evm_trace.display import get_tree_summary
+
+        try:
+            return get_tree_summary(self)  # type: ignore[arg-type]
+        except Exception as err:
+            return f"CompactCallTreeNode (display_err={err})"
+
+    def __getitem__(self, index: int) -> "CompactCallTreeNode":
+        return self.calls[index]
+
+    @classmethod
+    def from_kwargs(cls, lazy_bytes: bool = False, **kwargs) -> "CompactCallTreeNode":
+        """
+        Create a node from the same kwargs :class:`~evm_trace.base.CallTreeNode` accepts,
+        only doing the conversions the pydantic validators would (no validation).
+        Nested ``calls`` and ``events`` may be nodes or kwarg dicts, and ``events`` may also be
+        :class:`~evm_trace.base.EventNode` objects.
+
+        Args:
+            lazy_bytes (bool): Set to ``True`` to keep hex str ``calldata`` and
+              ``returndata`` as :class:`~evm_trace.base.LazyHexBytes`.
+            **kwargs: The node fields.
+
+        Returns:
+            :class:`~evm_trace.base.CompactCallTreeNode`
+        """
+        to_data = _to_lazy_bytes if lazy_bytes else _to_bytes
+        call_type = kwargs["call_type"]
+        return cls(
+            call_type=call_type if isinstance(call_type, CallType) else CallType(call_type),
+            address=_to_bytes(kwargs.get("address")),
+            value=_to_int(kwargs.get("value")),
+            depth=_to_int(kwargs.get("depth")),
+            gas_limit=_to_optional_int(kwargs.get("gas_limit")),
+            gas_cost=_to_optional_int(kwargs.get("gas_cost")),
+            calldata=to_data(kwargs.get("calldata")),
+            returndata=to_data(kwargs.get("returndata")),
+            calls=[
+                c if isinstance(c, cls) else cls.from_kwargs(lazy_bytes=lazy_bytes, **c)
+                for c in kwargs.get("calls", [])
+            ],
+            selfdestruct=kwargs.get("selfdestruct", False),
+            failed=kwargs.get("failed", False),
+            events=[_to_compact_event(e) for e in kwargs.get("events", [])],
+        )
+
+    @classmethod
+    def from_pydantic(cls, node: CallTreeNode) -> "CompactCallTreeNode":
+        """
+        Convert a :class:`~evm_trace.base.CallTreeNode` (and its sub-calls).
+        """
+        return cls(
+            call_type=node.call_type,
+            address=bytes(node.address),
+            value=node.value,
+            depth=node.depth,
+            gas_limit=node.gas_limit,
+            gas_cost=node.gas_cost,
+            calldata=bytes(node.calldata),
+            returndata=bytes(node.returndata),
+            calls=[cls.from_pydantic(c) for c in node.calls],
+            selfdestruct=node.selfdestruct,
+            failed=node.failed,
+            events=[CompactEventNode.from_pydantic(e) for e in node.events],
+        )
+
+    def to_pydantic(self) -> CallTreeNode:
+        """
+        Convert to a :class:`~evm_trace.base.CallTreeNode` (and its sub-calls).
+        """
+        return CallTreeNode(
+            call_type=self.call_type,
+            address=HexBytes(self.address),
+            value=self.value,
+            depth=self.depth,
+            gas_limit=self.gas_limit,
+            gas_cost=self.gas_cost,
+            calldata=HexBytes(bytes(self.calldata)),
+            returndata=HexBytes(bytes(self.returndata)),
+            calls=[c.to_pydantic() for c in self.calls],
+            selfdestruct=self.selfdestruct,
+            failed=self.failed,
+            events=[e.to_pydantic() for e in self.events],
+        )
+
+
+AnyNode = CallTreeNode | CompactCallTreeNode
+AnyEvent = EventNode | CompactEventNode
+
+
+class BuildOptions(BaseModel):
+    """
+    Options for building smaller call trees, passed to the ``get_calltree_from_*`` functions.
+    Skipped calls and fields are never extracted or validated, making the build cheaper.
+
+    Usage example::
+
+        options = BuildOptions(max_depth=2, include_events=False, include_returndata=False)
+        calltree = get_calltree_from_geth_call_trace(data, options=options)
+    """
+
+    max_depth: int | None = None
+    """
+    Skip calls (and their sub-calls) nested deeper than this many levels below the root call.
+    """
+
+    include_addresses: frozenset[bytes] | None = None
+    """Only build calls to these addresses. Other calls are skipped, with their sub-calls."""
+
+    exclude_addresses: frozenset[bytes] = frozenset()
+    """Skip calls to these addresses, with their sub-calls."""
+
+    include_events: bool = True
+    """Set to ``False`` to skip the events."""
+
+    include_calldata: bool = True
+    """Set to ``False`` to skip the calldata."""
+
+    include_returndata: bool = True
+    """Set to ``False`` to skip the returndata."""
+
+    @field_validator("include_addresses", "exclude_addresses", mode="before")
+    def validate_addresses(cls, value):
+        return None if value is None else frozenset(_to_bytes(a) for a in value)
+
+    def is_skipped(self, address: Any, level: int) -> bool:
+        """
+        Whether to skip a call, and its sub-calls.
+
+        Args:
+            address (Any): The address called, if known.
+            level (int): The number of levels below the root call.
+
+        Returns:
+            bool
+        """
+        if self.max_depth is not None and level > self.max_depth:
+            return True
+
+        elif not address or (self.include_addresses is None and not self.exclude_addresses):
+            return False
+
+        address = _to_bytes(address)
+        if address in self.exclude_addresses:
+            return True
+
+        return self.include_addresses is not None and address not in self.include_addresses
+
+
+def _to_compact_event(event: Any) -> CompactEventNode:
+    if isinstance(event, CompactEventNode):
+        return event
+
+    elif isinstance(event, EventNode):
+        return CompactEventNode.from_pydantic(event)
+
+    return CompactEventNode.from_kwargs(**event)
+
+
+def _to_bytes(value: Any) -> bytes:
+    if not value:
+        return b""
+
+    elif type(value) is bytes:
+        return value
+
+    elif isinstance(value, str):
+        try:
+            return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+        except ValueError:
+            # Odd-length or otherwise unusual hex-str.
+            return bytes(HexBytes(value))
+
+    return bytes(value)
+
+
+def _to_lazy_bytes(value: Any) -> bytes | LazyHexBytes:
+    return LazyHexBytes(value) if value and isinstance(value, str) else _to_bytes(value)
+
+
+def _to_int(value: Any) -> int:
+    return (int(value, 16) if isinstance(value, str) else value) if value else 0
+
+
+def _to_optional_int(value: Any) -> int | None:
+    return int(value, 16) if isinstance(value, str) else value
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from msgspec import DecodeError
+
+from evm_trace.base import CallTreeNode, CompactCallTreeNode
+from evm_trace.codec import decode, encode
+
+DEFAULT_MAX_SIZE = 1 << 30  # 1 GiB
+# NOTE: Raised when decoding a truncated or corrupt entry.
+DECODE_ERRORS = (DecodeError, IndexError, KeyError, TypeError, ValueError)
+TREE_SUFFIX = ".tree"
+RAW_SUFFIX = ".raw"
+
+
+class TraceCache:
+    """
+    A size-bounded, on-disk cache of call trees (and optionally raw trace data)
+    keyed by transaction hash and tracer config.
+
+    Entries are written to a temporary file and atomically moved into place,
+    so any number of processes can read and write the same directory.
+    Reads use ``mmap`` and mark the entry as recently used. After each write, the size
+    of the directory is re-read, so the cache stays within ``max_size`` bytes even
+    when several processes write to it. When it grows past ``max_size``, the
+    least-recently used entries are removed.
+    Entries that fail to decode are removed and treated as missing.
+
+    Usage example::
+
+        cache = TraceCache(Path.home() / ".cache" / "evm-trace")
+        calltree = cache.get_or_build(
+            txn_hash,
+            lambda: get_calltree_from_geth_call_trace(fetch_call_trace(txn_hash)),
+            config={"tracer": "callTracer"},
+        )
+    """
+
+    def __init__(self, path: Path | str, max_size: int = DEFAULT_MAX_SIZE):
+        self.path = Path(path)
+        self.max_size = max_size
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def get(
+        self, tx_hash: str, config: dict | None = None, compact: bool = False
+    ) -> CallTreeNode | CompactCallTreeNode | None:
+        """
+        Get a cached call tree.
+
+        Args:
+            tx_hash (str): The transaction hash.
+            config (dict | None): The tracer config the tree was built with.
+            compact (bool): Set to ``True`` to get a
+              :class:`~evm_trace.base.CompactCallTreeNode` instead.
+
+        Returns:
+            :class:`~evm_trace.base.CallTreeNode` | None: The call tree, or ``None``
+            when it is not cached.
+        """
+        return self._read(self._get_path(tx_hash, config, TREE_SUFFIX), compact=compact)
+
+    def put(
+        self, tx_hash: str, calltree: CallTreeNode | CompactCallTreeNode, config: dict | None = None
+    ):
+        """
+        Cache a call tree.
+
+        Args:
+            tx_hash (str): The transaction hash.
+            calltree (:class:`~evm_trace.base.CallTreeNode`): The call tree to cache.
+            config (dict | None): The tracer config the tree was built with.
+        """
+        self._write(self._get_path(tx_hash, config, TREE_SUFFIX), encode(calltree))
+
+    def get_raw(self, tx_hash: str, config: dict | None = None) -> memoryview | None:
+        """
+        Get cached raw trace data, such as a structLog or VMTrace RPC response.
+        The data is memory-mapped, so it is only read from disk as it is used.
+        """
+        return self._read(self._get_path(tx_hash, config, RAW_SUFFIX))
+
+    def put_raw(self, tx_hash: str, data: bytes, config: dict | None = None):
+        """
+        Cache raw trace data, such as a structLog or VMTrace RPC response.
+        """
+        self._write(self._get_path(tx_hash, config, RAW_SUFFIX), data)
+
+    def get_or_build(
+        self,
+        tx_hash: str,
+        builder: Callable[[], CallTreeNode | CompactCallTreeNode],
+        config: dict | None = None,
+        compact: bool = False,
+    ) -> CallTreeNode | CompactCallTreeNode:
+        """
+        Get a cached call tree or build and cache it.
+
+        Args:
+            tx_hash (str): The transaction hash.
+            builder (Callable): Creates the call tree when it is not cached, such as a
+              function calling :meth:`~evm_trace.geth.get_calltree_from_geth_call_trace`.
+            config (dict | None): The tracer config the tree is built with.
+            compact (bool): Set to ``True`` to get a
+              :class:`~evm_trace.base.CompactCallTreeNode` instead, whether it was cached
+              or built.
+
+        Returns:
+            :class:`~evm_trace.base.CallTreeNode`
+        """
+        if (calltree := self.get(tx_hash, config=config, compact=compact)) is not None:
+            return calltree
+
+        calltree = builder()
+        self.put(tx_hash, calltree, config=config)
+        if compact and isinstance(calltree, CallTreeNode):
+            return CompactCallTreeNode.from_pydantic(calltree)
+
+        elif not compact and isinstance(calltree, CompactCallTreeNode):
+            return calltree.to_pydantic()
+
+        return calltree
+
+    def evict(self) -> int:
+        """
+        Remove the least-recently used entries until the cache fits in ``max_size``.
+
+        Returns:
+            int: The size of the cache in bytes afterwards.
+        """
+        entries = []
+        for file in self.path.glob("*/*"):
+            if file.suffix not in (TREE_SUFFIX, RAW_SUFFIX):
+                continue
+
+            try:
+                stat = file.stat()
+            except FileNotFoundError:
+                # Evicted by another process.
+                continue
+
+            entries.append((stat.st_mtime_ns, stat.st_size, file))
+
+        size = sum(e[1] for e in entries)
+        for _, file_size, file in sorted(entries, key=lambda e: e[0]):
+            if size <= self.max_size:
+                break
+
+            file.unlink(missing_ok=True)
+            size -= file_size
+
+        return size
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        for file in self.path.glob("*/*"):
+            if file.suffix in (TREE_SUFFIX, RAW_SUFFIX):
+                file.unlink(missing_ok=True)
+
+    def _get_path(self, tx_hash: str, config: dict | None, suffix: str) -> Path:
+        key = f"{tx_hash.lower()}:{json.dumps(config or {}, sort_keys=True, default=str)}"
+        digest = hashlib.sha256(key.encode("utf8")).hexdigest()
+        return self.path / digest[:2] / f"{digest}{suffix}"
+
+    def _read(self, path: Path, compact: bool | None = None) -> Any:
+        try:
+            with open(path, "rb") as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    buffer: Any = b""
+                else:
+                    # NOTE: The mapping stays valid after the file is closed, replaced or evicted.
+                    buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        except FileNotFoundError:
+            return None
+
+        if compact is None:
+            data: Any = memoryview(buffer)
+        else:
+            try:
+                with memoryview(buffer) as view:
+                    data = decode(view, compact=compact)
+
+            except DECODE_ERRORS:
+                # Rebuilt by the caller.
+                path.unlink(missing_ok=True)
+                return None
+
+            finally:
+                if isinstance(buffer, mmap.mmap):
+                    buffer.close()
+
+        try:
+            # Mark as recently used.
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return data
+
+    def _write(self, path: Path, data: bytes):
+        path.parent.mkdir(exist_ok=True)
+        file = tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False)
+        try:
+            with file:
+                file.write(data)
+
+            os.replace(file.name, path)
+        finally:
+            # Only left behind when the write or move failed.
+            Path(file.name).unlink(missing_ok=True)
+
+        # NOTE: Other processes may have written too, so the size is re-read every time.
+        self.evict()
@@ -0,0 +1,229 @@
+import struct
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
+
+from eth_pydantic_types import HexBytes
+from msgspec.msgpack import Decoder, Encoder
+
+from evm_trace.base import CallTreeNode, CompactCallTreeNode, CompactEventNode, EventNode
+from evm_trace.enums import CALL_TYPE_IDS, CALL_TYPES, NON_SELECTOR_CALL_TYPES
+
+MAGIC = "evmtrace"
+VERSION = 1
+
+_LENGTH_PREFIX = struct.Struct(">I")
+_MAX_MSGPACK_INT = 2**64
+_encoder = Encoder()
+_decoder = Decoder()
+
+
+class _Table:
+    def __init__(self) -> None:
+        self.items: list[bytes] = []
+        self.ids: dict[bytes, int] = {}
+
+    def get_id(self, item: bytes) -> int:
+        if (item_id := self.ids.get(item)) is None:
+            item_id = len(self.items)
+            self.ids[item] = item_id
+            self.items.append(item)
+
+        return item_id
+
+
+def encode(root: CallTreeNode | CompactCallTreeNode) -> bytes:
+    """
+    Encode a call tree using a compact, versioned binary format: a msgpack array of
+    ``[MAGIC, VERSION, addresses, selectors, topics, nodes]`` where the ``nodes``
+    are flat tuples in preorder, referencing the address, selector and topic
+    tables by index instead of repeating the bytes at every level. The value and gas
+    are integers, or 32 big-endian bytes when too large for msgpack.
+
+    Args:
+        root (:class:`~evm_trace.base.CallTreeNode` |
+          :class:`~evm_trace.base.CompactCallTreeNode`): The call tree to encode.
+
+    Returns:
+        bytes
+    """
+    addresses = _Table()
+    selectors = _Table()
+    topics = _Table()
+    nodes: list[tuple] = []
+    stack: list[Any] = [root]
+    while stack:
+        node = stack.pop()
+        calldata = bytes(node.calldata)
+        if node.call_type not in NON_SELECTOR_CALL_TYPES and len(calldata) >= 4:
+            selector_id = selectors.get_id(calldata[:4])
+            calldata = calldata[4:]
+        else:
+            selector_id = -1
+
+        nodes.append(
+            (
+                len(node.calls),
+                CALL_TYPE_IDS[node.call_type],
+                addresses.get_id(bytes(node.address)),
+                _encode_uint(node.value),
+                node.depth,
+                _encode_uint(node.gas_limit),
+                _encode_uint(node.gas_cost),
+                selector_id,
+                calldata,
+                bytes(node.returndata),
+                int(node.failed) | int(node.selfdestruct) << 1,
+                [
+                    (e.depth, [topics.get_id(bytes(t)) for t in e.topics], bytes(e.data))
+                    for e in node.events
+                ],
+            )
+        )
+        stack.extend(reversed(node.calls))
+
+    return _encoder.encode([MAGIC, VERSION, addresses.items, selectors.items, topics.items, nodes])
+
+
+def decode(data: bytes | memoryview, compact: bool = False) -> CallTreeNode | CompactCallTreeNode:
+    """
+    Decode a call tree created using :meth:`~evm_trace.codec.encode`.
+
+    Args:
+        data (bytes | memoryview): The encoded call tree.
+        compact (bool): Set to ``True`` to get a
+          :class:`~evm_trace.base.CompactCallTreeNode` instead.
+
+    Returns:
+        :class:`~evm_trace.base.CallTreeNode`
+    """
+    payload = _decoder.decode(data)
+    if not isinstance(payload, list) or len(payload) != 6 or payload[0] != MAGIC:
+        raise ValueError("Not an encoded call tree.")
+
+    elif payload[1] != VERSION:
+        raise ValueError(f"Unsupported call tree encoding version '{payload[1]}'.")
+
+    _, _, addresses, selectors, topics, nodes = payload
+    root: Any = None
+    # The nodes still missing sub-calls, with the number of sub-calls left.
+    stack: list[list[Any]] = []
+    for record in nodes:
+        (num_calls, call_type, address, value, depth, gas_limit, gas_cost) = record[:7]
+        (selector, calldata, returndata, flags, events) = record[7:]
+        value = _decode_uint(value) or 0
+        gas_limit, gas_cost = _decode_uint(gas_limit), _decode_uint(gas_cost)
+        if selector >= 0:
+            calldata = selectors[selector] + calldata
+
+        if compact:
+            node: Any = CompactCallTreeNode(
+                call_type=CALL_TYPES[call_type],
+                address=addresses[address],
+                value=value,
+                depth=depth,
+                gas_limit=gas_limit,
+                gas_cost=gas_cost,
+                calldata=calldata,
+                returndata=returndata,
+                calls=[],
+                failed=bool(flags & 1),
+                selfdestruct=bool(flags & 2),
+                events=[
+                    CompactEventNode(depth=d, topics=[topics[t] for t in ts], data=e)
+                    for d, ts, e in events
+                ],
+            )
+        else:
+            # NOTE: The data was validated before it was encoded, so validation is skipped.
+            node = CallTreeNode.model_construct(
+                call_type=CALL_TYPES[call_type],
+                address=HexBytes(addresses[address]),
+                value=value,
+                depth=depth,
+                gas_limit=gas_limit,
+                gas_cost=gas_cost,
+                calldata=HexBytes(calldata),
+                returndata=HexBytes(returndata),
+                calls=[],
+                failed=bool(flags & 1),
+                selfdestruct=bool(flags & 2),
+                events=[
+                    EventNode.model_construct(
+                        depth=d, topics=[HexBytes(topics[t]) for t in ts], data=HexBytes(e)
+                    )
+                    for d, ts, e in events
+                ],
+            )
+
+        if stack:
+            parent = stack[-1]
+            parent[0].calls.append(node)
+            parent[1] -= 1
+            if parent[1] == 0:
+                stack.pop()
+        else:
+            root = node
+
+        if num_calls:
+            stack.append([node, num_calls])
+
+    return root
+
+
+def _encode_uint(value: int | None) -> int | bytes | None:
+    # msgpack integers are at most 64 bits, so larger uint256 values are big-endian bytes.
+    if value is None or value < _MAX_MSGPACK_INT:
+        return value
+
+    return value.to_bytes(32, "big")
+
+
+def _decode_uint(value: int | bytes | None) -> int | None:
+    return int.from_bytes(value, "big") if isinstance(value, bytes) else value
+
+
+def encode_stream(trees: Iterable[CallTreeNode | CompactCallTreeNode], stream: IO[bytes]) -> int:
+    """
+    Write call trees to a binary stream, one length-prefixed record per tree.
+
+    Args:
+        trees (Iterable[:class:`~evm_trace.base.CallTreeNode`]): The call trees to write.
+        stream (IO[bytes]): The stream to write to, such as a file opened in ``"wb"`` mode.
+
+    Returns:
+        int: The number of trees written.
+    """
+    count = 0
+    for tree in trees:
+        data = encode(tree)
+        stream.write(_LENGTH_PREFIX.pack(len(data)))
+        stream.write(data)
+        count += 1
+
+    return count
+
+
+def decode_stream(
+    stream: IO[bytes], compact: bool = False
+) -> Iterator[CallTreeNode | CompactCallTreeNode]:
+    """
+    Read call trees written using :meth:`~evm_trace.codec.encode_stream`, one at a time.
+
+    Args:
+        stream (IO[bytes]): The stream to read from, such as a file opened in ``"rb"`` mode.
+        compact (bool): Set to ``True`` to get
+          :class:`~evm_trace.base.CompactCallTreeNode` objects instead.
+
+    Returns:
+        Iterator[:class:`~evm_trace.base.CallTreeNode`]
+    """
+    while prefix := stream.read(_LENGTH_PREFIX.size):
+        if len(prefix) < _LENGTH_PREFIX.size:
+            raise ValueError("Truncated call tree stream.")
+
+        (size,) = _LENGTH_PREFIX.unpack(prefix)
+        data = stream.read(size)
+        if len(data) < size:
+            raise ValueError("Truncated call tree stream.")
+
+        yield decode(data, compact=compact)
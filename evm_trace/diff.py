@@ -0,0 +1,255 @@
+import hashlib
+from difflib import SequenceMatcher
+from enum import Enum
+from typing import Any
+
+from msgspec import Struct
+
+from evm_trace.base import AnyNode, LazyHexBytes
+from evm_trace.display import TreeRepresentation
+from evm_trace.enums import NON_SELECTOR_CALL_TYPES
+
+# Fields compared between aligned calls, besides the sub-calls.
+COMPARED_FIELDS = (
+    "value",
+    "gas_limit",
+    "gas_cost",
+    "calldata",
+    "returndata",
+    "failed",
+    "selfdestruct",
+    "events",
+)
+
+
+class DiffType(Enum):
+    ADDED = "+"
+    REMOVED = "-"
+    CHANGED = "~"
+
+
+class CallTreeDiff(Struct):
+    """
+    The difference between two aligned calls. Only calls that differ
+    are included, identical sub-trees are skipped entirely.
+    """
+
+    diff_type: DiffType
+    """Whether the call was added, removed or changed."""
+
+    before: Any
+    """The call in the first tree (``None`` when added)."""
+
+    after: Any
+    """The call in the second tree (``None`` when removed)."""
+
+    changes: dict[str, tuple[Any, Any]] = {}
+    """The changed fields of a changed call, mapped to their before and after values."""
+
+    calls: list["CallTreeDiff"] = []
+    """The differences in the sub-calls of a changed call."""
+
+    def __str__(self) -> str:
+        return "\n".join(_render(self))
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+def get_subtree_hashes(root: AnyNode) -> dict[int, bytes]:
+    """
+    Hash every sub-tree, without recursion. Identical sub-trees
+    (all fields, events and sub-calls) have identical hashes.
+
+    Args:
+        root (:class:`~evm_trace.base.CallTreeNode`): The call tree to hash.
+
+    Returns:
+        dict[int, bytes]: The hash of each node, keyed by the node's ``id()``.
+    """
+    hashes: dict[int, bytes] = {}
+    stack: list[tuple[Any, bool]] = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if id(node) in hashes:
+            # A shared (interned) sub-tree that was already hashed.
+            continue
+
+        elif not children_done:
+            stack.append((node, True))
+            stack.extend((c, False) for c in node.calls)
+            continue
+
+        hashes[id(node)] = hash_node(node, [hashes[id(c)] for c in node.calls])
+
+    return hashes
+
+
+def hash_node(node: AnyNode, call_hashes: list[bytes], decode_lazy: bool = True) -> bytes:
+    """
+    Hash a single node given the hashes of its sub-calls.
+
+    Args:
+        node (:class:`~evm_trace.base.CallTreeNode`): The node to hash.
+        call_hashes (list[bytes]): The hashes of ``node.calls``, in order.
+        decode_lazy (bool): Set to ``False`` to hash undecoded
+          :class:`~evm_trace.base.LazyHexBytes` by their hex str instead of decoding them.
+          Equal nodes may then have different hashes, if only one of them is decoded.
+
+    Returns:
+        bytes
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(
+        repr(
+            (
+                node.call_type.value,
+                node.value,
+                node.depth,
+                node.gas_limit,
+                node.gas_cost,
+                node.failed,
+                node.selfdestruct,
+                len(node.calls),
+                len(node.events),
+            )
+        ).encode()
+    )
+    for value in (node.address, node.calldata, node.returndata):
+        if (
+            not decode_lazy
+            and isinstance(value, LazyHexBytes)
+            and (hex_str := value._get_undecoded()) is not None
+        ):
+            # Marked, so a hex str never hashes like the same bytes.
+            data = b"\xff" + hex_str.encode()
+        else:
+            data = bytes(value)
+
+        hasher.update(len(data).to_bytes(4, "big"))
+        hasher.update(data)
+
+    for event in node.events:
+        hasher.update(repr((event.depth, len(event.topics), len(event.data))).encode())
+        for topic in event.topics:
+            # Topics are not always 32 bytes, so the lengths keep their boundaries apart.
+            hasher.update(len(topic).to_bytes(4, "big"))
+            hasher.update(topic)
+
+        hasher.update(event.data)
+
+    for call_hash in call_hashes:
+        hasher.update(call_hash)
+
+    return hasher.digest()
+
+
+def diff_calltrees(before: AnyNode, after: AnyNode) -> CallTreeDiff | None:
+    """
+    Compare two call trees, such as traces of the same call on two forks or
+    on two versions of a contract. Sub-calls are aligned by their call-type,
+    address and selector so inserted or removed calls do not shift the rest.
+
+    Args:
+        before (:class:`~evm_trace.base.CallTreeNode`): The first call tree.
+        after (:class:`~evm_trace.base.CallTreeNode`): The second call tree.
+
+    Returns:
+        :class:`~evm_trace.diff.CallTreeDiff` | None: The difference, or ``None``
+        when the trees are identical.
+    """
+    return _diff_nodes(before, after, get_subtree_hashes(before), get_subtree_hashes(after))
+
+
+def _diff_nodes(
+    before: Any, after: Any, before_hashes: dict[int, bytes], after_hashes: dict[int, bytes]
+) -> CallTreeDiff | None:
+    if before_hashes[id(before)] == after_hashes[id(after)]:
+        return None
+
+    # Without recursion, so deep call trees are fine. Aligned calls with different
+    # hashes are always changed, so their diff is added in order and filled in later.
+    root = CallTreeDiff(diff_type=DiffType.CHANGED, before=before, after=after)
+    stack = [root]
+    while stack:
+        diff = stack.pop()
+        before, after = diff.before, diff.after
+        changes = {}
+        for field in COMPARED_FIELDS:
+            before_value = getattr(before, field)
+            after_value = getattr(after, field)
+            if before_value != after_value:
+                changes[field] = (before_value, after_value)
+
+        calls: list[CallTreeDiff] = []
+        matcher = SequenceMatcher(
+            None, [_get_key(c) for c in before.calls], [_get_key(c) for c in after.calls], False
+        )
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                for before_call, after_call in zip(
+                    before.calls[i1:i2], after.calls[j1:j2], strict=True
+                ):
+                    if before_hashes[id(before_call)] != after_hashes[id(after_call)]:
+                        call_diff = CallTreeDiff(
+                            diff_type=DiffType.CHANGED, before=before_call, after=after_call
+                        )
+                        calls.append(call_diff)
+                        stack.append(call_diff)
+
+                continue
+
+            calls.extend(
+                CallTreeDiff(diff_type=DiffType.REMOVED, before=c, after=None)
+                for c in before.calls[i1:i2]
+            )
+            calls.extend(
+                CallTreeDiff(diff_type=DiffType.ADDED, before=None, after=c)
+                for c in after.calls[j1:j2]
+            )
+
+        diff.changes = changes
+        diff.calls = calls
+
+    return root
+
+
+def _get_key(node: Any) -> tuple:
+    selector = b"" if node.call_type in NON_SELECTOR_CALL_TYPES else bytes(node.calldata[:4])
+    return node.call_type.value, bytes(node.address), selector
+
+
+def _render(diff: CallTreeDiff) -> list[str]:
+    lines = []
+    # Without recursion, so deep call trees are fine.
+    stack = [(diff, "", "")]
+    while stack:
+        diff, prefix, child_prefix = stack.pop()
+        node = diff.after if diff.before is None else diff.before
+        title = TreeRepresentation(node).title
+        if diff.changes:
+            changes = ", ".join(_format_change(k, *v) for k, v in diff.changes.items())
+            title = f"{title} ({changes})"
+
+        lines.append(f"{prefix}{diff.diff_type.value} {title}")
+        for index, call in reversed(list(enumerate(diff.calls, start=1))):
+            is_last = index == len(diff.calls)
+            branch = TreeRepresentation.LAST_PREFIX if is_last else TreeRepresentation.MIDDLE_PREFIX
+            indent = (
+                TreeRepresentation.PARENT_PREFIX_MIDDLE
+                if is_last
+                else TreeRepresentation.PARENT_PREFIX_LAST
+            )
+            stack.append((call, f"{child_prefix}{branch} ", f"{child_prefix}{indent}"))
+
+    return lines
+
+
+def _format_change(field: str, before: Any, after: Any) -> str:
+    if field == "events":
+        return f"events: {len(before)} -> {len(after)}"
+
+    elif isinstance(before, bytes):
+        return f"{field} changed"
+
+    return f"{field}: {before} -> {after}"
@@ -1,5 +1,7 @@
 from collections.abc import Iterator
-from typing import TYPE_CHECKING, Optional, Union, cast
+from functools import lru_cache
+from io import StringIO
+from typing import TYPE_CHECKING, Any, Optional, TextIO, Union, cast
 
 from cchecksum import to_checksum_address
 from eth_typing import ChecksumAddress
@@ -10,9 +12,262 @@ from evm_trace.enums import CallType
 if TYPE_CHECKING:
     from evm_trace.base import CallTreeNode, EventNode
 
+# The limits of :meth:`~evm_trace.display.get_tree_summary`, used for ``repr()``.
+SUMMARY_MAX_NODES = 1000
+SUMMARY_MAX_DEPTH = 64
+SUMMARY_MAX_SIBLINGS = 100
 
-def get_tree_display(call: "CallTreeNode") -> str:
-    return "\n".join([str(t) for t in TreeRepresentation.make_tree(call)])
+# The fewest repeats of a sibling collapsed into a ``… ×N`` line.
+MIN_COLLAPSED_REPEATS = 2
+
+
+def get_tree_display(
+    call: "CallTreeNode",
+    max_nodes: int | None = None,
+    max_depth: int | None = None,
+    max_siblings: int | None = None,
+    collapse_repeats: bool = False,
+) -> str:
+    buffer = StringIO()
+    write_tree_display(
+        call,
+        buffer,
+        max_nodes=max_nodes,
+        max_depth=max_depth,
+        max_siblings=max_siblings,
+        collapse_repeats=collapse_repeats,
+    )
+    return buffer.getvalue()
+
+
+def get_tree_summary(call: "CallTreeNode") -> str:
+    """
+    A bounded tree-representation of a call-tree, used for ``repr()``, so that
+    displaying a huge call-tree by accident, such as when logging, stays cheap.
+    Call-trees within ``SUMMARY_MAX_NODES`` are displayed in full.
+    """
+    if _count_nodes(call, SUMMARY_MAX_NODES + 1) <= SUMMARY_MAX_NODES:
+        return get_tree_display(call)
+
+    return get_tree_display(
+        call,
+        max_nodes=SUMMARY_MAX_NODES,
+        max_depth=SUMMARY_MAX_DEPTH,
+        max_siblings=SUMMARY_MAX_SIBLINGS,
+        collapse_repeats=True,
+    )
+
+
+def write_tree_display(
+    call: "CallTreeNode",
+    stream: TextIO,
+    max_nodes: int | None = None,
+    max_depth: int | None = None,
+    max_siblings: int | None = None,
+    collapse_repeats: bool = False,
+):
+    """
+    Write the tree-representation of a call-tree, the same as ``str(call)``, line by line.
+    Each node passes its prefix down to its children, so the tree renders in time
+    linear to its size, and its lines are never all held in memory.
+
+    The limits stop the traversal early, so rendering a huge call-tree with
+    limits costs no more than rendering a small one. Skipped nodes are
+    summarized as ``… N more`` lines.
+
+    Usage example::
+
+        with open("trace.txt", "w") as file:
+            write_tree_display(calltree, file)
+
+    Args:
+        call (:class:`~evm_trace.base.CallTreeNode`): The root call-tree node.
+        stream (TextIO): The text stream to write to, such as a file or ``sys.stdout``.
+        max_nodes (int | None): The most calls and events to display.
+        max_depth (int | None): The most levels of calls to display below the root.
+        max_siblings (int | None): The most sub-calls, and events, to display per call.
+        collapse_repeats (bool): Set to ``True`` to display consecutive siblings with the
+          same title once, followed by a ``… ×N`` line for the ``N`` repeats. The sub-calls
+          of the repeats are not displayed.
+    """
+    stream.write(_get_title(call, is_root=True))
+    budget = max_nodes - 1 if max_nodes is not None else None
+    stack: list[_SiblingFrame] = []
+    _enter(stack, call, "", 1, max_depth, stream)
+    while stack:
+        frame = stack[-1]
+        prefix = frame.prefix
+        if frame.repeats:
+            is_last = frame.index == len(frame.children)
+            stream.write(f"\n{prefix}{_branch(is_last)} … ×{frame.repeats}")
+            frame.repeats = 0
+
+        if frame.index == len(frame.children):
+            if not frame.next_group():
+                stack.pop()
+
+            continue
+
+        children = frame.children
+        total = len(children)
+        if max_siblings is not None and frame.shown >= max_siblings:
+            stream.write(f"\n{prefix}{_branch(True)} … {total - frame.index} more")
+            frame.index = total
+            continue
+
+        elif budget is not None and budget <= 0:
+            stream.write(f"\n… display limited to {max_nodes} nodes")
+            return
+
+        child = children[frame.index]
+        title = _get_title(child)
+        end = frame.index + 1
+        if collapse_repeats:
+            scan_end = total if budget is None else min(total, end + budget - 1)
+            while end < scan_end and _get_title(children[end]) == title:
+                end += 1
+
+            if end - frame.index < MIN_COLLAPSED_REPEATS + 1:
+                # Not worth a summary line.
+                end = frame.index + 1
+
+        if budget is not None:
+            budget -= end - frame.index
+
+        frame.repeats = end - frame.index - 1
+        frame.index = end
+        frame.shown += 1
+        is_last = end == total and not frame.repeats
+        stream.write(f"\n{prefix}{_branch(is_last)} {title}")
+        child_prefix = f"{prefix}{_indent(is_last)}"
+        _enter(stack, child, child_prefix, frame.level + 1, max_depth, stream)
+
+
+def _count_nodes(call: Any, limit: int) -> int:
+    # Stops counting at the limit, so it is cheap for huge call-trees.
+    count = 1
+    stack = [call]
+    while stack and count < limit:
+        node = stack.pop()
+        count += len(node.events) + len(node.calls)
+        if count < limit:
+            stack.extend(node.calls)
+
+    return count
+
+
+class _SiblingFrame:
+    """
+    The children of a call left to display, events first, then sub-calls.
+    """
+
+    __slots__ = ("groups", "children", "index", "prefix", "level", "shown", "repeats")
+
+    def __init__(self, groups: list[list], prefix: str, level: int):
+        self.groups = groups
+        self.children = groups.pop(0)
+        self.index = 0
+        self.prefix = prefix
+        self.level = level
+        self.shown = 0
+        self.repeats = 0
+
+    def next_group(self) -> bool:
+        # NOTE: Events and calls each are their own list of siblings, so the last event
+        #   is displayed as the last child even when there are calls.
+        if not self.groups:
+            return False
+
+        self.children = self.groups.pop(0)
+        self.index = 0
+        self.shown = 0
+        return True
+
+
+def _enter(
+    stack: list[_SiblingFrame],
+    node: Any,
+    prefix: str,
+    level: int,
+    max_depth: int | None,
+    stream: TextIO,
+):
+    if hasattr(node, "topics"):
+        # Events have no children.
+        return
+
+    elif not node.events and not node.calls:
+        return
+
+    elif max_depth is not None and level > max_depth:
+        total = len(node.events) + len(node.calls)
+        stream.write(f"\n{prefix}{_branch(True)} … {total} more")
+        return
+
+    stack.append(_SiblingFrame([node.events, node.calls], prefix, level))
+
+
+def _branch(is_last: bool) -> str:
+    return TreeRepresentation.LAST_PREFIX if is_last else TreeRepresentation.MIDDLE_PREFIX
+
+
+def _indent(is_last: bool) -> str:
+    return (
+        TreeRepresentation.PARENT_PREFIX_MIDDLE
+        if is_last
+        else TreeRepresentation.PARENT_PREFIX_LAST
+    )
+
+
+@lru_cache(maxsize=4096)
+def _format_hex(value: bytes) -> str:
+    return to_hex(value)
+
+
+@lru_cache(maxsize=4096)
+def _format_address(address: bytes) -> str:
+    if not address:
+        return ""
+
+    address_hex_str = to_hex(address)
+    try:
+        checksum_address = to_checksum_address(address_hex_str)
+    except (ImportError, ValueError):
+        # Ignore checksumming if user does not have eth-hash backend installed.
+        checksum_address = cast(ChecksumAddress, address_hex_str)
+
+    return str(checksum_address) if int(checksum_address, 16) else ""
+
+
+def _get_title(call: Any, is_root: bool = False) -> str:
+    call_type = call.call_type.value
+
+    if hasattr(call, "selector"):
+        # Is an Event-node
+        selector = _format_hex(bytes(call.selector)) if call.selector else None
+        return f"{call_type}: {selector}"
+    # else: Is a CallTreeNode
+
+    call_path = _format_address(bytes(call.address)) if call.address else ""
+    if call.calldata:
+        if CallType.CREATE.value in call_type or call.call_type == CallType.SELFDESTRUCT:
+            # No method ID needed, the call-type prefix is clear enough.
+            method_id = ""
+
+        else:
+            hex_id = _format_hex(bytes(call.calldata[:4]))
+            method_id = f"<{hex_id}>" if hex_id else ""
+
+        sep = "." if call_path and method_id else ""
+        call_path = f"{call_path}{sep}{method_id}"
+
+    call_path = f"[reverted] {call_path}" if call.failed and is_root else call_path
+    call_path = call_path.strip()
+    node_title = f"{call_type}: {call_path}" if call_path else call_type
+    if call.gas_cost is not None:
+        node_title = f"{node_title} [{call.gas_cost} gas]"
+
+    return node_title
 
 
 class TreeRepresentation:
@@ -39,6 +294,17 @@ class TreeRepresentation:
         self.parent = parent
         self.is_last = is_last
 
+        # NOTE: Build the prefixes from the parent's, instead of walking up the tree.
+        if parent is None:
+            self._prefix = ""
+            self._child_prefix = ""
+        elif is_last:
+            self._prefix = f"{parent._child_prefix}{self.LAST_PREFIX} "
+            self._child_prefix = f"{parent._child_prefix}{self.PARENT_PREFIX_MIDDLE}"
+        else:
+            self._prefix = f"{parent._child_prefix}{self.MIDDLE_PREFIX} "
+            self._child_prefix = f"{parent._child_prefix}{self.PARENT_PREFIX_LAST}"
+
     @property
     def depth(self) -> int:
         """
@@ -53,49 +319,7 @@ class TreeRepresentation:
         The title of the node representation, including address, calldata, and return-data.
         For event-nodes, it is mostly the selector string.
         """
-        call_type = self.call.call_type.value
-
-        if hasattr(self.call, "selector"):
-            # Is an Event-node
-            selector = to_hex(self.call.selector) if self.call.selector else None
-            return f"{call_type}: {selector}"
-        # else: Is a CallTreeNode
-
-        address_hex_str = to_hex(self.call.address) if self.call.address else None
-        try:
-            address = to_checksum_address(address_hex_str) if address_hex_str else None
-        except (ImportError, ValueError):
-            # Ignore checksumming if user does not have eth-hash backend installed.
-            address = cast(ChecksumAddress, address_hex_str)
-
-        cost = self.call.gas_cost
-        call_path = str(address) if address and int(address, 16) else ""
-        if self.call.calldata:
-            call_path = call_path or ""
-
-            if (
-                CallType.CREATE.value in self.call.call_type.value
-                or self.call.call_type == CallType.SELFDESTRUCT
-            ):
-                # No method ID needed, the call-type prefix is clear enough.
-                method_id = ""
-
-            else:
-                hex_id = to_hex(self.call.calldata[:4])
-                method_id = f"<{hex_id}>" if hex_id else ""
-
-            sep = "." if call_path and method_id else ""
-            call_path = f"{call_path}{sep}{method_id}"
-
-        call_path = (
-            f"[reverted] {call_path}" if self.call.failed and self.parent is None else call_path
-        )
-        call_path = call_path.strip()
-        node_title = f"{call_type}: {call_path}" if call_path else call_type
-        if cost is not None:
-            node_title = f"{node_title} [{cost} gas]"
-
-        return node_title
+        return _get_title(self.call, is_root=self.parent is None)
 
     @classmethod
     def make_tree(
@@ -137,17 +361,7 @@ class TreeRepresentation:
         """
         The representation str via ``calling str()``.
         """
-        if self.parent is None:
-            return self.title
-
-        tree_prefix = self.LAST_PREFIX if self.is_last else self.MIDDLE_PREFIX
-        parts = [f"{tree_prefix} {self.title}"]
-        parent = self.parent
-        while parent and parent.parent is not None:
-            parts.append(self.PARENT_PREFIX_MIDDLE if parent.is_last else self.PARENT_PREFIX_LAST)
-            parent = parent.parent
-
-        return "".join(reversed(parts))
+        return f"{self._prefix}{self.title}"
 
     def __repr__(self) -> str:
         return str(self)
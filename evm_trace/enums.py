@@ -27,3 +27,11 @@ CALL_OPCODES = (
     CallType.DELEGATECALL,
     CallType.STATICCALL,
 )
+CALL_OPCODE_VALUES = frozenset(x.value for x in CALL_OPCODES)
+
+# NOTE: The order is part of the encodings using the IDs, only append to ``CallType``.
+CALL_TYPES: tuple[CallType, ...] = tuple(CallType)
+CALL_TYPE_IDS: dict[CallType, int] = {call_type: idx for idx, call_type in enumerate(CALL_TYPES)}
+
+# Call-types where the calldata does not start with a method selector.
+NON_SELECTOR_CALL_TYPES = (CallType.CREATE, CallType.CREATE2, CallType.SELFDESTRUCT)
@@ -0,0 +1,101 @@
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, TextIO
+
+from evm_trace.display import _format_address, _format_hex
+from evm_trace.enums import NON_SELECTOR_CALL_TYPES
+
+if TYPE_CHECKING:
+    from evm_trace.base import CallTreeNode
+
+
+def get_folded_stacks(calltree: "CallTreeNode") -> Iterator[tuple[str, int]]:
+    """
+    Get the self-gas of each call in a call tree, with its stack of calls in the
+    folded-stack format used by flamegraph tools, such as ``addr.selector;addr.selector``.
+    The self-gas of a call is its ``gas_cost`` minus the ``gas_cost`` of its sub-calls.
+    Calls without self-gas are skipped.
+
+    Args:
+        calltree (:class:`~evm_trace.base.CallTreeNode`): The call tree.
+
+    Returns:
+        Iterator[tuple[str, int]]: Each folded stack and its self-gas, in depth-first order.
+    """
+    stack: list[tuple[CallTreeNode, str]] = [(calltree, "")]
+    while stack:
+        node, parent_stack = stack.pop()
+        name = _get_frame_name(node)
+        folded_stack = f"{parent_stack};{name}" if parent_stack else name
+        if node.gas_cost:
+            self_gas = node.gas_cost - sum(c.gas_cost or 0 for c in node.calls)
+            if self_gas > 0:
+                yield folded_stack, self_gas
+
+        stack.extend((c, folded_stack) for c in reversed(node.calls))
+
+
+class FoldedStackAggregator:
+    """
+    Total the self-gas of the folded stacks of many call trees, see
+    :meth:`~evm_trace.flamegraph.get_folded_stacks`. Only the totals are kept,
+    so any number of call trees can be added.
+
+    Usage example::
+
+        aggregator = FoldedStackAggregator()
+        for calltree in calltrees:
+            aggregator.add(calltree)
+
+        with open("gas.folded", "w") as file:
+            aggregator.write(file)
+    """
+
+    def __init__(self) -> None:
+        self.stacks: Counter[str] = Counter()
+
+    def add(self, calltree: "CallTreeNode"):
+        """
+        Add the self-gas of a call tree.
+        """
+        for folded_stack, gas in get_folded_stacks(calltree):
+            self.stacks[folded_stack] += gas
+
+    def lines(self) -> Iterator[str]:
+        """
+        The folded-stack lines, such as ``addr.selector;addr.selector 21000``.
+        """
+        for folded_stack, gas in self.stacks.items():
+            yield f"{folded_stack} {gas}"
+
+    def write(self, stream: TextIO):
+        """
+        Write the folded-stack lines to a text stream, such as a file or ``sys.stdout``.
+        """
+        for line in self.lines():
+            stream.write(f"{line}\n")
+
+
+def write_folded_stacks(calltrees: Iterable["CallTreeNode"], stream: TextIO):
+    """
+    Write the total self-gas of folded stacks over many call trees, for flamegraph tools.
+
+    Args:
+        calltrees (Iterable[:class:`~evm_trace.base.CallTreeNode`]): The call trees,
+          which may be a generator.
+        stream (TextIO): The text stream to write to, such as a file or ``sys.stdout``.
+    """
+    aggregator = FoldedStackAggregator()
+    for calltree in calltrees:
+        aggregator.add(calltree)
+
+    aggregator.write(stream)
+
+
+def _get_frame_name(node: "CallTreeNode") -> str:
+    name = _format_address(bytes(node.address)) if node.address else ""
+    name = name or node.call_type.value
+    if node.call_type in NON_SELECTOR_CALL_TYPES or len(node.calldata) < 4:
+        return name
+
+    return f"{name}.{_format_hex(bytes(node.calldata[:4]))}"
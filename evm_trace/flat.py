@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from typing import Any
+
+from evm_trace.base import CallTreeNode, CompactCallTreeNode, CompactEventNode, EventNode
+from evm_trace.enums import CALL_TYPE_IDS, CALL_TYPES, CallType
+
+
+class FlatCallTree:
+    """
+    A call tree stored as preorder arrays instead of nested ``calls`` lists.
+    Node ``0`` is the root and the sub-tree of node ``i`` is the range
+    ``i`` to ``end[i]``, so parent and sub-tree queries are ``O(1)``
+    and whole-tree operations never recurse.
+
+    Use :meth:`~evm_trace.flat.FlatCallTree.from_calltree` to create one.
+    """
+
+    def __init__(self) -> None:
+        self.parent = array("q")
+        """The index of each node's parent (``-1`` for the root)."""
+
+        self.depth = array("q")
+        """The ``depth`` of each node."""
+
+        self.end = array("q")
+        """The (exclusive) index where each node's sub-tree ends."""
+
+        self.call_type = array("B")
+        """The index of each node's call-type in ``CALL_TYPES``."""
+
+        self.address = array("q")
+        """The index of each node's address in ``addresses``."""
+
+        self.gas_limit: array[int] | list[int] = array("q")
+        """
+        Each node's gas limit, ``-1`` when unknown. A ``list`` instead when a gas limit
+        does not fit in 64 bits, such as the ``2**64 - 1`` limits of some tracers.
+        """
+
+        self.gas_cost: array[int] | list[int] = array("q")
+        """Each node's gas cost, ``-1`` when unknown. A ``list`` like ``gas_limit``."""
+
+        self.flags = array("B")
+        """Bit ``0`` is set for failed nodes and bit ``1`` for SELFDESTRUCT nodes."""
+
+        self.addresses: list[bytes] = []
+        """Unique addresses, in order of appearance."""
+
+        self.value: list[int] = []
+        self.calldata: list[bytes] = []
+        self.returndata: list[bytes] = []
+        self.events: list[list[Any]] = []
+        self._address_ids: dict[bytes, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterate over the node indices in preorder.
+        """
+        return iter(range(len(self.parent)))
+
+    @classmethod
+    def from_calltree(cls, root: CallTreeNode | CompactCallTreeNode) -> FlatCallTree:
+        """
+        Flatten a call tree.
+
+        Args:
+            root (:class:`~evm_trace.base.CallTreeNode` |
+              :class:`~evm_trace.base.CompactCallTreeNode`): The root of the call tree.
+
+        Returns:
+            :class:`~evm_trace.flat.FlatCallTree`
+        """
+        tree = cls()
+        stack: list[tuple[Any, int]] = [(root, -1)]
+        while stack:
+            node, parent = stack.pop()
+            index = len(tree.parent)
+            tree.parent.append(parent)
+            tree.depth.append(node.depth)
+            tree.end.append(index + 1)
+            tree.call_type.append(CALL_TYPE_IDS[node.call_type])
+            tree.address.append(tree._get_address_id(bytes(node.address)))
+            tree.gas_limit = _append_gas(tree.gas_limit, node.gas_limit)
+            tree.gas_cost = _append_gas(tree.gas_cost, node.gas_cost)
+            tree.flags.append(int(node.failed) | int(node.selfdestruct) << 1)
+            tree.value.append(node.value)
+            tree.calldata.append(node.calldata)
+            tree.returndata.append(node.returndata)
+            tree.events.append(node.events)
+            stack.extend((call, index) for call in reversed(node.calls))
+
+        # Children come after their parents, so walking backwards completes
+        # every sub-tree before it is needed.
+        for index in range(len(tree.parent) - 1, 0, -1):
+            parent = tree.parent[index]
+            if tree.end[index] > tree.end[parent]:
+                tree.end[parent] = tree.end[index]
+
+        return tree
+
+    def get_parent(self, index: int) -> int | None:
+        """
+        The index of the node's parent, or ``None`` for the root.
+        """
+        parent = self.parent[index]
+        return None if parent < 0 else parent
+
+    def get_subtree(self, index: int) -> range:
+        """
+        The indices of the node and all of its descendants.
+        """
+        return range(index, self.end[index])
+
+    def get_subtree_size(self, index: int) -> int:
+        """
+        The number of nodes in the sub-tree, including the node itself.
+        """
+        return self.end[index] - index
+
+    def get_children(self, index: int) -> Iterator[int]:
+        """
+        Iterate over the indices of the node's direct sub-calls.
+        """
+        child = index + 1
+        end = self.end[index]
+        while child < end:
+            yield child
+            child = self.end[child]
+
+    def get_ancestors(self, index: int) -> Iterator[int]:
+        """
+        Iterate over the node's parent, grand-parent, and so on up to the root.
+        """
+        parent = self.parent[index]
+        while parent >= 0:
+            yield parent
+            parent = self.parent[parent]
+
+    def get_call_type(self, index: int) -> CallType:
+        return CALL_TYPES[self.call_type[index]]
+
+    def get_address(self, index: int) -> bytes:
+        return self.addresses[self.address[index]]
+
+    def get_gas_cost(self, index: int) -> int | None:
+        gas_cost = self.gas_cost[index]
+        return None if gas_cost < 0 else gas_cost
+
+    def get_gas_limit(self, index: int) -> int | None:
+        gas_limit = self.gas_limit[index]
+        return None if gas_limit < 0 else gas_limit
+
+    def is_failed(self, index: int) -> bool:
+        return bool(self.flags[index] & 1)
+
+    def is_selfdestruct(self, index: int) -> bool:
+        return bool(self.flags[index] & 2)
+
+    def to_calltree(self, compact: bool = False) -> CallTreeNode | CompactCallTreeNode:
+        """
+        Convert back to a nested call tree.
+
+        Args:
+            compact (bool): Set to ``True`` to get a
+              :class:`~evm_trace.base.CompactCallTreeNode` instead.
+
+        Returns:
+            :class:`~evm_trace.base.CallTreeNode`
+        """
+        nodes: list[Any] = []
+        for index in self:
+            kwargs: dict[str, Any] = {
+                "call_type": self.get_call_type(index),
+                "address": self.get_address(index),
+                "value": self.value[index],
+                "depth": self.depth[index],
+                "gas_limit": self.get_gas_limit(index),
+                "gas_cost": self.get_gas_cost(index),
+                "calldata": self.calldata[index],
+                "returndata": self.returndata[index],
+                "failed": self.is_failed(index),
+                "selfdestruct": self.is_selfdestruct(index),
+            }
+            if compact:
+                node: Any = CompactCallTreeNode.from_kwargs(
+                    **kwargs, events=[_to_compact_event(e) for e in self.events[index]]
+                )
+            else:
+                node = CallTreeNode(
+                    **kwargs, events=[_to_pydantic_event(e) for e in self.events[index]]
+                )
+
+            nodes.append(node)
+            if (parent := self.parent[index]) >= 0:
+                nodes[parent].calls.append(node)
+
+        return nodes[0]
+
+    def _get_address_id(self, address: bytes) -> int:
+        if (address_id := self._address_ids.get(address)) is None:
+            address_id = len(self.addresses)
+            self._address_ids[address] = address_id
+            self.addresses.append(address)
+
+        return address_id
+
+
+def _append_gas(values: array[int] | list[int], gas: int | None) -> array[int] | list[int]:
+    value = -1 if gas is None else gas
+    try:
+        values.append(value)
+    except OverflowError:
+        # NOTE: Gas is a uint256, so fall back to a list for the rare values over 2**63.
+        values = [*values, value]
+
+    return values
+
+
+def _to_compact_event(event: EventNode | CompactEventNode) -> CompactEventNode:
+    return CompactEventNode.from_pydantic(event) if isinstance(event, EventNode) else event
+
+
+def _to_pydantic_event(event: EventNode | CompactEventNode) -> EventNode:
+    return event.to_pydantic() if isinstance(event, CompactEventNode) else event
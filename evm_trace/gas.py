@@ -1,5 +1,13 @@
 import copy
-from typing import TYPE_CHECKING, TypeVar
+import math
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
+
+from msgspec import Struct
 
 if TYPE_CHECKING:
     from evm_trace.base import CallTreeNode
@@ -7,6 +15,138 @@ if TYPE_CHECKING:
 ContractID = TypeVar("ContractID")
 MethodID = TypeVar("MethodID")
 GasReport = dict[ContractID, dict[MethodID, list[int]]]
+GasStatsReport = dict[ContractID, dict[MethodID, "GasStats"]]
+
+
+class GasStats(Struct):
+    """
+    Constant-memory statistics of gas costs, used instead of the list of every gas cost
+    in a :class:`~evm_trace.gas.GasStatsReport`. Percentiles are estimated from a
+    sketch of logarithmic buckets, accurate to within ``RELATIVE_ACCURACY``, and merging
+    statistics gives the same result in any order.
+    """
+
+    RELATIVE_ACCURACY: ClassVar[float] = 0.01
+
+    count: int = 0
+    """The number of gas costs."""
+
+    total: int = 0
+    """The sum of the gas costs."""
+
+    total_squares: int = 0
+    """The sum of the squared gas costs, for the variance."""
+
+    min: int | None = None
+    """The lowest gas cost."""
+
+    max: int | None = None
+    """The highest gas cost."""
+
+    buckets: dict[int, int] = {}
+    """The number of gas costs in each logarithmic bucket."""
+
+    @classmethod
+    def from_values(cls, values: list[int]) -> "GasStats":
+        stats = cls()
+        for value in values:
+            stats.add(value)
+
+        return stats
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """
+        The population variance.
+        """
+        if not self.count:
+            return 0.0
+
+        # NOTE: Computed from exact integer sums, so it does not depend on the merge order.
+        return (self.total_squares * self.count - self.total**2) / self.count**2
+
+    def add(self, gas: int):
+        """
+        Add a gas cost.
+        """
+        self.count += 1
+        self.total += gas
+        self.total_squares += gas * gas
+        self.min = gas if self.min is None else min(self.min, gas)
+        self.max = gas if self.max is None else max(self.max, gas)
+        index = _get_bucket_index(gas)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "GasStats"):
+        """
+        Add the gas costs of other statistics.
+        """
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def copy(self) -> "GasStats":
+        return GasStats(
+            count=self.count,
+            total=self.total,
+            total_squares=self.total_squares,
+            min=self.min,
+            max=self.max,
+            buckets=dict(self.buckets),
+        )
+
+    def quantile(self, q: float) -> int | None:
+        """
+        Estimate a quantile of the gas costs, such as ``0.5`` for the median.
+
+        Args:
+            q (float): The quantile, between ``0`` and ``1``.
+
+        Returns:
+            int | None: The estimated gas cost, or ``None`` without gas costs.
+        """
+        if self.min is None or self.max is None:
+            return None
+
+        elif q <= 0:
+            return self.min
+
+        elif q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return max(self.min, min(self.max, round(_get_bucket_value(index))))
+
+        return self.max
+
+
+_GAMMA = (1 + GasStats.RELATIVE_ACCURACY) / (1 - GasStats.RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+
+def _get_bucket_index(gas: int) -> int:
+    # NOTE: Bucket `i` holds the gas costs in `(gamma^(i-1), gamma^i]`; `-1` holds zeros.
+    return math.ceil(math.log(gas) / _LOG_GAMMA) if gas > 0 else -1
+
+
+def _get_bucket_value(index: int) -> float:
+    # The value within the relative accuracy of the whole bucket.
+    return 2 * _GAMMA**index / (_GAMMA + 1) if index >= 0 else 0.0
 
 
 def get_gas_report(calltree: "CallTreeNode") -> GasReport:
@@ -19,16 +159,67 @@ def get_gas_report(calltree: "CallTreeNode") -> GasReport:
     Returns:
         :class:`~evm_trace.gas.GasReport`: Gas report structure from a call tree.
     """
-    report = {
-        calltree.address: {calltree.calldata[:4]: [calltree.gas_cost] if calltree.gas_cost else []}
-    }
-    return merge_reports(report, *map(get_gas_report, calltree.calls))
+    builder = GasReportBuilder()
+    builder.add(calltree)
+    return builder.report
+
+
+class GasReportBuilder:
+    """
+    Build a gas report from many call trees, such as every transaction in a block,
+    in a single pass over each. The same as merging the reports from
+    :meth:`~evm_trace.gas.get_gas_report`, without copying them.
+
+    Set ``stats`` to build a :class:`~evm_trace.gas.GasStatsReport`, which keeps
+    constant-memory :class:`~evm_trace.gas.GasStats` instead of every gas cost.
 
+    Usage example::
 
-def merge_reports(*reports: GasReport) -> GasReport:
+        builder = GasReportBuilder()
+        for calltree in calltrees:
+            builder.add(calltree)
+
+        report = builder.report
+    """
+
+    def __init__(self, stats: bool = False) -> None:
+        self.stats = stats
+        self.report: dict[Any, dict[Any, Any]] = {}
+
+    def add(self, calltree: "CallTreeNode"):
+        """
+        Add the gas costs of every call in a call tree to the report.
+
+        Args:
+            calltree (:class:`~evm_trace.base.CallTreeNode`): call tree used for gas report.
+        """
+        report = self.report
+        # NOTE: Depth-first, so the gas costs are in the same order as when merging reports.
+        stack = [calltree]
+        while stack:
+            node = stack.pop()
+            methods = report.get(node.address)
+            if methods is None:
+                methods = report[node.address] = {}
+
+            method_id = node.calldata[:4]
+            gas_costs: Any = methods.get(method_id)
+            if gas_costs is None:
+                gas_costs = methods[method_id] = GasStats() if self.stats else []
+
+            if node.gas_cost and self.stats:
+                gas_costs.add(node.gas_cost)
+            elif node.gas_cost:
+                gas_costs.append(node.gas_cost)
+
+            stack.extend(reversed(node.calls))
+
+
+def merge_reports(*reports: GasReport | GasStatsReport) -> GasReport | GasStatsReport:
     """
     Merge method for merging a list of gas reports and combining a list of gas costs.
-    If given a single report, it only returns it.
+    If given a single report, it only returns it. Reports of
+    :class:`~evm_trace.gas.GasStats` are merged by combining the statistics.
     """
     reports_ls = list(reports)
     num_reports = len(reports_ls)
@@ -38,17 +229,110 @@ def merge_reports(*reports: GasReport) -> GasReport:
     elif num_reports == 1:
         return reports_ls[0]
 
-    merged_report: GasReport = copy.deepcopy(reports_ls.pop(0))
+    merged_report: dict[Any, dict[Any, Any]] = copy.deepcopy(reports_ls.pop(0))
     for report in reports_ls:
-        for outer_key, inner_dict in report.items():
-            if outer_key not in merged_report:
-                merged_report[outer_key] = inner_dict
-                continue
-
-            for inner_key, inner_list in report[outer_key].items():
-                if inner_key in merged_report[outer_key]:
-                    merged_report[outer_key][inner_key].extend(inner_list)
-                else:
-                    merged_report[outer_key][inner_key] = inner_list
+        _merge_into(merged_report, report)
 
     return merged_report
+
+
+def _merge_into(merged_report: dict[Any, dict[Any, Any]], report: GasReport | GasStatsReport):
+    for outer_key, inner_dict in report.items():
+        if outer_key not in merged_report:
+            merged_report[outer_key] = {k: _copy_gas(v) for k, v in inner_dict.items()}
+            continue
+
+        for inner_key, inner_value in inner_dict.items():
+            if inner_key not in merged_report[outer_key]:
+                merged_report[outer_key][inner_key] = _copy_gas(inner_value)
+            elif isinstance(inner_value, GasStats):
+                merged_report[outer_key][inner_key].merge(inner_value)
+            else:
+                merged_report[outer_key][inner_key].extend(inner_value)
+
+
+def _copy_gas(value: list[int] | GasStats) -> list[int] | GasStats:
+    # NOTE: Copied so that merging more reports does not modify the given reports.
+    return value.copy()
+
+
+def get_parallel_gas_report(
+    payloads: Iterable[dict | list | bytes],
+    stats: bool = False,
+    max_workers: int | None = None,
+    chunk_size: int = 32,
+) -> GasReport | GasStatsReport:
+    """
+    Build a gas report from many raw traces, such as every transaction in a block range,
+    parsing and reporting them in a process pool. The partial reports are merged in order,
+    so the report is the same as building it from each trace in turn.
+
+    Payloads may be in any supported format:
+
+    * ``dict``: A ``debug_traceTransaction`` result using the ``callTracer``.
+    * ``list``: The Parity-style traces of a transaction, such as from ``trace_transaction``.
+    * ``bytes``: The raw response of ``trace_replayTransaction`` or
+      ``trace_replayBlockTransactions`` using the ``vmTrace`` tracer, and optionally the
+      ``trace`` tracer for the address of the root call.
+
+    Args:
+        payloads (Iterable[dict | list | bytes]): The raw traces, which may be a generator.
+        stats (bool): Set to ``True`` to build a :class:`~evm_trace.gas.GasStatsReport`.
+        max_workers (int | None): The number of processes, defaults to the number of CPUs.
+        chunk_size (int): The number of payloads per task.
+
+    Returns:
+        :class:`~evm_trace.gas.GasReport` | :class:`~evm_trace.gas.GasStatsReport`
+    """
+    report: dict[Any, dict[Any, Any]] = {}
+    # NOTE: Bound the tasks in flight, so payloads are only read as workers need them.
+    max_pending = 2 * (max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending: deque[Future] = deque()
+        for chunk in _iter_chunks(payloads, chunk_size):
+            pending.append(executor.submit(_get_partial_gas_report, chunk, stats))
+            if len(pending) >= max_pending:
+                _merge_into(report, pending.popleft().result())
+
+        while pending:
+            _merge_into(report, pending.popleft().result())
+
+    return report
+
+
+def _iter_chunks(payloads: Iterable, chunk_size: int) -> Iterator[list]:
+    iterator = iter(payloads)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _get_partial_gas_report(
+    payloads: list[dict | list | bytes], stats: bool
+) -> GasReport | GasStatsReport:
+    builder = GasReportBuilder(stats=stats)
+    for payload in payloads:
+        for calltree in _get_calltrees_from_payload(payload):
+            builder.add(calltree)
+
+    return builder.report
+
+
+def _get_calltrees_from_payload(payload: dict | list | bytes) -> list:
+    # NOTE: Imported here, so each format's dependencies only load in the workers using it.
+    if isinstance(payload, dict):
+        from evm_trace.geth import get_calltree_from_geth_call_trace
+
+        return [get_calltree_from_geth_call_trace(payload, compact=True)]
+
+    elif isinstance(payload, list):
+        from evm_trace.parity import ParityTraceList, get_calltree_from_parity_trace
+
+        traces = ParityTraceList.model_validate(payload)
+        return [get_calltree_from_parity_trace(traces, compact=True)]
+
+    elif isinstance(payload, (bytes, bytearray)):
+        from evm_trace.vmtrace import get_calltrees_from_rpc_response
+
+        return get_calltrees_from_rpc_response(bytes(payload), compact=True)
+
+    raise TypeError(f"Unsupported trace payload type '{type(payload).__name__}'.")
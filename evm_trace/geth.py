@@ -1,12 +1,33 @@
 import math
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any, Literal, overload
 
 from eth_pydantic_types import HexBytes, HexBytes20
 from eth_utils import to_hex, to_int
+from msgspec import Struct
 from pydantic import Field, RootModel, field_validator
 
-from evm_trace.base import BaseModel, CallTreeNode, EventNode
-from evm_trace.enums import CALL_OPCODES, CallType
+from evm_trace.base import (
+    BaseModel,
+    BuildOptions,
+    CallTreeNode,
+    CompactCallTreeNode,
+    CompactEventNode,
+    EventNode,
+    _to_bytes,
+)
+from evm_trace.enums import CALL_OPCODE_VALUES, CALL_OPCODES, CallType
+from evm_trace.stream import (
+    CallStreamEvent,
+    call_entered,
+    call_exited,
+    create_node,
+    event_emitted,
+)
+
+if TYPE_CHECKING:
+    from evm_trace.address import CreateAddressResolver
+    from evm_trace.interning import CallTreeInterner
 
 
 class TraceMemory(RootModel[list[HexBytes]]):
@@ -55,6 +76,22 @@ class TraceFrame(BaseModel):
     def validate_ints(cls, value):
         return int(value, 16) if isinstance(value, str) else value
 
+    @property
+    def has_stack(self) -> bool:
+        """
+        ``False`` when the trace was captured without the stack, such as using
+        ``disableStack``.
+        """
+        return "stack" in self.model_fields_set
+
+    @property
+    def has_memory(self) -> bool:
+        """
+        ``False`` when the trace was captured without memory, which is the default
+        unless using ``enableMemory``.
+        """
+        return "memory" in self.model_fields_set
+
     @property
     def address(self) -> HexBytes20 | None:
         """
@@ -62,15 +99,17 @@ class TraceFrame(BaseModel):
         Only returns a value if this frame's opcode is a call-based opcode.
         """
 
-        if not self.contract_address and (
-            self.op in CALL_OPCODES and CallType.CREATE.value not in self.op
+        if (
+            not self.contract_address
+            and (self.op in CALL_OPCODES and CallType.CREATE.value not in self.op)
+            and len(self.stack) >= 2
         ):
             self.contract_address = HexBytes20.__eth_pydantic_validate__(self.stack[-2][-20:])
 
         return self.contract_address
 
 
-def create_trace_frames(data: Iterator[dict]) -> Iterator[TraceFrame]:
+def create_trace_frames(data: Iterator[dict], lookahead: bool = True) -> Iterator[TraceFrame]:
     """
     Get trace frames from ``debug_traceTransaction`` response items.
     Sets the ``contract_address`` for CREATE and CREATE2 frames by
@@ -78,6 +117,9 @@ def create_trace_frames(data: Iterator[dict]) -> Iterator[TraceFrame]:
 
     Args:
         data (Iterator[dict]): An iterator of response struct logs.
+        lookahead (bool): Set to ``False`` to yield each frame as soon as it is parsed,
+          without buffering the frames of CREATE and CREATE2 calls. The addresses can then
+          be computed using a :class:`~evm_trace.address.CreateAddressResolver` instead.
 
     Returns:
         Iterator[:class:`~evm_trace.geth.TraceFrame`]
@@ -90,13 +132,13 @@ def create_trace_frames(data: Iterator[dict]) -> Iterator[TraceFrame]:
     for frame in frames:
         frame_obj = TraceFrame(**frame)
 
-        if CallType.CREATE.value in frame_obj.op:
+        if lookahead and CallType.CREATE.value in frame_obj.op:
             # Look ahead to find the address.
             create_frames = _get_create_frames(frame_obj, frames)
             yield from create_frames
 
         else:
-            yield TraceFrame(**frame)
+            yield frame_obj
 
 
 def _get_create_frames(frame: TraceFrame, frames: Iterator[dict]) -> list[TraceFrame]:
@@ -126,84 +168,672 @@ def _get_create_frames(frame: TraceFrame, frames: Iterator[dict]) -> list[TraceF
     return create_frames
 
 
-def get_calltree_from_geth_call_trace(data: dict) -> CallTreeNode:
+@overload
+def get_calltree_from_geth_call_trace(
+    data: dict,
+    compact: Literal[False] = False,
+    interner: "CallTreeInterner | None" = None,
+    options: BuildOptions | None = None,
+) -> CallTreeNode: ...
+
+
+@overload
+def get_calltree_from_geth_call_trace(
+    data: dict,
+    compact: Literal[True],
+    interner: "CallTreeInterner | None" = None,
+    options: BuildOptions | None = None,
+    lazy_bytes: bool = False,
+) -> CompactCallTreeNode: ...
+
+
+def get_calltree_from_geth_call_trace(
+    data: dict,
+    compact: bool = False,
+    interner: "CallTreeInterner | None" = None,
+    options: BuildOptions | None = None,
+    lazy_bytes: bool = False,
+) -> CallTreeNode | CompactCallTreeNode:
     """
     Creates a CallTreeNode from a given transaction call trace.
 
     Args:
         data (dict): The response from ``debug_traceTransaction`` when using
           ``tracer=callTracer``.
+        compact (bool): Set to ``True`` to get a
+          :class:`~evm_trace.base.CompactCallTreeNode` instead.
+        interner (:class:`~evm_trace.interning.CallTreeInterner` | None): Share identical
+          sub-trees and byte values using this interner.
+        options (:class:`~evm_trace.base.BuildOptions` | None): Skip calls and fields,
+          before they are validated.
+        lazy_bytes (bool): Set to ``True`` to only decode the ``calldata`` and ``returndata``
+          when used, see :class:`~evm_trace.base.LazyHexBytes`. Requires ``compact=True``.
 
     Returns:
         :class:`~evm_trace.base.CallTreeNode`: Call tree of transaction trace.
     """
+    if lazy_bytes and not compact:
+        raise ValueError("`lazy_bytes` requires `compact=True`.")
 
     data = _validate_data_from_call_tracer(data)
-    root = CallTreeNode(**data)
+    if options is not None:
+        data = _prune_call_tracer_data(data, options)
 
-    def fix_depth(r: CallTreeNode):
+    root = (
+        CompactCallTreeNode.from_kwargs(lazy_bytes=lazy_bytes, **data)
+        if compact
+        else CallTreeNode(**data)
+    )
+
+    def fix_depth(r: CallTreeNode | CompactCallTreeNode):
         for c in r.calls:
             c.depth = r.depth + 1
             fix_depth(c)
 
     fix_depth(root)
-    return root
+    return interner.intern_tree(root) if interner is not None else root
 
 
+@overload
 def get_calltree_from_geth_trace(
-    trace: Iterator[TraceFrame], show_internal: bool = False, **root_node_kwargs
-) -> CallTreeNode:
+    trace: Iterator[TraceFrame],
+    show_internal: bool = False,
+    compact: Literal[False] = False,
+    interner: "CallTreeInterner | None" = None,
+    options: BuildOptions | None = None,
+    unavailable: set[str] | None = None,
+    create_resolver: "CreateAddressResolver | None" = None,
+    **root_node_kwargs,
+) -> CallTreeNode: ...
+
+
+@overload
+def get_calltree_from_geth_trace(
+    trace: Iterator[TraceFrame],
+    show_internal: bool = False,
+    *,
+    compact: Literal[True],
+    interner: "CallTreeInterner | None" = None,
+    options: BuildOptions | None = None,
+    unavailable: set[str] | None = None,
+    create_resolver: "CreateAddressResolver | None" = None,
+    **root_node_kwargs,
+) -> CompactCallTreeNode: ...
+
+
+def get_calltree_from_geth_trace(
+    trace: Iterator[TraceFrame],
+    show_internal: bool = False,
+    compact: bool = False,
+    interner: "CallTreeInterner | None" = None,
+    options: BuildOptions | None = None,
+    unavailable: set[str] | None = None,
+    create_resolver: "CreateAddressResolver | None" = None,
+    **root_node_kwargs,
+) -> CallTreeNode | CompactCallTreeNode:
     """
     Creates a CallTreeNode from a given transaction trace.
 
+    Traces captured without the stack or memory, such as using ``disableStack`` or
+    without ``enableMemory``, still give the structure of the call tree, but the
+    fields depending on them are left unset. Pass a set as ``unavailable`` to find
+    out which, for example ``{"calldata", "returndata"}`` without memory.
+
     Args:
         trace (Iterator[TraceFrame]): Iterator of transaction trace frames.
         show_internal (bool): Boolean whether to display internal calls.
           Defaults to ``False``.
+        compact (bool): Set to ``True`` to get a
+          :class:`~evm_trace.base.CompactCallTreeNode` instead.
+        interner (:class:`~evm_trace.interning.CallTreeInterner` | None): Share identical
+          sub-trees and byte values using this interner, as the tree is built.
+        options (:class:`~evm_trace.base.BuildOptions` | None): Skip calls and fields,
+          without extracting them from memory.
+        unavailable (set[str] | None): Add the names of the fields missing from the trace,
+          such as ``"address"``, ``"calldata"``, ``"returndata"`` or ``"events"``.
+        create_resolver (:class:`~evm_trace.address.CreateAddressResolver` | None): Compute
+          the addresses of CREATE and CREATE2 calls at the frame they are made, falling back
+          to the frame they return to. Requires the root ``address``. Frames from
+          ``create_trace_frames(data, lookahead=False)`` then work the same.
         root_node_kwargs (dict): Keyword arguments passed to the root ``CallTreeNode``.
 
     Returns:
         :class:`~evm_trace.base.CallTreeNode`: Call tree of transaction trace.
     """
 
-    return _create_node(
+    root = _create_node(
         trace=trace,
         show_internal=show_internal,
+        compact=compact,
+        interner=interner,
+        options=options,
+        unavailable=unavailable,
+        create_resolver=create_resolver,
+        context_address=_get_context_address(create_resolver, root_node_kwargs),
         **root_node_kwargs,
     )
+    return interner.intern_node(root) if interner is not None else root
+
 
+def stream_calltree_from_geth_call_trace(
+    data: dict, compact: bool = False
+) -> Iterator[CallStreamEvent]:
+    """
+    Stream the calls of a transaction call trace as they are entered and exited,
+    instead of building a call tree. See :class:`~evm_trace.stream.CallStreamEvent`.
+
+    Args:
+        data (dict): The response from ``debug_traceTransaction`` when using
+          ``tracer=callTracer``.
+        compact (bool): Set to ``True`` to stream
+          :class:`~evm_trace.base.CompactCallTreeNode` objects instead.
+
+    Returns:
+        Iterator[:class:`~evm_trace.stream.CallStreamEvent`]
+    """
+    data = _validate_data_from_call_tracer(data)
+    # Either call data and the parent's depth, or a node to exit.
+    stack: list[tuple[dict, int | None] | CallTreeNode | CompactCallTreeNode] = [(data, None)]
+    while stack:
+        item = stack.pop()
+        if not isinstance(item, tuple):
+            yield call_exited(item)
+            continue
+
+        call_data, parent_depth = item
+        node_kwargs = {k: v for k, v in call_data.items() if k != "calls"}
+        if parent_depth is not None:
+            node_kwargs["depth"] = parent_depth + 1
+
+        node = create_node(compact=compact, **node_kwargs)
+        yield call_entered(node)
+        stack.append(node)
+        stack.extend((c, node.depth) for c in reversed(call_data["calls"]))
+
+
+def stream_calltree_from_geth_trace(
+    trace: Iterator[TraceFrame],
+    compact: bool = False,
+    create_resolver: "CreateAddressResolver | None" = None,
+    **root_node_kwargs,
+) -> Iterator[CallStreamEvent]:
+    """
+    Stream the calls of a transaction trace as they are entered and exited, instead of
+    building a call tree. Only the calls in progress are kept, so memory is bounded by the
+    call depth rather than the size of the trace. See
+    :class:`~evm_trace.stream.CallStreamEvent`.
+
+    **NOTE**: The address of a ``CREATE`` or ``CREATE2`` call is only known after it
+    completes, so it is set by the time the call exits, unless computed by the
+    ``create_resolver`` when the call is entered.
 
-def create_call_node_data(frame: TraceFrame) -> dict:
+    Args:
+        trace (Iterator[TraceFrame]): Iterator of transaction trace frames.
+        compact (bool): Set to ``True`` to stream
+          :class:`~evm_trace.base.CompactCallTreeNode` objects instead.
+        create_resolver (:class:`~evm_trace.address.CreateAddressResolver` | None): Compute
+          the addresses of CREATE and CREATE2 calls at the frame they are made, so they exit
+          without waiting for the next frame. Requires the root ``address``.
+        root_node_kwargs (dict): Keyword arguments passed to the root ``CallTreeNode``.
+
+    Returns:
+        Iterator[:class:`~evm_trace.stream.CallStreamEvent`]
+    """
+    stream = GethCallTreeStream(
+        compact=compact, create_resolver=create_resolver, **root_node_kwargs
+    )
+    yield from stream.start()
+    for frame in iter(trace):
+        yield from stream.feed(frame)
+        if stream.done:
+            return
+
+    yield from stream.finish()
+
+
+class GethCallTreeStream:
+    """
+    The state of :meth:`~evm_trace.geth.stream_calltree_from_geth_trace`, for pushing
+    trace frames one at a time instead of pulling them from an iterator.
+
+    Only the frames with an opcode in ``opcodes`` affect the call tree, unless
+    ``opcodes`` is ``None``, in which case the next frame is needed (whatever its opcode).
+    """
+
+    # Opcodes that affect the call tree.
+    OPCODES = frozenset(
+        (
+            *(x.value for x in CALL_OPCODES),
+            *(f"LOG{n}" for n in range(5)),
+            CallType.SELFDESTRUCT.value,
+            "STOP",
+            "RETURN",
+            "REVERT",
+        )
+    )
+
+    def __init__(
+        self,
+        compact: bool = False,
+        create_resolver: "CreateAddressResolver | None" = None,
+        **root_node_kwargs,
+    ):
+        self.compact = compact
+        self.create_resolver = create_resolver
+        self.root_node_kwargs = root_node_kwargs
+        # The calls in progress, each with a completed CREATE sub-call awaiting its address,
+        # the address of its context, whether its own address is known and the checkpoint
+        # of the ``create_resolver`` nonces to restore if it fails.
+        self.stack: list[list] = []
+        self.done = False
+
+    @property
+    def opcodes(self) -> frozenset[str] | None:
+        if self.stack and self.stack[-1][1] is not None:
+            # The CREATE address is in the next frame.
+            return None
+
+        elif self.create_resolver is not None and self.create_resolver.pending:
+            # Whether the CREATE ran is shown by the depth of the next frame.
+            return None
+
+        return self.OPCODES
+
+    def start(self) -> Iterator[CallStreamEvent]:
+        root = _create_stream_node(self.compact, **self.root_node_kwargs)
+        context_address = _get_context_address(self.create_resolver, self.root_node_kwargs)
+        self.stack.append([root, None, context_address, True, 0])
+        yield call_entered(root)
+
+    def feed(self, frame: TraceFrame) -> Iterator[CallStreamEvent]:
+        stack = self.stack
+        compact = self.compact
+        node, create, context_address, *_ = stack[-1]
+        if self.create_resolver is not None and self.create_resolver.observe(frame.depth):
+            # The CREATE failed before running, so its result is in this frame.
+            _update_stream_node(node, compact, failed=True)
+            stack[-1][3] = False
+            yield from self._exit()
+            node, create, context_address, *_ = stack[-1]
+
+        if create is not None:
+            # The data is located at the first frame with the same depth after the
+            # CREATE or CREATE2 opcode was found.
+            stack[-1][1] = None
+            if frame.depth == create.depth and frame.stack:
+                _update_stream_node(
+                    create,
+                    compact,
+                    address=HexBytes20.__eth_pydantic_validate__(frame.stack[-1][-40:]),
+                    calldata=(
+                        frame.memory.get(frame.stack[-4], frame.stack[-5])
+                        if frame.has_memory and len(frame.stack) >= 5
+                        else None
+                    ),
+                )
+
+            yield call_exited(create)
+
+        if frame.op not in self.OPCODES:
+            return
+
+        elif frame.op in CALL_OPCODE_VALUES:
+            data = create_call_node_data(frame)
+            resolved = data["call_type"] not in (
+                CallType.CREATE,
+                CallType.CREATE2,
+            ) or _resolve_create_data(data, frame, self.create_resolver, context_address, None)
+            subcall = _create_stream_node(compact, **data)
+            stack.append(
+                [
+                    subcall,
+                    None,
+                    (
+                        _get_sub_context_address(frame, data, context_address)
+                        if self.create_resolver is not None
+                        else None
+                    ),
+                    resolved,
+                    self.create_resolver.checkpoint() if self.create_resolver is not None else 0,
+                ]
+            )
+            yield call_entered(subcall)
+            return
+
+        elif frame.op.startswith("LOG"):
+            if len(frame.stack) < int(frame.op[3]) + 3:
+                # Without the stack, there are no topics to make an event from.
+                return
+
+            event = _create_event_node(frame)
+            yield event_emitted(node, CompactEventNode.from_pydantic(event) if compact else event)
+            return
+
+        elif frame.op == CallType.SELFDESTRUCT.value:
+            node.selfdestruct = True
+
+        elif frame.op in ("RETURN", "REVERT"):
+            if node.returndata:
+                return
+
+            _update_stream_node(
+                node,
+                compact,
+                returndata=(
+                    frame.memory.get(frame.stack[-1], frame.stack[-2])
+                    if frame.has_memory and len(frame.stack) >= 2
+                    else None
+                ),
+                failed=frame.op == "REVERT",
+            )
+
+        # The call completed.
+        yield from self._exit()
+        self.done = not stack
+
+    def finish(self) -> Iterator[CallStreamEvent]:
+        """
+        Exit the calls still in progress, such as when the trace ended early.
+        """
+        while self.stack:
+            yield from self._exit()
+
+        self.done = True
+
+    def _exit(self) -> Iterator[CallStreamEvent]:
+        node, create, _, resolved, checkpoint = self.stack.pop()
+        if create is not None:
+            yield call_exited(create)
+
+        if self.create_resolver is not None and node.failed:
+            # The nonces of the reverted call are reverted too.
+            self.create_resolver.rollback(checkpoint)
+
+        if not resolved and self.stack:
+            # Exits once the address is known.
+            self.stack[-1][1] = node
+        else:
+            yield call_exited(node)
+
+
+def _create_stream_node(compact: bool, **node_kwargs) -> CallTreeNode | CompactCallTreeNode:
+    node_kwargs.pop("last_create_depth", None)
+    if node_kwargs.get("call_type") in (CallType.CREATE, CallType.CREATE2) and not node_kwargs.get(
+        "address"
+    ):
+        # Set temporary address so validation succeeds.
+        node_kwargs["address"] = 20 * b"\x00"
+
+    return create_node(compact=compact, **node_kwargs)
+
+
+def _update_stream_node(node: CallTreeNode | CompactCallTreeNode, compact: bool, **fields):
+    for name, value in fields.items():
+        if value is None:
+            continue
+
+        setattr(node, name, bytes(value) if compact and isinstance(value, bytes) else value)
+
+
+class EmittedEvent(Struct):
+    """
+    An event found by :meth:`~evm_trace.geth.stream_events_from_geth_trace`.
+    """
+
+    address: bytes
+    """The address of the contract emitting the event, or empty if unknown."""
+
+    event: Any
+    """The :class:`~evm_trace.base.EventNode` or :class:`~evm_trace.base.CompactEventNode`."""
+
+    reverted: bool = False
+    """Whether the call emitting the event, or one of its callers, reverted."""
+
+    index: int = 0
+    """The position of the event in the trace, counting reverted events."""
+
+
+def stream_events_from_geth_trace(
+    data: Iterable[dict | TraceFrame],
+    compact: bool = False,
+    failed: bool = False,
+    create_resolver: "CreateAddressResolver | None" = None,
+    address: str | bytes | None = None,
+) -> Iterator[EmittedEvent]:
+    """
+    Find the events of a transaction trace without building the call tree, such as for
+    indexing. Only the ``LOG`` frames are decoded, and each event is attributed to the
+    contract emitting it by tracking the addresses of the calls in progress.
+
+    **NOTE**: An event is only final once its call and its callers completed, since any
+    of them reverting also reverts the event. Reverted events are yielded as soon as the
+    call reverts, and the rest are yielded in order once the transaction completes.
+
+    Args:
+        data (Iterable[dict | :class:`~evm_trace.geth.TraceFrame`]): The response struct
+          logs, decoded or not.
+        compact (bool): Set to ``True`` to get
+          :class:`~evm_trace.base.CompactEventNode` objects instead.
+        failed (bool): Whether the transaction failed, such as when running out of gas,
+          which reverts every event.
+        create_resolver (:class:`~evm_trace.address.CreateAddressResolver` | None): Compute
+          the addresses of CREATE and CREATE2 calls at the frame they are made, instead of
+          the frame they return to.
+        address (str | bytes | None): The address of the contract called by the transaction.
+
+    Returns:
+        Iterator[:class:`~evm_trace.geth.EmittedEvent`]
+    """
+    stream = GethEventStream(compact=compact, create_resolver=create_resolver, address=address)
+    for frame in data:
+        yield from stream.feed(frame)
+
+    yield from stream.finish(failed=failed)
+
+
+class _EventContext:
+    """
+    A call in progress, with the events emitted by it and the sub-calls that completed.
+    """
+
+    __slots__ = ("depth", "owner", "address", "create", "checkpoint", "last_op", "events")
+
+    def __init__(self, depth: int, owner: "_EventContext | None", address: bytes | None):
+        self.depth = depth
+        # The context emitting events, which is the caller for DELEGATECALL and CALLCODE.
+        self.owner = owner or self
+        self.address = address
+        self.create = False
+        self.checkpoint = 0
+        self.last_op = ""
+        self.events: list[tuple[int, _EventContext, Any]] = []
+
+
+class GethEventStream:
+    """
+    The state of :meth:`~evm_trace.geth.stream_events_from_geth_trace`, for pushing
+    trace frames one at a time. Only the calls in progress and the events awaiting
+    their outcome are kept.
+    """
+
+    def __init__(
+        self,
+        compact: bool = False,
+        create_resolver: "CreateAddressResolver | None" = None,
+        address: str | bytes | None = None,
+    ):
+        self.compact = compact
+        self.create_resolver = create_resolver
+        self.address = _to_bytes(address) if address else None
+        self._contexts: list[_EventContext] = []
+        # The depth, context, address, opcode and nonce checkpoint of a call,
+        # until its first frame.
+        self._pending: tuple[int, _EventContext | None, bytes | None, str, int] | None = None
+        self._count = 0
+
+    def feed(self, frame: dict | TraceFrame) -> Iterator[EmittedEvent]:
+        if isinstance(frame, dict):
+            depth, op = frame["depth"], frame["op"]
+        else:
+            depth, op = frame.depth, frame.op
+
+        if self.create_resolver is not None:
+            self.create_resolver.observe(depth)
+
+        contexts = self._contexts
+        if not contexts:
+            contexts.append(_EventContext(depth, None, self.address))
+
+        elif self._pending is not None:
+            call_depth, owner, address, call_op, checkpoint = self._pending
+            self._pending = None
+            if depth > call_depth:
+                contexts.append(_EventContext(depth, owner, address))
+                contexts[-1].create = call_op in (CallType.CREATE.value, CallType.CREATE2.value)
+                contexts[-1].checkpoint = checkpoint
+
+        while len(contexts) > 1 and depth < contexts[-1].depth:
+            # Back in the caller, which has the result of the call on the top of the stack.
+            yield from self._exit(_get_stack_word(frame, 1))
+
+        context = contexts[-1]
+        context.last_op = op
+        if op.startswith("LOG"):
+            log_frame = _to_trace_frame(frame)
+            if len(op) == 4 and len(log_frame.stack) >= int(op[3]) + 3:
+                event: Any = _create_event_node(log_frame)
+                if self.compact:
+                    event = CompactEventNode.from_pydantic(event)
+
+                context.events.append((self._count, context.owner, event))
+                self._count += 1
+
+        elif op in CALL_OPCODE_VALUES:
+            address = None
+            owner = None
+            if op in (CallType.DELEGATECALL.value, CallType.CALLCODE.value):
+                owner = context.owner
+            elif op in (CallType.CREATE.value, CallType.CREATE2.value):
+                if self.create_resolver is not None:
+                    address = self.create_resolver.resolve(
+                        _to_trace_frame(frame), context.owner.address
+                    )
+            elif (word := _get_stack_word(frame, 2)) is not None:
+                address = word[-20:]
+
+            checkpoint = self.create_resolver.checkpoint() if self.create_resolver else 0
+            self._pending = (depth, owner, address, op, checkpoint)
+
+    def finish(self, failed: bool = False) -> Iterator[EmittedEvent]:
+        """
+        Complete the calls still in progress, such as when the trace ended early,
+        and yield the remaining events.
+
+        Args:
+            failed (bool): Whether the transaction failed, reverting every event.
+        """
+        self._pending = None
+        while len(self._contexts) > 1:
+            yield from self._exit(None)
+
+        if self._contexts:
+            root = self._contexts.pop()
+            yield from self._emit(root.events, failed or root.last_op == "REVERT")
+
+    def _exit(self, result: bytes | None) -> Iterator[EmittedEvent]:
+        context = self._contexts.pop()
+        if context.create and result is not None and any(result):
+            # The pushed address is authoritative, even when it was computed.
+            context.address = result[-20:]
+
+        if context.last_op == "REVERT" or (result is not None and not any(result)):
+            if self.create_resolver is not None:
+                # The nonces of the reverted call are reverted too.
+                self.create_resolver.rollback(context.checkpoint)
+
+            yield from self._emit(context.events, True)
+        else:
+            self._contexts[-1].events.extend(context.events)
+
+    def _emit(self, events: list, reverted: bool) -> Iterator[EmittedEvent]:
+        for index, owner, event in events:
+            yield EmittedEvent(
+                address=owner.address or b"", event=event, reverted=reverted, index=index
+            )
+
+
+def _to_trace_frame(frame: dict | TraceFrame) -> TraceFrame:
+    return TraceFrame.model_validate(frame) if isinstance(frame, dict) else frame
+
+
+def _get_stack_word(frame: dict | TraceFrame, index: int) -> bytes | None:
+    # The stack item at the index from the top, if the stack was captured.
+    stack = frame.get("stack") if isinstance(frame, dict) else frame.stack
+    if not stack or len(stack) < index:
+        return None
+
+    value = stack[-index]
+    if isinstance(value, str):
+        return int(value, 16).to_bytes(32, "big")
+
+    return bytes(value).rjust(32, b"\x00")
+
+
+def create_call_node_data(
+    frame: TraceFrame, include_calldata: bool = True, unavailable: set[str] | None = None
+) -> dict:
     """
     Parse a CALL-opcode frame into an address and calldata.
+    Fields missing from traces captured without the stack or memory are left unset.
 
     Args:
         frame (:class:`~evm_trace.geth.TraceFrame`): The call frame to parse.
+        include_calldata (bool): Set to ``False`` to skip extracting the calldata from memory.
+        unavailable (set[str] | None): Add the names of the fields missing from the frame.
 
     Returns:
         Tuple[str, HexBytes]: A tuple of the address str and the calldata.
     """
 
     data: dict = {"address": frame.address, "depth": frame.depth}
+    stack = frame.stack
     if frame.op == CallType.CALL.value:
         data["call_type"] = CallType.CALL
-        data["value"] = int(to_hex(frame.stack[-3]), 16)
-        data["calldata"] = frame.memory.get(frame.stack[-4], frame.stack[-5])
+        value_index, calldata_index = 3, 4
     elif frame.op == CallType.DELEGATECALL.value:
         data["call_type"] = CallType.DELEGATECALL
-        data["calldata"] = frame.memory.get(frame.stack[-3], frame.stack[-4])
+        value_index, calldata_index = 0, 3
 
     # `calldata` and `address` are handle in later frames for CREATE and CREATE2.
     elif frame.op == CallType.CREATE.value:
         data["call_type"] = CallType.CREATE
-        data["value"] = int(to_hex(frame.stack[-1]), 16)
+        value_index, calldata_index = 1, 0
     elif frame.op == CallType.CREATE2.value:
         data["call_type"] = CallType.CREATE2
-        data["value"] = int(to_hex(frame.stack[-1]), 16)
+        value_index, calldata_index = 1, 0
 
     else:
         data["call_type"] = CallType.STATICCALL
-        data["calldata"] = frame.memory.get(frame.stack[-3], frame.stack[-4])
+        value_index, calldata_index = 0, 3
+
+    if value_index and len(stack) >= value_index:
+        data["value"] = int(to_hex(stack[-value_index]), 16)
+    elif value_index and unavailable is not None:
+        unavailable.add("value")
+
+    if data["address"] is None and "CREATE" not in frame.op:
+        # Set a placeholder address, so validation succeeds.
+        data["address"] = 20 * b"\x00"
+        if unavailable is not None:
+            unavailable.add("address")
+
+    if not calldata_index or not include_calldata:
+        return data
+
+    elif frame.has_memory and len(stack) > calldata_index:
+        data["calldata"] = frame.memory.get(stack[-calldata_index], stack[-calldata_index - 1])
+    elif unavailable is not None:
+        unavailable.add("calldata")
 
     return data
 
@@ -245,8 +875,16 @@ def extract_memory(offset: HexBytes, size: HexBytes, memory: list[HexBytes]) ->
 
 
 def _create_node(
-    trace: Iterator[TraceFrame], show_internal: bool = False, **node_kwargs
-) -> CallTreeNode:
+    trace: Iterator[TraceFrame],
+    show_internal: bool = False,
+    compact: bool = False,
+    interner: "CallTreeInterner | None" = None,
+    options: BuildOptions | None = None,
+    unavailable: set[str] | None = None,
+    create_resolver: "CreateAddressResolver | None" = None,
+    context_address: bytes | None = None,
+    **node_kwargs,
+) -> CallTreeNode | CompactCallTreeNode:
     """
     Use specified opcodes to create a branching callnode
     https://www.evm.codes/
@@ -263,6 +901,9 @@ def _create_node(
     # Store node details and do all validation at the end.
     # This allow us to wild-hold required properties until they are known.
     for frame in trace:
+        if create_resolver is not None:
+            create_resolver.observe(frame.depth)
+
         if (
             node_kwargs.get("last_create_depth")
             and frame.depth == node_kwargs["last_create_depth"][-1]
@@ -273,31 +914,73 @@ def _create_node(
             node_kwargs["last_create_depth"].pop()
             for subcall in node_kwargs.get("calls", [])[::-1]:
                 if subcall.call_type in (CallType.CREATE, CallType.CREATE2):
-                    subcall.address = HexBytes20.__eth_pydantic_validate__(frame.stack[-1][-40:])
-                    if len(frame.stack) >= 5:
-                        subcall.calldata = frame.memory.get(frame.stack[-4], frame.stack[-5])
-
+                    _set_create_data(subcall, frame, options, unavailable)
                     break
 
-        if frame.op in [x.value for x in CALL_OPCODES]:
+        if frame.op in CALL_OPCODE_VALUES:
             # NOTE: Because of the different meanings in structLog style gas values,
             # gas is not set for nodes created this way.
-            data = create_call_node_data(frame)
-            if data.get("call_type") in (CallType.CREATE, CallType.CREATE2):
+            if options is not None and options.is_skipped(frame.address, frame.depth):
+                _skip_node(trace)
+                continue
+
+            data = create_call_node_data(
+                frame,
+                include_calldata=options is None or options.include_calldata,
+                unavailable=unavailable,
+            )
+            if data.get("call_type") in (
+                CallType.CREATE,
+                CallType.CREATE2,
+            ) and not _resolve_create_data(data, frame, create_resolver, context_address, options):
                 data["last_create_depth"] = [frame.depth]
                 if "last_create_depth" in node_kwargs:
                     node_kwargs["last_create_depth"].append(frame.depth)
                 else:
                     node_kwargs["last_create_depth"] = [frame.depth]
 
-            subcall = _create_node(trace=trace, show_internal=show_internal, **data)
+            checkpoint = create_resolver.checkpoint() if create_resolver is not None else 0
+            subcall = _create_node(
+                trace=trace,
+                show_internal=show_internal,
+                compact=compact,
+                interner=interner,
+                options=options,
+                unavailable=unavailable,
+                create_resolver=create_resolver,
+                context_address=(
+                    _get_sub_context_address(frame, data, context_address)
+                    if create_resolver is not None
+                    else None
+                ),
+                **data,
+            )
+            if create_resolver is not None and subcall.failed:
+                # The nonces of the reverted call are reverted too.
+                create_resolver.rollback(checkpoint)
+
             if "calls" in node_kwargs:
                 node_kwargs["calls"].append(subcall)
             else:
                 node_kwargs["calls"] = [subcall]
 
         elif frame.op.startswith("LOG") and len(frame.op) > 3 and frame.op[3].isnumeric():
-            event = _create_event_node(frame)
+            if options is not None and not options.include_events:
+                continue
+
+            elif len(frame.stack) < int(frame.op[3]) + 3:
+                # Without the stack, there are no topics to make an event from.
+                if unavailable is not None:
+                    unavailable.add("events")
+
+                continue
+
+            elif not frame.has_memory and unavailable is not None:
+                unavailable.add("events.data")
+
+            pydantic_event = _create_event_node(frame)
+            event = CompactEventNode.from_pydantic(pydantic_event) if compact else pydantic_event
+
             if "events" in node_kwargs:
                 node_kwargs["events"].append(event)
             else:
@@ -315,7 +998,12 @@ def _create_node(
             break
 
         elif frame.op in ("RETURN", "REVERT") and not node_kwargs.get("returndata"):
-            node_kwargs["returndata"] = frame.memory.get(frame.stack[-1], frame.stack[-2])
+            if options is not None and not options.include_returndata:
+                pass
+            elif frame.has_memory and len(frame.stack) >= 2:
+                node_kwargs["returndata"] = frame.memory.get(frame.stack[-1], frame.stack[-2])
+            elif unavailable is not None:
+                unavailable.add("returndata")
 
             # TODO: Handle "execution halted" vs. gas limit reached
             node_kwargs["failed"] = frame.op == "REVERT"
@@ -340,9 +1028,123 @@ def _create_node(
         # Set temporary address so validation succeeds.
         node_kwargs["address"] = 20 * b"\x00"
 
+    if interner is not None and node_kwargs.get("calls"):
+        # NOTE: Sub-calls are interned once complete, CREATE addresses are set late.
+        node_kwargs["calls"] = [interner.intern_node(c) for c in node_kwargs["calls"]]
+
+    if compact:
+        return CompactCallTreeNode.from_kwargs(**node_kwargs)
+
     return CallTreeNode(**node_kwargs)
 
 
+def _set_create_data(
+    node: CallTreeNode | CompactCallTreeNode,
+    frame: TraceFrame,
+    options: BuildOptions | None,
+    unavailable: set[str] | None,
+):
+    # The address was pushed by the CREATE, and the calldata is
+    # still in memory, at the first frame back in the caller.
+    if not frame.stack:
+        if unavailable is not None:
+            unavailable.add("address")
+
+        return
+
+    node.address = HexBytes20.__eth_pydantic_validate__(frame.stack[-1][-40:])
+    if options is not None and not options.include_calldata:
+        return
+
+    elif frame.has_memory and len(frame.stack) >= 5:
+        node.calldata = frame.memory.get(frame.stack[-4], frame.stack[-5])
+    elif unavailable is not None:
+        unavailable.add("calldata")
+
+
+def _resolve_create_data(
+    data: dict,
+    frame: TraceFrame,
+    create_resolver: "CreateAddressResolver | None",
+    sender: bytes | None,
+    options: BuildOptions | None,
+) -> bool:
+    # Compute the CREATE address at the CREATE frame, where the init code is in memory,
+    # so the frame it returns to is not needed.
+    if create_resolver is None:
+        return False
+
+    address = create_resolver.resolve(frame, sender)
+    if address is None:
+        return False
+
+    elif frame.contract_address is not None:
+        # The look-ahead already found the pushed address, which is authoritative.
+        address = bytes(frame.contract_address)
+
+    data["address"] = address
+    if (options is None or options.include_calldata) and frame.has_memory and len(frame.stack) >= 3:
+        data["calldata"] = frame.memory.get(frame.stack[-2], frame.stack[-3])
+
+    return True
+
+
+def _get_context_address(
+    create_resolver: "CreateAddressResolver | None", node_kwargs: dict
+) -> bytes | None:
+    if create_resolver is None or not node_kwargs.get("address"):
+        return None
+
+    return _to_bytes(node_kwargs["address"])
+
+
+def _get_sub_context_address(
+    frame: TraceFrame, data: dict, context_address: bytes | None
+) -> bytes | None:
+    # The address whose nonce and storage the sub-call uses, which is the caller's
+    # for DELEGATECALL and CALLCODE.
+    if frame.op in (CallType.DELEGATECALL.value, CallType.CALLCODE.value):
+        return context_address
+
+    elif frame.op in (CallType.CREATE.value, CallType.CREATE2.value):
+        address = data.get("address") or frame.address
+    else:
+        address = frame.address
+
+    return bytes(address) if address else None
+
+
+def _skip_node(trace: Iterator[TraceFrame]):
+    # Consume the frames of a skipped call, the same way ``_create_node`` would.
+    for frame in trace:
+        if frame.op in CALL_OPCODE_VALUES:
+            _skip_node(trace)
+
+        elif frame.op in (CallType.SELFDESTRUCT.value, "STOP", "RETURN", "REVERT"):
+            return
+
+
+def _prune_call_tracer_data(data: dict, options: BuildOptions) -> dict:
+    # Copy the call data without the skipped calls and fields, before validation.
+    root = dict(data)
+    stack = [(root, 0)]
+    while stack:
+        call, level = stack.pop()
+        if not options.include_calldata:
+            call.pop("calldata", None)
+        if not options.include_returndata:
+            call.pop("returndata", None)
+        if not options.include_events:
+            call.pop("logs", None)
+
+        call["calls"] = [
+            dict(c) for c in call["calls"] if not options.is_skipped(c.get("address"), level + 1)
+        ]
+        stack.extend((c, level + 1) for c in call["calls"])
+
+    return root
+
+
 def _create_event_node(frame: TraceFrame) -> EventNode:
     # The number of topics is derived from the opcode,
     # e.g. LOG2 meaning 2 topics (not counting the selector).
@@ -0,0 +1,147 @@
+from typing import Any, TypeVar
+
+from evm_trace.base import CallTreeNode, CompactCallTreeNode, LazyHexBytes
+from evm_trace.diff import COMPARED_FIELDS, hash_node
+
+NodeType = TypeVar("NodeType", bound=CallTreeNode | CompactCallTreeNode)
+BytesType = TypeVar("BytesType", bound=bytes | LazyHexBytes)
+
+
+class CallTreeInterner:
+    """
+    Deduplicates call trees in memory (hash-consing). Byte values, such as
+    addresses, selectors, calldata and event topics, are shared between all
+    the nodes using them and identical sub-trees are replaced with a single
+    shared instance. Use one interner across many trees to also share between them.
+
+    **WARNING**: Interned trees share nodes, treat them as immutable.
+
+    :class:`~evm_trace.base.LazyHexBytes` values are interned by their hex str and
+    stay undecoded, such as in trees built using ``lazy_bytes=True``.
+
+    Usage example::
+
+        interner = CallTreeInterner()
+        calltree = interner.intern_tree(calltree)
+
+        # Or while building.
+        calltree = get_calltree_from_parity_trace(trace_list, interner=interner)
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[tuple[type, Any], Any] = {}
+        # The interned nodes by hash, more than one only if their hashes collide.
+        self._nodes: dict[bytes, list[Any]] = {}
+        # The hash of each interned node, by ``id()``. The interner keeps the nodes alive.
+        self._hashes: dict[int, bytes] = {}
+
+    def __len__(self) -> int:
+        """
+        The number of unique sub-trees.
+        """
+        return len(self._hashes)
+
+    def intern_bytes(self, value: BytesType) -> BytesType:
+        """
+        Get the shared instance of a byte value.
+        """
+        key = (type(value), _get_identity(value))
+        if (existing := self._values.get(key)) is not None:
+            return existing
+
+        self._values[key] = value
+        return value
+
+    def intern_node(self, node: NodeType) -> NodeType:
+        """
+        Get the shared instance of a node. The node's sub-calls must
+        already be interned, such as when building a tree bottom-up.
+        Use :meth:`~evm_trace.interning.CallTreeInterner.intern_tree` otherwise.
+
+        Args:
+            node (:class:`~evm_trace.base.CallTreeNode`): The node to intern.
+
+        Returns:
+            :class:`~evm_trace.base.CallTreeNode`: The shared node, which may be
+            the given node.
+        """
+        if id(node) in self._hashes:
+            return node
+
+        node.address = self.intern_bytes(node.address)
+        node.calldata = self.intern_bytes(node.calldata)
+        node.returndata = self.intern_bytes(node.returndata)
+        for event in node.events:
+            event.topics = [self.intern_bytes(t) for t in event.topics]
+            event.data = self.intern_bytes(event.data)
+
+        node_hash = hash_node(node, [self._hashes[id(c)] for c in node.calls], decode_lazy=False)
+        if (nodes := self._nodes.get(node_hash)) is None:
+            nodes = self._nodes[node_hash] = []
+
+        # The hash only finds the candidates, the nodes must be equal to be shared.
+        for existing in nodes:
+            if _is_same_node(existing, node):
+                return existing
+
+        nodes.append(node)
+        self._hashes[id(node)] = node_hash
+        return node
+
+    def intern_tree(self, root: NodeType) -> NodeType:
+        """
+        Intern a whole call tree, without recursion.
+
+        Args:
+            root (:class:`~evm_trace.base.CallTreeNode`): The call tree.
+
+        Returns:
+            :class:`~evm_trace.base.CallTreeNode`: The shared root, which may be
+            the given root.
+        """
+        stack: list[tuple[Any, bool]] = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if id(node) in self._hashes:
+                continue
+
+            elif not children_done:
+                stack.append((node, True))
+                stack.extend((c, False) for c in node.calls)
+                continue
+
+            node.calls = [self.intern_node(c) for c in node.calls]
+
+        return self.intern_node(root)
+
+
+def _is_same_node(node: Any, other: Any) -> bool:
+    # Sub-calls are interned first, so equal sub-calls are the same instances.
+    return (
+        type(node) is type(other)
+        and node.call_type == other.call_type
+        and node.address == other.address
+        and node.depth == other.depth
+        and all(_is_same_value(getattr(node, f), getattr(other, f)) for f in COMPARED_FIELDS)
+        and len(node.calls) == len(other.calls)
+        and all(c is o for c, o in zip(node.calls, other.calls, strict=True))
+    )
+
+
+def _is_same_value(value: Any, other: Any) -> bool:
+    if value is other:
+        return True
+
+    elif isinstance(value, LazyHexBytes) or isinstance(other, LazyHexBytes):
+        # NOTE: Compared without decoding, so values are only the same if both are
+        #   decoded or have the same hex str.
+        return _get_identity(value) == _get_identity(other)
+
+    return value == other
+
+
+def _get_identity(value: Any) -> Any:
+    if isinstance(value, LazyHexBytes) and (hex_str := value._get_undecoded()) is not None:
+        return hex_str
+
+    return value
@@ -1,9 +1,14 @@
-from typing import Any, cast
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, Literal, cast, overload
 
 from pydantic import Field, RootModel, field_validator
 
-from evm_trace.base import BaseModel, CallTreeNode
+from evm_trace.base import BaseModel, BuildOptions, CallTreeNode, CompactCallTreeNode
 from evm_trace.enums import CallType
+from evm_trace.stream import CallStreamEvent, call_entered, call_exited
+
+if TYPE_CHECKING:
+    from evm_trace.interning import CallTreeInterner
 
 
 class CallAction(BaseModel):
@@ -111,11 +116,39 @@ class ParityTrace(BaseModel):
 ParityTraceList = RootModel[list[ParityTrace]]
 
 
+@overload
+def get_calltree_from_parity_trace(
+    traces: ParityTraceList,
+    root: ParityTrace | None = None,
+    compact: Literal[False] = False,
+    interner: "CallTreeInterner | None" = None,
+    options: BuildOptions | None = None,
+    **root_kwargs,
+) -> CallTreeNode: ...
+
+
+@overload
 def get_calltree_from_parity_trace(
     traces: ParityTraceList,
     root: ParityTrace | None = None,
+    *,
+    compact: Literal[True],
+    interner: "CallTreeInterner | None" = None,
+    options: BuildOptions | None = None,
+    lazy_bytes: bool = False,
     **root_kwargs,
-) -> CallTreeNode:
+) -> CompactCallTreeNode: ...
+
+
+def get_calltree_from_parity_trace(
+    traces: ParityTraceList,
+    root: ParityTrace | None = None,
+    compact: bool = False,
+    interner: "CallTreeInterner | None" = None,
+    options: BuildOptions | None = None,
+    lazy_bytes: bool = False,
+    **root_kwargs,
+) -> CallTreeNode | CompactCallTreeNode:
     """
     Create a :class:`~evm_trace.base.CallTreeNode` from output models using the Parity approach
     (e.g. from the ``trace_transaction`` RPC).
@@ -125,23 +158,144 @@ def get_calltree_from_parity_trace(
           likely loaded from the response data from the ``trace_transaction`` RPC response.
         root (:class:`~evm_trace.parity.ParityTrace`): The root parity trace node. Optional, uses
           the first item by default.
+        compact (bool): Set to ``True`` to get a
+          :class:`~evm_trace.base.CompactCallTreeNode` instead.
+        interner (:class:`~evm_trace.interning.CallTreeInterner` | None): Share identical
+          sub-trees and byte values using this interner, as the tree is built.
+        options (:class:`~evm_trace.base.BuildOptions` | None): Skip calls and fields,
+          before they are validated.
+        lazy_bytes (bool): Set to ``True`` to only decode the ``calldata`` and ``returndata``
+          when used, see :class:`~evm_trace.base.LazyHexBytes`. Requires ``compact=True``.
         **root_kwargs: Additional kwargs to append to the root node. Useful for adding gas for
           reverted calls.
 
     Returns:
         :class:`~evm_trace.base.CallTreeNode`
     """
+    if lazy_bytes and not compact:
+        raise ValueError("`lazy_bytes` requires `compact=True`.")
+
+    node = _create_node(
+        traces,
+        root or traces.root[0],
+        compact=compact,
+        interner=interner,
+        options=options,
+        lazy_bytes=lazy_bytes,
+        **root_kwargs,
+    )
+    return interner.intern_node(node) if interner is not None else node
+
+
+def stream_calltree_from_parity_trace(
+    traces: ParityTraceList,
+    root: ParityTrace | None = None,
+    compact: bool = False,
+    **root_kwargs,
+) -> Iterator[CallStreamEvent]:
+    """
+    Stream the calls of Parity-style traces (e.g. from the ``trace_transaction`` RPC)
+    as they are entered and exited, instead of building a call tree.
+    See :class:`~evm_trace.stream.CallStreamEvent`.
+
+    Args:
+        traces (:class:~evm_trace.parity.ParityTraceList): The list of parity trace nodes,
+          in order.
+        root (:class:`~evm_trace.parity.ParityTrace`): The root parity trace node. Optional, uses
+          the first item by default.
+        compact (bool): Set to ``True`` to stream
+          :class:`~evm_trace.base.CompactCallTreeNode` objects instead.
+        **root_kwargs: Additional kwargs to append to the root node.
+
+    Returns:
+        Iterator[:class:`~evm_trace.stream.CallStreamEvent`]
+    """
     root = root or traces.root[0]
-    failed = root.error is not None
+    root_address = root.trace_address
+    stack: list[tuple[list[int], CallTreeNode | CompactCallTreeNode]] = []
+    for trace in traces.root:
+        trace_address = trace.trace_address
+        if trace_address[: len(root_address)] != root_address:
+            # Not part of this tree.
+            continue
+
+        while stack and trace_address[: len(stack[-1][0])] != stack[-1][0]:
+            yield call_exited(stack.pop()[1])
+
+        node_kwargs = _get_node_kwargs(trace)
+        if trace is root:
+            node_kwargs.update(root_kwargs)
+
+        node = (
+            CompactCallTreeNode.from_kwargs(**node_kwargs)
+            if compact
+            else CallTreeNode.model_validate(node_kwargs)
+        )
+        stack.append((trace_address, node))
+        yield call_entered(node)
+
+    while stack:
+        yield call_exited(stack.pop()[1])
+
+
+def _create_node(
+    traces: ParityTraceList,
+    root: ParityTrace,
+    compact: bool = False,
+    interner: "CallTreeInterner | None" = None,
+    options: BuildOptions | None = None,
+    level: int = 0,
+    lazy_bytes: bool = False,
+    **root_kwargs,
+) -> CallTreeNode | CompactCallTreeNode:
+    node_kwargs = _get_node_kwargs(root, options=options)
+    trace_list: list[ParityTrace] = traces.root
+    subtraces: list[ParityTrace] = [
+        sub
+        for sub in trace_list
+        if len(sub.trace_address) == len(root.trace_address) + 1
+        and sub.trace_address[:-1] == root.trace_address
+    ]
+    if options is not None:
+        subtraces = [
+            sub
+            for sub in subtraces
+            if not options.is_skipped(_get_node_kwargs(sub, options).get("address"), level + 1)
+        ]
+
+    node_kwargs["calls"] = [
+        _create_node(
+            traces,
+            sub,
+            compact=compact,
+            interner=interner,
+            options=options,
+            level=level + 1,
+            lazy_bytes=lazy_bytes,
+        )
+        for sub in subtraces
+    ]
+    if interner is not None:
+        node_kwargs["calls"] = [interner.intern_node(c) for c in node_kwargs["calls"]]
+
+    node_kwargs = {**node_kwargs, **root_kwargs}
+    if compact:
+        return CompactCallTreeNode.from_kwargs(lazy_bytes=lazy_bytes, **node_kwargs)
+
+    return CallTreeNode.model_validate(node_kwargs)
+
+
+def _get_node_kwargs(trace: ParityTrace, options: BuildOptions | None = None) -> dict[Any, Any]:
+    failed = trace.error is not None
     node_kwargs: dict[Any, Any] = {
-        "call_type": root.call_type,
+        "call_type": trace.call_type,
         "failed": failed,
     }
 
-    if root.call_type == CallType.CREATE:
-        create_action: CreateAction = cast(CreateAction, root.action)
+    if trace.call_type == CallType.CREATE:
+        create_action: CreateAction = cast(CreateAction, trace.action)
         create_result: CreateResult | None = (
-            cast(CreateResult, root.result) if root.result is not None else None
+            cast(CreateResult, trace.result) if trace.result is not None else None
         )
         node_kwargs.update(
             value=create_action.value,
@@ -151,15 +305,15 @@ def get_calltree_from_parity_trace(
         if create_result:
             node_kwargs.update(gas_cost=create_result.gas_used, address=create_result.address)
 
-    elif root.call_type in (
+    elif trace.call_type in (
         CallType.CALL,
         CallType.DELEGATECALL,
         CallType.STATICCALL,
         CallType.CALLCODE,
     ):
-        call_action: CallAction = cast(CallAction, root.action)
+        call_action: CallAction = cast(CallAction, trace.action)
         call_result: CallResult | None = (
-            cast(CallResult, root.result) if root.result is not None else None
+            cast(CallResult, trace.result) if trace.result is not None else None
         )
 
         node_kwargs.update(
@@ -175,19 +329,17 @@ def get_calltree_from_parity_trace(
                 returndata=call_result.output,
             )
 
-    elif root.call_type == CallType.SELFDESTRUCT:
-        selfdestruct_action: SelfDestructAction = cast(SelfDestructAction, root.action)
+    elif trace.call_type == CallType.SELFDESTRUCT:
+        selfdestruct_action: SelfDestructAction = cast(SelfDestructAction, trace.action)
         node_kwargs.update(
             address=selfdestruct_action.address,
         )
 
-    trace_list: list[ParityTrace] = traces.root
-    subtraces: list[ParityTrace] = [
-        sub
-        for sub in trace_list
-        if len(sub.trace_address) == len(root.trace_address) + 1
-        and sub.trace_address[:-1] == root.trace_address
-    ]
-    node_kwargs["calls"] = [get_calltree_from_parity_trace(traces, root=sub) for sub in subtraces]
-    node_kwargs = {**node_kwargs, **root_kwargs}
-    return CallTreeNode.model_validate(node_kwargs)
+    if options is not None:
+        # Skip the hex-decoding of unwanted fields.
+        if not options.include_calldata:
+            node_kwargs.pop("calldata", None)
+        if not options.include_returndata:
+            node_kwargs.pop("returndata", None)
+
+    return node_kwargs
@@ -0,0 +1,201 @@
+from collections.abc import Iterable
+from functools import lru_cache
+
+from msgspec import Struct
+
+from evm_trace.base import _to_bytes
+from evm_trace.enums import CALL_OPCODE_VALUES
+from evm_trace.geth import TraceFrame
+from evm_trace.vmtrace import VMTraceFrame
+
+ProfileKey = tuple[bytes, int, str]
+"""The contract address, program counter and opcode."""
+
+
+class OpcodeProfileEntry(Struct):
+    """
+    The gas used by an opcode at a program counter of a contract.
+    """
+
+    count: int = 0
+    """The number of times the opcode was executed."""
+
+    inclusive_gas: int = 0
+    """The gas used, including the sub-calls made by ``CALL`` and ``CREATE`` opcodes."""
+
+    exclusive_gas: int = 0
+    """The gas used, excluding the sub-calls, such as only the overhead of a ``CALL``."""
+
+
+class _Context:
+    """
+    A call being executed.
+    """
+
+    __slots__ = ("depth", "address", "gas_used")
+
+    def __init__(self, depth: int, address: bytes | None):
+        self.depth = depth
+        self.address = address
+        self.gas_used = 0
+
+
+class _PendingCall:
+    """
+    A call opcode waiting for its sub-call to return.
+    """
+
+    __slots__ = ("key", "depth", "gas", "address")
+
+    def __init__(self, key: ProfileKey, depth: int, gas: int, address: bytes | None):
+        self.key = key
+        self.depth = depth
+        self.gas = gas
+        self.address = address
+
+
+class OpcodeProfiler:
+    """
+    Profile the gas used per contract, program counter and opcode in a single pass over
+    trace frames, from either :meth:`~evm_trace.geth.create_trace_frames` or
+    :meth:`~evm_trace.vmtrace.to_trace_frames`. Only the counters and the calls
+    being executed are kept in memory.
+
+    The inclusive gas of a ``CALL`` or ``CREATE`` is the gas remaining before it minus the
+    gas remaining once it returns. Its exclusive gas is the inclusive gas minus the
+    gas used by the sub-call. Every other opcode uses its gas cost for both.
+
+    Usage example::
+
+        profiler = OpcodeProfiler(address=tx.receiver)
+        profiler.add_frames(create_trace_frames(struct_logs))
+        for (address, pc, op), entry in profiler.profile.items():
+            ...
+    """
+
+    def __init__(self, address: str | bytes | None = None):
+        """
+        Args:
+            address (str | bytes | None): The address of the contract being executed in
+              the root call. Geth trace frames do not include it, and are profiled
+              under an empty address without it.
+        """
+        self.profile: dict[ProfileKey, OpcodeProfileEntry] = {}
+        self._root_address = _to_bytes(address) if address else b""
+        self._contexts: list[_Context] = []
+        self._pending: list[_PendingCall] = []
+
+    def add_frames(self, frames: Iterable[TraceFrame | VMTraceFrame]):
+        """
+        Profile trace frames, then complete the profile.
+        """
+        for frame in frames:
+            self.add_frame(frame)
+
+        self.finish()
+
+    def add_frame(self, frame: TraceFrame | VMTraceFrame):
+        """
+        Profile a single trace frame. Frames must be added in order.
+        """
+        depth = frame.depth
+        while self._pending and self._pending[-1].depth >= depth:
+            # Back in the caller, so the call returned.
+            pending = self._pending[-1]
+            self._return(frame.gas if pending.depth == depth else None)
+
+        if not self._contexts or depth > self._contexts[-1].depth:
+            if isinstance(frame, VMTraceFrame):
+                address = _to_address(frame.address)
+            elif self._pending:
+                address = self._pending[-1].address
+            else:
+                address = self._root_address
+
+            self._contexts.append(_Context(depth, address))
+
+        context = self._contexts[-1]
+        key = (context.address or b"", frame.pc, frame.op)
+        if frame.op in CALL_OPCODE_VALUES:
+            # NOTE: Geth frames know the address being called, VMTrace frames know their own.
+            address = (
+                None
+                if isinstance(frame, VMTraceFrame) or frame.address is None
+                else bytes(frame.address)
+            )
+            self._pending.append(_PendingCall(key, depth, frame.gas, address))
+            return
+
+        self._record(key, frame.gas_cost, frame.gas_cost)
+        context.gas_used += frame.gas_cost
+
+    def finish(self):
+        """
+        Complete the calls that never returned, such as when the trace ends early.
+        """
+        while self._pending:
+            self._return(None)
+
+        self._contexts = []
+
+    def get_opcode_totals(self) -> dict[tuple[bytes, str], OpcodeProfileEntry]:
+        """
+        The profile per contract and opcode, across program counters.
+        """
+        totals: dict[tuple[bytes, str], OpcodeProfileEntry] = {}
+        for (address, _, op), entry in self.profile.items():
+            total = totals.get((address, op))
+            if total is None:
+                total = totals[(address, op)] = OpcodeProfileEntry()
+
+            total.count += entry.count
+            total.inclusive_gas += entry.inclusive_gas
+            total.exclusive_gas += entry.exclusive_gas
+
+        return totals
+
+    def _return(self, remaining_gas: int | None):
+        pending = self._pending.pop()
+        sub_call_gas = 0
+        if self._contexts and self._contexts[-1].depth > pending.depth:
+            sub_call_gas = self._contexts.pop().gas_used
+
+        inclusive_gas = sub_call_gas if remaining_gas is None else pending.gas - remaining_gas
+        self._record(pending.key, inclusive_gas, max(inclusive_gas - sub_call_gas, 0))
+        if self._contexts:
+            self._contexts[-1].gas_used += inclusive_gas
+
+    def _record(self, key: ProfileKey, inclusive_gas: int, exclusive_gas: int):
+        entry = self.profile.get(key)
+        if entry is None:
+            entry = self.profile[key] = OpcodeProfileEntry()
+
+        entry.count += 1
+        entry.inclusive_gas += inclusive_gas
+        entry.exclusive_gas += exclusive_gas
+
+
+def get_opcode_profile(
+    frames: Iterable[TraceFrame | VMTraceFrame], address: str | bytes | None = None
+) -> dict[ProfileKey, OpcodeProfileEntry]:
+    """
+    Profile the gas used per contract, program counter and opcode,
+    see :class:`~evm_trace.profiler.OpcodeProfiler`.
+
+    Args:
+        frames (Iterable[:class:`~evm_trace.geth.TraceFrame`]): The trace frames, from
+          :meth:`~evm_trace.geth.create_trace_frames` or
+          :meth:`~evm_trace.vmtrace.to_trace_frames`.
+        address (str | bytes | None): The address of the contract executed in the root call.
+
+    Returns:
+        dict[tuple[bytes, int, str], :class:`~evm_trace.profiler.OpcodeProfileEntry`]
+    """
+    profiler = OpcodeProfiler(address=address)
+    profiler.add_frames(frames)
+    return profiler.profile
+
+
+@lru_cache(maxsize=1024)
+def _to_address(address: str) -> bytes | None:
+    return _to_bytes(address) if address else None
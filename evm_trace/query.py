@@ -0,0 +1,141 @@
+from collections import defaultdict
+from functools import cached_property
+from typing import Any
+
+from eth_pydantic_types import HexBytes
+
+from evm_trace.base import AnyEvent, AnyNode
+from evm_trace.enums import NON_SELECTOR_CALL_TYPES, CallType
+
+
+class CallTreeQuery:
+    """
+    Search a call tree using secondary indexes.
+    Each index is built with a single walk the first time it is needed
+    and cached, so repeated queries only cost the size of the result.
+
+    **NOTE**: The indexes are not updated if the tree is modified afterwards.
+
+    Usage example::
+
+        query = CallTreeQuery(calltree)
+        transfers = query.find_calls(selector="0xa9059cbb")
+        failed_delegate_calls = query.find_calls(call_type=CallType.DELEGATECALL, failed=True)
+    """
+
+    def __init__(self, root: AnyNode):
+        self.root = root
+        # The node IDs of each indexed list, for intersecting the lists.
+        self._id_sets: dict[tuple[str, Any], set[int]] = {}
+
+    @cached_property
+    def nodes(self) -> list[AnyNode]:
+        """
+        All the nodes in the tree, in preorder.
+        """
+        nodes = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(reversed(node.calls))
+
+        return nodes
+
+    @cached_property
+    def by_address(self) -> dict[bytes, list[AnyNode]]:
+        return _group(self.nodes, lambda n: bytes(n.address))
+
+    @cached_property
+    def by_selector(self) -> dict[bytes, list[AnyNode]]:
+        return _group(
+            [n for n in self.nodes if n.call_type not in NON_SELECTOR_CALL_TYPES],
+            lambda n: bytes(n.calldata[:4]),
+        )
+
+    @cached_property
+    def by_call_type(self) -> dict[CallType, list[AnyNode]]:
+        return _group(self.nodes, lambda n: n.call_type)
+
+    @cached_property
+    def failed(self) -> list[AnyNode]:
+        return [n for n in self.nodes if n.failed]
+
+    @cached_property
+    def events_by_topic(self) -> dict[bytes, list[AnyEvent]]:
+        """
+        Events grouped by their first topic (``topic0``).
+        """
+        return _group([e for n in self.nodes for e in n.events], lambda e: bytes(e.topics[0]))
+
+    def find_calls(
+        self,
+        address: str | bytes | None = None,
+        selector: str | bytes | None = None,
+        call_type: CallType | str | None = None,
+        failed: bool | None = None,
+    ) -> list[AnyNode]:
+        """
+        Find all calls matching every given criteria, in preorder.
+
+        Args:
+            address (str | bytes | None): The address called.
+            selector (str | bytes | None): The method selector in the calldata.
+            call_type (:class:`~evm_trace.enums.CallType` | str | None): The type of call.
+            failed (bool | None): Whether the call failed.
+
+        Returns:
+            list[:class:`~evm_trace.base.CallTreeNode`]
+        """
+        # The matching index lists, with the index name and key to cache their node IDs.
+        candidates: list[tuple[str, Any, list[AnyNode]]] = []
+        if address is not None:
+            key = _to_bytes(address)
+            candidates.append(("address", key, self.by_address.get(key, [])))
+        if selector is not None:
+            key = _to_bytes(selector)
+            candidates.append(("selector", key, self.by_selector.get(key, [])))
+        if call_type is not None:
+            call_type = CallType(call_type)
+            candidates.append(("call_type", call_type, self.by_call_type.get(call_type, [])))
+        if failed:
+            candidates.append(("failed", None, self.failed))
+
+        if not candidates:
+            result = self.nodes
+        else:
+            # Only scan the smallest matching index.
+            candidates.sort(key=lambda c: len(c[2]))
+            result = candidates[0][2]
+            if len(candidates) > 1:
+                others = [self._get_ids(name, key, nodes) for name, key, nodes in candidates[1:]]
+                result = [n for n in result if all(id(n) in o for o in others)]
+
+        if failed is False:
+            result = [n for n in result if not n.failed]
+
+        return list(result)
+
+    def find_events(self, topic: str | bytes) -> list[AnyEvent]:
+        """
+        Find all events with the given first topic (``topic0``), in preorder.
+        """
+        return list(self.events_by_topic.get(_to_bytes(topic), []))
+
+    def _get_ids(self, name: str, key: Any, nodes: list[AnyNode]) -> set[int]:
+        if (ids := self._id_sets.get((name, key))) is None:
+            ids = self._id_sets[(name, key)] = {id(n) for n in nodes}
+
+        return ids
+
+
+def _group(items: list, get_key) -> dict[Any, list]:
+    groups: defaultdict[Any, list] = defaultdict(list)
+    for item in items:
+        groups[get_key(item)].append(item)
+
+    return dict(groups)
+
+
+def _to_bytes(value: str | bytes) -> bytes:
+    return bytes(HexBytes(value)) if isinstance(value, str) else bytes(value)
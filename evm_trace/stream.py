@@ -0,0 +1,153 @@
+from collections.abc import Iterable
+from enum import Enum
+from typing import Any
+
+from msgspec import Struct
+
+from evm_trace.base import CallTreeNode, CompactCallTreeNode
+from evm_trace.enums import CallType
+
+
+class CallStreamEventType(Enum):
+    CALL_ENTER = "enter"
+    EVENT = "event"
+    CALL_EXIT = "exit"
+
+
+class CallStreamEvent(Struct):
+    """
+    A single step of a streamed call tree, as yielded by the ``stream_calltree_from_*``
+    functions. Calls are entered and exited in depth-first order, so the
+    enter and exit events of the sub-calls of a call are always between its own.
+    """
+
+    event_type: CallStreamEventType
+    """Whether a call was entered or exited, or an event emitted."""
+
+    call: Any
+    """
+    The call, or the call emitting the event. The same node is passed when the call is
+    entered and exited, but some fields, such as ``returndata`` and ``failed``, are only
+    set by the time it exits. Its ``calls`` and ``events`` are never populated.
+    """
+
+    event: Any = None
+    """The :class:`~evm_trace.base.EventNode`, for ``EVENT`` steps."""
+
+
+class CallTreeListener:
+    """
+    Base class for reacting to calls as they are traced, without building a call tree.
+    Override any of the methods and use :meth:`~evm_trace.stream.dispatch` to feed it.
+
+    Usage example::
+
+        class RevertListener(CallTreeListener):
+            def on_call_exit(self, call):
+                if call.failed:
+                    print(f"{call.address.hex()} reverted")
+
+
+        dispatch(stream_calltree_from_geth_trace(frames), RevertListener())
+    """
+
+    def on_call_enter(self, call: Any):
+        """
+        Called when a call starts.
+        """
+
+    def on_event(self, call: Any, event: Any):
+        """
+        Called when the current call emits an event.
+        """
+
+    def on_call_exit(self, call: Any):
+        """
+        Called when a call completes.
+        """
+
+
+def dispatch(stream: Iterable[CallStreamEvent], listener: CallTreeListener):
+    """
+    Feed a call tree stream to a listener.
+
+    Args:
+        stream (Iterable[:class:`~evm_trace.stream.CallStreamEvent`]): The stream, such
+          as from :meth:`~evm_trace.geth.stream_calltree_from_geth_trace`.
+        listener (:class:`~evm_trace.stream.CallTreeListener`): The listener to call.
+    """
+    for step in stream:
+        if step.event_type is CallStreamEventType.CALL_ENTER:
+            listener.on_call_enter(step.call)
+        elif step.event_type is CallStreamEventType.EVENT:
+            listener.on_event(step.call, step.event)
+        else:
+            listener.on_call_exit(step.call)
+
+
+class CallTreeBuilder(CallTreeListener):
+    """
+    A listener assembling the call tree, available as ``root`` once the root call exits.
+    """
+
+    def __init__(self) -> None:
+        self.root: Any = None
+        self._stack: list[Any] = []
+
+    def on_call_enter(self, call: Any):
+        if self._stack:
+            self._stack[-1].calls.append(call)
+
+        self._stack.append(call)
+
+    def on_event(self, call: Any, event: Any):
+        call.events.append(event)
+
+    def on_call_exit(self, call: Any):
+        self.root = self._stack.pop()
+
+
+def build_calltree(
+    stream: Iterable[CallStreamEvent],
+) -> CallTreeNode | CompactCallTreeNode | None:
+    """
+    Assemble the call tree from a stream.
+
+    Args:
+        stream (Iterable[:class:`~evm_trace.stream.CallStreamEvent`]): The stream, such
+          as from :meth:`~evm_trace.geth.stream_calltree_from_geth_trace`.
+
+    Returns:
+        :class:`~evm_trace.base.CallTreeNode` | None: The root call, or ``None``
+        if the stream is empty.
+    """
+    builder = CallTreeBuilder()
+    dispatch(stream, builder)
+    return builder.root
+
+
+def call_entered(call: Any) -> CallStreamEvent:
+    return CallStreamEvent(event_type=CallStreamEventType.CALL_ENTER, call=call)
+
+
+def event_emitted(call: Any, event: Any) -> CallStreamEvent:
+    return CallStreamEvent(event_type=CallStreamEventType.EVENT, call=call, event=event)
+
+
+def call_exited(call: Any) -> CallStreamEvent:
+    return CallStreamEvent(event_type=CallStreamEventType.CALL_EXIT, call=call)
+
+
+def create_node(compact: bool = False, **kwargs) -> CallTreeNode | CompactCallTreeNode:
+    """
+    Create a node without sub-calls or events for streaming.
+    """
+    if "callType" in kwargs:
+        kwargs["call_type"] = kwargs.pop("callType")
+    elif "call_type" not in kwargs:
+        kwargs["call_type"] = CallType.CALL  # Default.
+
+    if compact:
+        return CompactCallTreeNode.from_kwargs(**kwargs)
+
+    return CallTreeNode(**kwargs)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+from bisect import bisect_right
+from collections.abc import Iterator, Mapping
 from typing import Any
 
 from eth.vm.memory import Memory
@@ -10,6 +11,17 @@ from eth_utils import to_int
 from msgspec import Struct
 from msgspec.json import Decoder
 
+from evm_trace.base import CallTreeNode, CompactCallTreeNode, CompactEventNode, EventNode
+from evm_trace.enums import CALL_OPCODE_VALUES, CallType
+from evm_trace.stream import (
+    CallStreamEvent,
+    build_calltree,
+    call_entered,
+    call_exited,
+    create_node,
+    event_emitted,
+)
+
 # opcodes grouped by the number of items they pop from the stack
 # fmt: off
 POP_OPCODES = {
@@ -26,6 +38,10 @@ POPCODES.update({f"LOG{n}": n + 2 for n in range(0, 5)})
 POPCODES.update({f"SWAP{i}": i + 1 for i in range(1, 17)})
 POPCODES.update({f"DUP{i}": i for i in range(1, 17)})
 
+PAGE_SIZE = 4096
+# The number of pages per chunk of the page table of a snapshot.
+CHUNK_PAGES = 64
+
 
 class uint256(int):
     pass
@@ -88,8 +104,315 @@ class VMTraceFrame(Struct):
     op: str
     depth: int
     stack: list[int]
-    memory: bytes | memoryview
-    storage: dict[int, int]
+    memory: bytes | memoryview | MemorySnapshot
+    storage: Mapping[int, int]
+    gas: int = 0
+    """The remaining gas, before the operation."""
+    gas_cost: int = 0
+    """The cost of the operation, as in ``cost``."""
+
+
+class MemorySnapshot:
+    """
+    An immutable, bytes-like view of a :class:`~evm_trace.vmtrace.PagedMemory`.
+    Pages are shared with the memory and with other snapshots until they are written to,
+    and so are the chunks of the page table without any written page.
+    """
+
+    __slots__ = ("_chunk_pages", "_chunks", "_page_size", "_size")
+
+    def __init__(
+        self,
+        chunks: tuple[tuple[bytearray, ...], ...],
+        size: int,
+        page_size: int = PAGE_SIZE,
+        chunk_pages: int = CHUNK_PAGES,
+    ):
+        self._chunks = chunks
+        self._size = size
+        self._page_size = page_size
+        self._chunk_pages = chunk_pages
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bytes__(self) -> bytes:
+        return self.read(0, self._size)
+
+    def __getitem__(self, key: int | slice) -> Any:
+        if isinstance(key, slice) and key.step is None:
+            start, stop, _ = key.indices(self._size)
+            return self.read(start, max(stop - start, 0))
+
+        return bytes(self)[key]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, MemorySnapshot):
+            if self._chunks is other._chunks:
+                return self._size == other._size
+
+            return bytes(self) == bytes(other)
+
+        elif isinstance(other, (bytes, bytearray, memoryview)):
+            return bytes(self) == other
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(bytes(self))
+
+    def __repr__(self) -> str:
+        return f"<MemorySnapshot size={self._size}>"
+
+    def read(self, start: int, size: int) -> bytes:
+        """
+        Read bytes from the snapshot, only joining the pages in range.
+        """
+        stop = min(start + size, self._size)
+        if stop <= start:
+            return b""
+
+        first_page = start // self._page_size
+        last_page = (stop - 1) // self._page_size
+        offset = first_page * self._page_size
+        data = b"".join(self._get_page(index) for index in range(first_page, last_page + 1))
+        return data[start - offset : stop - offset]
+
+    def tobytes(self) -> bytes:
+        return bytes(self)
+
+    def _get_page(self, index: int) -> bytearray:
+        return self._chunks[index // self._chunk_pages][index % self._chunk_pages]
+
+
+class PagedMemory:
+    """
+    EVM memory split into fixed-size pages with copy-on-write snapshots.
+    Taking a :class:`~evm_trace.vmtrace.MemorySnapshot` does not copy any bytes,
+    a page is only copied the first time it is written to after a snapshot.
+
+    The page table of a snapshot is split into chunks of ``chunk_pages`` pages, and only
+    the chunks with a page written to since the last snapshot are rebuilt. Taking a
+    snapshot costs the written pages plus one reference per chunk, rather than one per page.
+    """
+
+    def __init__(self, page_size: int = PAGE_SIZE, chunk_pages: int = CHUNK_PAGES) -> None:
+        self.page_size = page_size
+        self.chunk_pages = chunk_pages
+        self._pages: list[bytearray] = []
+        # A page is shared with snapshots unless it was copied in the current generation.
+        self._owned: list[int] = []
+        self._generation = 0
+        # The page table chunks of the last snapshot, and those changed since.
+        self._chunks: list[tuple[bytearray, ...]] = []
+        self._dirty_chunks: set[int] = set()
+        self._size = 0
+        self._snapshot: MemorySnapshot | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def extend(self, start_position: int, size: int):
+        """
+        Grow memory, word-aligned, to fit ``size`` bytes at ``start_position``.
+        """
+        if size == 0:
+            return
+
+        new_size = _ceil32(start_position + size)
+        if new_size <= self._size:
+            return
+
+        num_pages = -(-new_size // self.page_size)
+        while len(self._pages) < num_pages:
+            self._dirty_chunks.add(len(self._pages) // self.chunk_pages)
+            self._pages.append(bytearray(self.page_size))
+            self._owned.append(self._generation)
+
+        self._size = new_size
+        self._snapshot = None
+
+    def write(self, start_position: int, size: int, value: bytes):
+        """
+        Write bytes to memory, copying shared pages first.
+        """
+        if not size:
+            return
+
+        if start_position + size > self._size:
+            raise ValueError("Memory write out of bounds.")
+
+        position = start_position
+        end = start_position + size
+        while position < end:
+            index = position // self.page_size
+            page_start = index * self.page_size
+            page_end = min(page_start + self.page_size, end)
+            if self._owned[index] != self._generation:
+                self._pages[index] = bytearray(self._pages[index])
+                self._owned[index] = self._generation
+                self._dirty_chunks.add(index // self.chunk_pages)
+
+            value_start = position - start_position
+            self._pages[index][position - page_start : page_end - page_start] = value[
+                value_start : value_start + page_end - position
+            ]
+            position = page_end
+
+        self._snapshot = None
+
+    def read(self, start_position: int, size: int) -> bytes:
+        return self.snapshot().read(start_position, size)
+
+    def snapshot(self) -> MemorySnapshot:
+        """
+        Get an immutable snapshot of the current memory.
+        Re-uses the last snapshot if nothing changed since.
+        """
+        if self._snapshot is None:
+            for chunk in sorted(self._dirty_chunks):
+                pages = tuple(
+                    self._pages[chunk * self.chunk_pages : (chunk + 1) * self.chunk_pages]
+                )
+                if chunk < len(self._chunks):
+                    self._chunks[chunk] = pages
+                else:
+                    self._chunks.append(pages)
+
+            self._dirty_chunks.clear()
+            self._snapshot = MemorySnapshot(
+                tuple(self._chunks), self._size, self.page_size, self.chunk_pages
+            )
+            self._generation += 1
+
+        return self._snapshot
+
+
+def _ceil32(value: int) -> int:
+    remainder = value % 32
+    return value if remainder == 0 else value + 32 - remainder
+
+
+StorageCheckpoint = tuple[int, int]
+
+
+class StorageOverlay:
+    """
+    Transaction-wide contract storage keyed by ``(address, slot)``
+    (addresses are case-insensitive).
+    Every write is versioned, so a :class:`~evm_trace.vmtrace.StorageView`
+    taken at any step of the replay keeps seeing the values of that step
+    without copying anything.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        # (address, slot) -> (versions, values); a value of ``None`` means unset.
+        self._history: dict[tuple[str, int], tuple[list[int], list[int | None]]] = {}
+        self._slots: dict[str, dict[int, None]] = {}
+        self._journal: list[tuple[str, int]] = []
+
+    def get(self, address: str, slot: int, version: int | None = None) -> int | None:
+        """
+        Get the value of a storage slot.
+
+        Args:
+            address (str): The address owning the storage.
+            slot (int): The storage slot.
+            version (int | None): The version to read at. Defaults to the latest.
+
+        Returns:
+            int | None: The value, or ``None`` if the slot was never written.
+        """
+        history = self._history.get((address.lower(), slot))
+        if history is None:
+            return None
+
+        versions, values = history
+        if version is None or version >= versions[-1]:
+            return values[-1]
+
+        index = bisect_right(versions, version) - 1
+        return values[index] if index >= 0 else None
+
+    def set(self, address: str, slot: int, value: int | None):
+        """
+        Write a storage slot.
+        """
+        key = (address.lower(), slot)
+        self.version += 1
+        self._write(key, value)
+        self._journal.append(key)
+
+    def checkpoint(self) -> StorageCheckpoint:
+        """
+        Mark the current state so it can be restored using
+        :meth:`~evm_trace.vmtrace.StorageOverlay.rollback`.
+        """
+        return len(self._journal), self.version
+
+    def rollback(self, checkpoint: StorageCheckpoint):
+        """
+        Restore every slot written since the given checkpoint,
+        such as when a sub-call reverts. Existing views are unaffected.
+        """
+        journal_index, version = checkpoint
+        keys = dict.fromkeys(self._journal[journal_index:])
+        if not keys:
+            return
+
+        self.version += 1
+        for address, slot in keys:
+            self._write((address, slot), self.get(address, slot, version=version))
+
+        del self._journal[journal_index:]
+
+    def view(self, address: str) -> StorageView:
+        """
+        A read-only view of the address's storage as of the current version.
+        """
+        return StorageView(self, address.lower(), self.version)
+
+    def _write(self, key: tuple[str, int], value: int | None):
+        if key in self._history:
+            versions, values = self._history[key]
+            versions.append(self.version)
+            values.append(value)
+        else:
+            self._history[key] = ([self.version], [value])
+            self._slots.setdefault(key[0], {})[key[1]] = None
+
+
+class StorageView(Mapping[int, int]):
+    """
+    The storage of a single address in a :class:`~evm_trace.vmtrace.StorageOverlay`,
+    frozen at the version it was created at.
+    """
+
+    __slots__ = ("address", "overlay", "version")
+
+    def __init__(self, overlay: StorageOverlay, address: str, version: int):
+        self.overlay = overlay
+        self.address = address
+        self.version = version
+
+    def __getitem__(self, slot: int) -> int:
+        value = self.overlay.get(self.address, slot, version=self.version)
+        if value is None:
+            raise KeyError(slot)
+
+        return value
+
+    def __iter__(self) -> Iterator[int]:
+        for slot in tuple(self.overlay._slots.get(self.address, ())):
+            if self.overlay.get(self.address, slot, version=self.version) is not None:
+                yield slot
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
 
 
 def to_trace_frames(
@@ -97,6 +420,9 @@ def to_trace_frames(
     depth: int = 1,
     address: str = "",
     copy_memory: bool = True,
+    storage: StorageOverlay | None = None,
+    storage_address: str | None = None,
+    snapshot_memory: bool = False,
 ) -> Iterator[VMTraceFrame]:
     """
     Replays a VMTrace and yields trace frames at each step of the execution.
@@ -112,19 +438,29 @@ def to_trace_frames(
             when disabled, `VMTraceFrame.memory` becomes `memoryview` instead of `bytes`, which
             works like a pointer at the memory `bytearray`. this means you must process the
             frames immediately, otherwise you risk memory value mutating further into execution.
+        storage (StorageOverlay | None): The transaction-wide storage shared by all calls.
+            automatically populated.
+        storage_address (str | None): The address whose storage is in use. Differs from
+            ``address`` in ``DELEGATECALL`` and ``CALLCODE`` contexts. automatically populated.
+        snapshot_memory (bool): Use copy-on-write paged memory, making ``VMTraceFrame.memory``
+            a :class:`~evm_trace.vmtrace.MemorySnapshot`. Snapshots are safe to keep around and
+            only cost the pages written since the previous frame. Overrides ``copy_memory``.
 
     Returns:
         Iterator[VMTraceFrame]: An iterator of synthetic traces which can be used as a drop-in
         replacement for Geth-style traces. also contains the address of the current contract
         context.
     """
-    memory = Memory()
+    memory: Memory | PagedMemory = PagedMemory() if snapshot_memory else Memory()
     stack = Stack()
-    storage: dict[int, int] = {}
+    storage = StorageOverlay() if storage is None else storage
+    storage_address = address if storage_address is None else storage_address
     call_address = ""
-    read_memory = memory.read_bytes if copy_memory else memory.read
-
+    remaining_gas: int | None = None
     for op in trace.ops:
+        # NOTE: `ex.used` is the gas remaining after each operation.
+        gas = remaining_gas if remaining_gas is not None else op.cost + (op.ex.used if op.ex else 0)
+        remaining_gas = op.ex.used if op.ex else None
         if op.ex and op.ex.mem:
             memory.extend(op.ex.mem.off, len(op.ex.mem.data))
 
@@ -135,11 +471,13 @@ def to_trace_frames(
             op=op.op,
             depth=depth,
             stack=[to_int(val) for val in stack.values],
-            memory=read_memory(0, len(memory)),
-            storage=storage.copy(),
+            memory=_read_frame_memory(memory, copy_memory),
+            storage=storage.view(storage_address),
+            gas=gas,
+            gas_cost=op.cost,
         )
 
-        if op.op in ["CALL", "DELEGATECALL", "STATICCALL"]:
+        if op.op in ["CALL", "CALLCODE", "DELEGATECALL", "STATICCALL"]:
             call_address_from_stack = stack.values[-2]
             # Evm natively discards dirty upper bits during CALL
             # NOTE: `isinstance` check to satisfy mypy
@@ -163,13 +501,264 @@ def to_trace_frames(
                 stack.push_int(0)
 
             if op.ex.store:
-                storage[op.ex.store.key] = op.ex.store.val
+                storage.set(storage_address, op.ex.store.key, op.ex.store.val)
+
+            # The deployed address is pushed once the CREATE finishes.
+            if op.op in ("CREATE", "CREATE2") and op.ex.push:
+                call_address = Address.__eth_pydantic_validate__(op.ex.push[-1][-20:])
 
         if op.sub:
+            checkpoint = storage.checkpoint()
             yield from to_trace_frames(
-                op.sub, depth=depth + 1, address=call_address, copy_memory=copy_memory
+                op.sub,
+                depth=depth + 1,
+                address=call_address,
+                copy_memory=copy_memory,
+                storage=storage,
+                storage_address=(
+                    storage_address if op.op in ("DELEGATECALL", "CALLCODE") else call_address
+                ),
+                snapshot_memory=snapshot_memory,
+            )
+
+            # The pushed value is 0 when the sub-call failed (or 0x0 address for CREATE).
+            if not op.ex or not any(to_int(item) for item in op.ex.push):
+                storage.rollback(checkpoint)
+
+
+def _read_frame_memory(
+    memory: Memory | PagedMemory, copy_memory: bool
+) -> bytes | memoryview | MemorySnapshot:
+    if isinstance(memory, PagedMemory):
+        return memory.snapshot()
+
+    return memory.read_bytes(0, len(memory)) if copy_memory else memory.read(0, len(memory))
+
+
+def stream_calltree_from_vmtrace(
+    trace: VMTrace, address: str = "", compact: bool = False, **root_kwargs
+) -> Iterator[CallStreamEvent]:
+    """
+    Stream the calls of a VMTrace as they are entered and exited, instead of building
+    a call tree. Only the calls in progress are kept, so memory is bounded by the call
+    depth rather than the size of the trace. See :class:`~evm_trace.stream.CallStreamEvent`.
+
+    The ``gas_limit`` of a call is the gas it started with and its ``gas_cost`` is
+    the gas it used, including its sub-calls. Calls executing no code have no gas set.
+
+    Args:
+        trace (VMTrace): A decoded trace from a `trace_` rpc.
+        address (str): The address of the contract being executed in the root call.
+        compact (bool): Set to ``True`` to stream
+          :class:`~evm_trace.base.CompactCallTreeNode` objects instead.
+        **root_kwargs: Additional kwargs to append to the root node.
+
+    Returns:
+        Iterator[:class:`~evm_trace.stream.CallStreamEvent`]
+    """
+    if address:
+        root_kwargs.setdefault("address", address)
+
+    root = create_node(compact=compact, **root_kwargs)
+    yield call_entered(root)
+
+    # The call at index ``i`` executes the frames at depth ``i + 1``.
+    stack: list[Any] = [root]
+    # The gas each call in ``stack`` started with, and had left after its last frame.
+    gas_stack: list[list[int]] = []
+    # A call opcode just executed, the call is entered at the next frame.
+    pending: dict | None = None
+    for frame in to_trace_frames(trace, address=address, copy_memory=False):
+        if not gas_stack:
+            gas_stack.append([frame.gas, frame.gas])
+            if root.gas_limit is None:
+                root.gas_limit = frame.gas
+
+        if pending is not None:
+            if frame.depth > len(stack):
+                if not pending.get("address"):
+                    pending["address"] = frame.address
+
+                node = create_node(compact=compact, gas_limit=frame.gas, **pending)
+                stack.append(node)
+                gas_stack.append([frame.gas, frame.gas])
+                yield call_entered(node)
+
+            else:
+                # Nothing was executed, such as when calling an account without code.
+                if not pending.get("address"):
+                    pending["address"] = _to_address(frame.stack[-1] if frame.stack else 0)
+
+                pending["failed"] = not frame.stack or not frame.stack[-1]
+                node = create_node(compact=compact, **pending)
+                yield call_entered(node)
+                yield call_exited(node)
+
+            pending = None
+
+        while frame.depth < len(stack):
+            node = stack.pop()
+            _set_gas_cost(node, *gas_stack.pop())
+            if frame.depth == len(stack) and frame.stack and not frame.stack[-1]:
+                # The call (or CREATE) pushed 0 to the caller's stack.
+                node.failed = True
+
+            yield call_exited(node)
+
+        node = stack[-1]
+        gas_stack[-1][1] = frame.gas - frame.gas_cost
+        if frame.op in CALL_OPCODE_VALUES:
+            pending = _get_call_kwargs(frame)
+
+        elif frame.op.startswith("LOG") and len(frame.op) > 3 and frame.op[3].isnumeric():
+            if frame.op == "LOG0":
+                # NOTE: Events without topics are skipped, since event nodes need a selector.
+                continue
+
+            event = _get_event_kwargs(frame)
+            yield event_emitted(
+                node,
+                CompactEventNode.from_kwargs(**event) if compact else EventNode(**event),
             )
 
+        elif frame.op == "SELFDESTRUCT":
+            node.selfdestruct = True
+
+        elif frame.op in ("RETURN", "REVERT"):
+            returndata = _read_slice(frame.memory, frame.stack[-1], frame.stack[-2])
+            node.returndata = returndata if compact else HexBytes(returndata)
+            node.failed = frame.op == "REVERT"
+
+    if pending is not None:
+        node = create_node(compact=compact, **pending)
+        yield call_entered(node)
+        yield call_exited(node)
+
+    while stack:
+        node = stack.pop()
+        if gas_stack:
+            _set_gas_cost(node, *gas_stack.pop())
+
+        yield call_exited(node)
+
+
+def get_calltree_from_vmtrace(
+    trace: VMTrace, address: str = "", compact: bool = False, **root_kwargs
+) -> CallTreeNode | CompactCallTreeNode:
+    """
+    Create a call tree from a VMTrace.
+
+    Args:
+        trace (VMTrace): A decoded trace from a `trace_` rpc.
+        address (str): The address of the contract being executed in the root call.
+        compact (bool): Set to ``True`` to get a
+          :class:`~evm_trace.base.CompactCallTreeNode` instead.
+        **root_kwargs: Additional kwargs to append to the root node.
+
+    Returns:
+        :class:`~evm_trace.base.CallTreeNode`
+    """
+    root = build_calltree(
+        stream_calltree_from_vmtrace(trace, address=address, compact=compact, **root_kwargs)
+    )
+    assert root is not None  # The root is always streamed.
+    return root
+
+
+def get_calltrees_from_rpc_response(
+    buffer: bytes, compact: bool = False
+) -> list[CallTreeNode | CompactCallTreeNode]:
+    """
+    Create a call tree for each transaction in a raw ``trace_replayTransaction`` or
+    ``trace_replayBlockTransactions`` response using the ``vmTrace`` tracer. When the
+    response also has the ``trace`` tracer, the root call's address, type and value
+    are taken from its first trace.
+
+    Args:
+        buffer (bytes): The raw response.
+        compact (bool): Set to ``True`` to get
+          :class:`~evm_trace.base.CompactCallTreeNode` objects instead.
+
+    Returns:
+        list[:class:`~evm_trace.base.CallTreeNode`]
+    """
+    response = Decoder(RPCResponse, dec_hook=dec_hook).decode(buffer)
+    results = response.result if isinstance(response.result, list) else [response.result]
+    calltrees = []
+    for result in results:
+        root_kwargs = _get_root_kwargs(result.trace[0]) if result.trace else {}
+        calltrees.append(get_calltree_from_vmtrace(result.vmTrace, compact=compact, **root_kwargs))
+
+    return calltrees
+
+
+def _get_root_kwargs(trace: dict) -> dict:
+    action = trace.get("action") or {}
+    if trace.get("type") == "create":
+        kwargs: dict = {"call_type": CallType.CREATE}
+        if address := (trace.get("result") or {}).get("address"):
+            kwargs["address"] = address
+
+    else:
+        kwargs = {"call_type": CallType((action.get("callType") or "call").upper())}
+        if address := action.get("to"):
+            kwargs["address"] = address
+
+    if value := action.get("value"):
+        kwargs["value"] = int(value, 16)
+
+    return kwargs
+
+
+def _set_gas_cost(node: Any, start_gas: int, gas_left: int):
+    if node.gas_cost is None:
+        node.gas_cost = max(start_gas - gas_left, 0)
+
+
+def _get_call_kwargs(frame: VMTraceFrame) -> dict:
+    stack = frame.stack
+    call_type = CallType(frame.op)
+    kwargs: dict = {"call_type": call_type, "depth": frame.depth}
+    if call_type in (CallType.CALL, CallType.CALLCODE):
+        kwargs.update(
+            address=_to_address(stack[-2]),
+            value=stack[-3],
+            calldata=_read_slice(frame.memory, stack[-4], stack[-5]),
+        )
+    elif call_type in (CallType.DELEGATECALL, CallType.STATICCALL):
+        kwargs.update(
+            address=_to_address(stack[-2]),
+            calldata=_read_slice(frame.memory, stack[-3], stack[-4]),
+        )
+    else:
+        # CREATE and CREATE2, the address is only known once executing.
+        kwargs.update(value=stack[-1], calldata=_read_slice(frame.memory, stack[-2], stack[-3]))
+
+    return kwargs
+
+
+def _get_event_kwargs(frame: VMTraceFrame) -> dict:
+    stack = frame.stack
+    num_topics = int(frame.op[3])
+    return {
+        "depth": frame.depth,
+        "topics": [stack[-3 - i].to_bytes(32, "big") for i in range(num_topics)],
+        "data": _read_slice(frame.memory, stack[-1], stack[-2]),
+    }
+
+
+def _read_slice(memory: bytes | memoryview | MemorySnapshot, offset: int, size: int) -> bytes:
+    # NOTE: Clamped to the end of memory, like the geth builder, since the size
+    #   comes from the stack and may be far larger than the memory.
+    if size == 0 or offset >= len(memory):
+        return b""
+
+    return bytes(memory[offset : offset + size])
+
+
+def _to_address(value: int) -> bytes:
+    return (value & ((1 << 160) - 1)).to_bytes(20, "big")
+
 
 class RPCResponse(Struct):
     result: RPCTraceResult | list[RPCTraceResult]
@@ -10,6 +10,7 @@ DATA_PATH = Path(__file__).parent / "data"
 GETH_DATA = DATA_PATH / "geth"
 EVM_TRACE_DATA = DATA_PATH / "evm_trace"
 PARITY_DATA = DATA_PATH / "parity"
+VMTRACE_DATA = DATA_PATH / "vmtrace"
 TRACE_FRAME_DATA = json.loads((EVM_TRACE_DATA / "frame.json").read_text(encoding="utf8"))
 CALL_FRAME_DATA = json.loads((EVM_TRACE_DATA / "call.json").read_text(encoding="utf8"))
 MUTABLE_CALL_TREE_DATA = json.loads(
@@ -24,6 +25,7 @@ CREATE_CALL_TRACE_DATA = json.loads((GETH_DATA / "create_call.json").read_text(e
 GETH_TRACE = json.loads((GETH_DATA / "structlogs.json").read_text(encoding="utf8"))
 GETH_CREATE2_TRACE = json.loads((GETH_DATA / "create2_structlogs.json").read_text(encoding="utf8"))
 PARITY_CREATE2_TRACE = json.loads((PARITY_DATA / "create2.json").read_text(encoding="utf8"))
+VMTRACE_CALL_RESPONSE = (VMTRACE_DATA / "call.json").read_bytes()
 CALL_TREE_DATA_MAP = {
     CallType.CALL.value: MUTABLE_CALL_TREE_DATA,
     CallType.STATICCALL.value: STATIC_CALL_TREE_DATA,
@@ -95,3 +97,13 @@ def geth_create2_struct_logs():
 def geth_create2_trace_frames(geth_create2_struct_logs):
     # NOTE: These frames won't have the CREATE address set.
     return [TraceFrame(**x) for x in geth_create2_struct_logs]
+
+
+@pytest.fixture(scope="session")
+def vmtrace_call_response():
+    """
+    The raw response from `trace_replayTransaction` using the `vmTrace` tracer.
+    The root contract re-enters itself in a reverted call and then
+    calls another contract successfully.
+    """
+    return VMTRACE_CALL_RESPONSE
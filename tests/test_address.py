@@ -0,0 +1,88 @@
+import pytest
+from eth_utils import to_checksum_address
+
+from evm_trace.address import CreateAddressResolver, get_create2_address, get_create_address
+from evm_trace.geth import TraceFrame
+
+SENDER = bytes.fromhex("6ac7ea33f8831ea9dcc53393aaa88b25a785dbf0")
+
+
+@pytest.mark.parametrize(
+    "nonce,expected",
+    (
+        (0, "0xcd234A471b72ba2F1Ccf0A70FCABA648a5eeCD8d"),
+        (1, "0x343c43A37D37dfF08AE8C4A11544c718AbB4fCF8"),
+        (200, "0xeB7fACD118466C9ACbCb4Ee964A0aC0b0B2EF256"),
+    ),
+)
+def test_get_create_address(nonce, expected):
+    assert to_checksum_address(get_create_address(SENDER, nonce)) == expected
+
+
+@pytest.mark.parametrize(
+    "sender,salt,init_code,expected",
+    (
+        # Examples from EIP-1014.
+        ("00" * 20, "00" * 32, "00", "0x4D1A2e2bB4F88F0250f26Ffff098B0b30B26BF38"),
+        (
+            "deadbeef00000000000000000000000000000000",
+            "00" * 32,
+            "00",
+            "0xB928f69Bb1D91Cd65274e3c79d8986362984fDA3",
+        ),
+        ("00" * 20, "00" * 32, "", "0xE33C0C7F7df4809055C3ebA6c09CFe4BaF1BD9e0"),
+    ),
+)
+def test_get_create2_address(sender, salt, init_code, expected):
+    address = get_create2_address(
+        bytes.fromhex(sender), bytes.fromhex(salt), bytes.fromhex(init_code)
+    )
+    assert to_checksum_address(address) == expected
+
+
+def test_create_address_resolver():
+    resolver = CreateAddressResolver({"0x6ac7ea33f8831ea9dcc53393aaa88b25a785dbf0": 0})
+    frame = TraceFrame(pc=0, op="CREATE", gas=0, gasCost=0, depth=1)
+    assert resolver.resolve(frame, SENDER) == get_create_address(SENDER, 0)
+    assert resolver.resolve(frame, SENDER) == get_create_address(SENDER, 1)
+
+    # Deployed contracts start at nonce 1.
+    deployed = get_create_address(SENDER, 0)
+    assert resolver.resolve(frame, deployed) == get_create_address(deployed, 1)
+
+    # Unknown senders and CREATE2 without memory are not resolved.
+    assert resolver.resolve(frame, bytes(20)) is None
+    assert resolver.resolve(frame, None) is None
+    frame = TraceFrame(pc=0, op="CREATE2", gas=0, gasCost=0, depth=1, stack=["0x00"] * 4)
+    assert resolver.resolve(frame, SENDER) is None
+    assert resolver.nonces[SENDER] == 3
+
+
+def test_create_address_resolver_rollback():
+    resolver = CreateAddressResolver({SENDER: 0})
+    frame = TraceFrame(pc=0, op="CREATE", gas=0, gasCost=0, depth=1)
+    checkpoint = resolver.checkpoint()
+    deployed = resolver.resolve(frame, SENDER)
+    resolver.resolve(frame, deployed)
+    assert resolver.nonces == {SENDER: 1, deployed: 2, get_create_address(deployed, 1): 1}
+
+    resolver.rollback(checkpoint)
+    assert resolver.nonces == {SENDER: 0}
+    assert resolver.resolve(frame, SENDER) == deployed
+
+
+def test_create_address_resolver_observe():
+    resolver = CreateAddressResolver({SENDER: 0})
+    frame = TraceFrame(pc=0, op="CREATE", gas=0, gasCost=0, depth=1)
+
+    # The next frame is at the same depth, so the deployment did not run.
+    deployed = resolver.resolve(frame, SENDER)
+    assert resolver.pending
+    resolver.observe(1)
+    assert resolver.nonces == {SENDER: 0}
+    assert not resolver.pending
+
+    assert resolver.resolve(frame, SENDER) == deployed
+    resolver.observe(2)
+    resolver.observe(1)
+    assert resolver.nonces == {SENDER: 1, deployed: 1}
@@ -0,0 +1,105 @@
+import copy
+from collections import Counter
+
+import pytest
+
+from evm_trace.analysis import (
+    Analyzer,
+    CallTreeAnalyzer,
+    OpcodeGasHistogram,
+    RevertLocator,
+    SStoreCounter,
+    analyze_geth_trace,
+)
+from evm_trace.geth import TraceFrame, create_trace_frames, get_calltree_from_geth_trace
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_call_tree_analyzer(geth_create2_struct_logs, compact):
+    expected = get_calltree_from_geth_trace(
+        create_trace_frames(geth_create2_struct_logs), compact=compact
+    )
+    (actual,) = analyze_geth_trace(geth_create2_struct_logs, [CallTreeAnalyzer(compact=compact)])
+    assert actual == expected
+
+
+def test_analyze_geth_trace_single_pass(geth_create2_struct_logs, monkeypatch):
+    decoded = []
+    model_validate = TraceFrame.model_validate
+
+    def decode(data):
+        decoded.append(data)
+        return model_validate(data)
+
+    monkeypatch.setattr(TraceFrame, "model_validate", decode)
+    calltree, sstores, gas, reverts = analyze_geth_trace(
+        iter(geth_create2_struct_logs),
+        [CallTreeAnalyzer(), SStoreCounter(), OpcodeGasHistogram(), RevertLocator()],
+    )
+    assert len(calltree.calls) == 2
+    assert sum(sstores.values()) == 3
+    assert gas["SSTORE"] > 0
+    assert sum(gas.values()) == sum(f["gasCost"] for f in geth_create2_struct_logs)
+    assert reverts == []
+
+    # Only the frames the analyzers are interested in are decoded, once.
+    assert 0 < len(decoded) < len(geth_create2_struct_logs) // 10
+    assert len({id(f) for f in decoded}) == len(decoded)
+
+
+def test_opcode_gas_histogram_raw():
+    # Raw analyzers never decode frames, so missing fields do not matter.
+    frames = [
+        {"op": "PUSH1", "gasCost": 3},
+        {"op": "PUSH1", "gasCost": "0x3"},
+        {"op": "SLOAD", "gasCost": 2100},
+    ]
+    analyzer = OpcodeGasHistogram()
+    (gas,) = analyze_geth_trace(frames, [analyzer])
+    assert gas == Counter({"PUSH1": 6, "SLOAD": 2100})
+    assert analyzer.counts == Counter({"PUSH1": 2, "SLOAD": 1})
+
+
+def test_revert_locator(geth_create2_struct_logs):
+    struct_logs = copy.deepcopy(geth_create2_struct_logs)
+    index, frame = next((i, f) for i, f in enumerate(struct_logs) if f["op"] == "RETURN")
+    frame["op"] = "REVERT"
+    (locations,) = analyze_geth_trace(struct_logs, [RevertLocator()])
+    assert len(locations) == 1
+    assert locations[0].pc == frame["pc"]
+    assert locations[0].depth == frame["depth"]
+
+
+def test_sstore_counter_by_address():
+    root, callee, library = ("0x" + c * 20 for c in ("11", "22", "33"))
+    frame = {"pc": 0, "gas": 1000, "gasCost": 3}
+    call_stack = ["0x00", "0x00", "0x00", "0x00", "0x00", callee, "0xffff"]
+    delegate_stack = ["0x00", "0x00", "0x00", "0x00", library, "0xffff"]
+    struct_logs = [
+        {**frame, "op": "SSTORE", "depth": 1, "stack": ["0x05", "0x01"]},
+        {**frame, "op": "CALL", "depth": 1, "stack": call_stack},
+        {**frame, "op": "SSTORE", "depth": 2, "stack": ["0x05", "0x01"]},
+        {**frame, "op": "DELEGATECALL", "depth": 2, "stack": delegate_stack},
+        {**frame, "op": "SSTORE", "depth": 3, "stack": ["0x05", "0x01"]},
+        {**frame, "op": "SSTORE", "depth": 2, "stack": ["0x05", "0x02"]},
+        {**frame, "op": "SSTORE", "depth": 1, "stack": ["0x05", "0x01"]},
+        # Without the stack, the slot is unknown.
+        {**frame, "op": "SSTORE", "depth": 1},
+    ]
+    (counts,) = analyze_geth_trace(struct_logs, [SStoreCounter(address=root)])
+    assert counts == Counter(
+        {
+            (bytes.fromhex("11" * 20), b"\x01"): 2,
+            (bytes.fromhex("22" * 20), b"\x01"): 2,
+            (bytes.fromhex("22" * 20), b"\x02"): 1,
+        }
+    )
+
+
+def test_incomplete_analyzer():
+    class IncompleteAnalyzer(Analyzer):
+        def on_frame(self, frame):
+            pass
+
+    with pytest.raises(TypeError):
+        IncompleteAnalyzer()
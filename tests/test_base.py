@@ -1,6 +1,8 @@
+import tracemalloc
+
 import pytest
 
-from evm_trace.base import CallTreeNode
+from evm_trace.base import CallTreeNode, CompactCallTreeNode, LazyHexBytes
 from evm_trace.enums import CallType
 
 from .expected_traces import (
@@ -29,3 +31,61 @@ class TestCallTreeNode:
     def test_call_tree_mutable_representation(self, call_tree):
         expected = EXPECTED_OUTPUT_MAP[call_tree.call_type].strip()
         assert repr(call_tree) == expected
+
+
+class TestCompactCallTreeNode:
+    def test_from_kwargs(self, call_tree_data, call_tree):
+        node = CompactCallTreeNode.from_kwargs(**call_tree_data)
+        assert repr(node) == repr(call_tree)
+        assert node.to_pydantic() == call_tree
+
+    def test_from_pydantic(self, call_tree):
+        node = CompactCallTreeNode.from_pydantic(call_tree)
+        assert node.to_pydantic() == call_tree
+
+    def test_uses_less_memory(self, call_tree_data):
+        def measure(fn) -> int:
+            tracemalloc.start()
+            nodes = [fn(**call_tree_data) for _ in range(100)]
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert nodes
+            return size
+
+        assert measure(CompactCallTreeNode.from_kwargs) < measure(CallTreeNode) / 2
+
+    def test_from_kwargs_lazy_bytes(self, call_tree_data, call_tree):
+        node = CompactCallTreeNode.from_kwargs(lazy_bytes=True, **call_tree_data)
+        assert isinstance(node.calldata, LazyHexBytes)
+        assert node == CompactCallTreeNode.from_kwargs(**call_tree_data)
+        assert repr(node) == repr(call_tree)
+        assert node.to_pydantic() == call_tree
+
+
+class TestLazyHexBytes:
+    def test_selector(self):
+        value = LazyHexBytes("0xa9059cbb" + "00" * 64)
+        assert value.selector == bytes.fromhex("a9059cbb")
+        assert len(value) == 68
+        # Neither needed a full decode.
+        assert value._value is None
+
+    def test_bytes(self):
+        value = LazyHexBytes("0xa9059cbb")
+        assert bytes(value) == bytes.fromhex("a9059cbb")
+        assert value._hex == ""
+        assert value.selector == bytes.fromhex("a9059cbb")
+        assert value.hex() == "a9059cbb"
+
+    def test_eq(self):
+        value = LazyHexBytes("0xa9059cbb")
+        assert value == bytes.fromhex("a9059cbb")
+        assert value == LazyHexBytes("A9059CBB")
+        assert value != b""
+        assert hash(value) == hash(bytes.fromhex("a9059cbb"))
+
+    def test_empty(self):
+        value = LazyHexBytes("0x")
+        assert not value
+        assert len(value) == 0
+        assert value.selector == b""
@@ -0,0 +1,50 @@
+from benchmarks.generators import (
+    ROOT_ADDRESS,
+    generate_call_tracer_trace,
+    generate_parity_trace_list,
+    generate_struct_logs,
+    generate_vmtrace_response,
+)
+from benchmarks.runner import CASES, SCALES, compare_results, run_benchmarks
+from evm_trace.geth import (
+    create_trace_frames,
+    get_calltree_from_geth_call_trace,
+    get_calltree_from_geth_trace,
+)
+from evm_trace.parity import ParityTraceList, get_calltree_from_parity_trace
+from evm_trace.vmtrace import from_rpc_response, get_calltree_from_vmtrace
+
+SHAPE = SCALES["tiny"]
+
+
+def test_generators():
+    def get_structure(node):
+        return (node.call_type, node.address, [get_structure(c) for c in node.calls])
+
+    # Every format gives the same call tree.
+    expected = get_structure(get_calltree_from_geth_call_trace(generate_call_tracer_trace(SHAPE)))
+    frames = create_trace_frames(generate_struct_logs(SHAPE))
+    trees = [
+        get_calltree_from_geth_trace(frames, address=ROOT_ADDRESS),
+        get_calltree_from_parity_trace(
+            ParityTraceList.model_validate(generate_parity_trace_list(SHAPE))
+        ),
+        get_calltree_from_vmtrace(
+            from_rpc_response(generate_vmtrace_response(SHAPE)), address=ROOT_ADDRESS
+        ),
+    ]
+    assert all(get_structure(tree) == expected for tree in trees)
+
+    # The same seed gives the same traces.
+    assert generate_struct_logs(SHAPE) == generate_struct_logs(SHAPE)
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(SHAPE, repeat=1, scale="tiny")
+    assert [r["name"] for r in results["results"]] == [c.name for c in CASES]
+    assert all(r["size"] > 0 and r["peak_memory_bytes"] > 0 for r in results["results"])
+    assert results["metadata"]["shape"]["seed"] == SHAPE.seed
+
+    lines = compare_results(results, results)
+    assert len(lines) == len(CASES) + 1
+    assert lines[1].endswith("1.00x    1.00x")
@@ -0,0 +1,140 @@
+import os
+
+import pytest
+
+from evm_trace.base import CompactCallTreeNode
+from evm_trace.cache import TraceCache
+from evm_trace.geth import get_calltree_from_geth_call_trace
+
+TX_HASH = "0x" + "12" * 32
+CONFIG = {"tracer": "callTracer"}
+
+
+@pytest.fixture
+def calltree(call_trace_data):
+    return get_calltree_from_geth_call_trace(call_trace_data)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TraceCache(tmp_path / "cache")
+
+
+def test_get_or_build(cache, calltree):
+    calls = []
+
+    def builder():
+        calls.append(1)
+        return calltree
+
+    assert cache.get(TX_HASH, config=CONFIG) is None
+    assert cache.get_or_build(TX_HASH, builder, config=CONFIG) == calltree
+    assert cache.get_or_build(TX_HASH, builder, config=CONFIG) == calltree
+    assert len(calls) == 1
+
+    # Keyed by config and case-insensitive in the hash.
+    assert cache.get(TX_HASH, config={"tracer": "other"}) is None
+    assert cache.get(TX_HASH.upper().replace("0X", "0x"), config=CONFIG) == calltree
+
+    compact = cache.get(TX_HASH, config=CONFIG, compact=True)
+    assert isinstance(compact, CompactCallTreeNode)
+
+
+def test_raw(cache):
+    assert cache.get_raw(TX_HASH) is None
+    cache.put_raw(TX_HASH, b"raw-data")
+    cache.put_raw(TX_HASH, b"", config=CONFIG)
+    assert cache.get_raw(TX_HASH) == b"raw-data"
+    assert cache.get_raw(TX_HASH, config=CONFIG) == b""
+
+
+def test_lru_eviction(tmp_path):
+    cache = TraceCache(tmp_path, max_size=250)
+    keys = [f"0x{i:064x}" for i in range(4)]
+    for index, key in enumerate(keys[:3]):
+        cache.put_raw(key, b"x" * 100)
+        # Ensure distinct access times.
+        path = cache._get_path(key, None, ".raw")
+        os.utime(path, ns=(index * 10**9, index * 10**9))
+
+    # The first entry was evicted when the third was added.
+    assert cache.get_raw(keys[0]) is None
+
+    # Use the second, making the third least-recently used.
+    assert cache.get_raw(keys[1]) is not None
+    cache.put_raw(keys[3], b"x" * 100)
+    assert cache.get_raw(keys[2]) is None
+    assert cache.get_raw(keys[1]) is not None
+    assert cache.get_raw(keys[3]) is not None
+
+
+def test_clear(cache, calltree):
+    cache.put(TX_HASH, calltree)
+    cache.clear()
+    assert cache.get(TX_HASH) is None
+    assert cache.evict() == 0
+
+
+def test_get_or_build_compact(cache, calltree):
+    compact = cache.get_or_build(TX_HASH, lambda: calltree, compact=True)
+    assert isinstance(compact, CompactCallTreeNode)
+    assert cache.get_or_build(TX_HASH, lambda: calltree, compact=True) == compact
+
+    # The other way around.
+    other_hash = "0x" + "34" * 32
+    built = cache.get_or_build(other_hash, lambda: CompactCallTreeNode.from_pydantic(calltree))
+    assert built == calltree
+    assert cache.get_or_build(other_hash, lambda: calltree) == calltree
+
+
+def test_corrupt_entry(cache, calltree):
+    cache.put(TX_HASH, calltree)
+    path = cache._get_path(TX_HASH, None, ".tree")
+    path.write_bytes(path.read_bytes()[:20])
+
+    assert cache.get(TX_HASH) is None
+    assert not path.exists()
+    assert cache.get_or_build(TX_HASH, lambda: calltree) == calltree
+    assert cache.get(TX_HASH) == calltree
+
+
+def test_failed_write(cache, monkeypatch):
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        cache.put_raw(TX_HASH, b"raw-data")
+
+    assert not list(cache.path.glob("*/*.tmp"))
+
+
+def test_rewrite_size(cache):
+    for _ in range(3):
+        cache.put_raw(TX_HASH, b"x" * 100)
+
+    assert cache.evict() == 100
+
+
+def test_shared_directory(tmp_path):
+    # Like separate processes, each only knowing about its own writes.
+    caches = [TraceCache(tmp_path, max_size=250) for _ in range(2)]
+    for index in range(3):
+        caches[index % 2].put_raw(f"0x{index:064x}", b"x" * 100)
+        path = caches[0]._get_path(f"0x{index:064x}", None, ".raw")
+        os.utime(path, ns=(index * 10**9, index * 10**9))
+
+    assert sum(f.stat().st_size for f in tmp_path.glob("*/*.raw")) <= 250
+    assert caches[0].get_raw(f"0x{0:064x}") is None
+
+
+def test_get_raw_is_mapped(cache):
+    cache.put_raw(TX_HASH, b"raw-data")
+    data = cache.get_raw(TX_HASH)
+    assert isinstance(data, memoryview)
+    assert data == b"raw-data"
+
+    # Still readable once the entry is replaced or removed.
+    cache.put_raw(TX_HASH, b"new-data")
+    cache.clear()
+    assert data == b"raw-data"
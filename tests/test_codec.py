@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+from evm_trace.base import CallTreeNode, CompactCallTreeNode
+from evm_trace.codec import decode, decode_stream, encode, encode_stream
+from evm_trace.geth import get_calltree_from_geth_call_trace
+from evm_trace.parity import ParityTraceList, get_calltree_from_parity_trace
+
+from .conftest import PARITY_DATA
+
+
+@pytest.fixture
+def calltree(call_trace_data):
+    return get_calltree_from_geth_call_trace(call_trace_data)
+
+
+@pytest.fixture
+def event_calltree():
+    return CallTreeNode(
+        call_type="CALL",
+        address="0x0000000000000000000000000000000000000001",
+        calldata="0xa9059cbb",
+        events=[{"depth": 0, "topics": ["0x" + "ab" * 32, "0x01"], "data": "0x02"}],
+        calls=[{"call_type": "CREATE", "depth": 1, "calldata": "0x6080", "failed": True}],
+    )
+
+
+def test_round_trip(calltree, event_calltree):
+    for tree in (calltree, event_calltree):
+        assert decode(encode(tree)) == tree
+        assert decode(encode(tree), compact=True) == CompactCallTreeNode.from_pydantic(tree)
+
+
+def test_round_trip_uint256():
+    # Larger than the 64-bit integers of msgpack.
+    tree = CallTreeNode(
+        call_type="CALL",
+        address="0x0000000000000000000000000000000000000001",
+        value=2**256 - 1,
+        gas_limit=2**64,
+        gas_cost=2**64 - 1,
+    )
+    assert decode(encode(tree)) == tree
+    assert decode(encode(tree), compact=True) == CompactCallTreeNode.from_pydantic(tree)
+
+
+@pytest.mark.parametrize("name", ("create", "revert", "selfdestruct"))
+def test_round_trip_parity(name):
+    traces = ParityTraceList.model_validate_json((PARITY_DATA / f"{name}.json").read_text())
+    tree = get_calltree_from_parity_trace(traces)
+    assert decode(encode(tree)) == tree
+
+
+def test_smaller_than_json(calltree):
+    assert len(encode(calltree)) < len(calltree.model_dump_json()) / 2
+
+
+def test_stream(calltree, event_calltree):
+    buffer = io.BytesIO()
+    assert encode_stream([calltree, event_calltree], buffer) == 2
+    buffer.seek(0)
+    assert list(decode_stream(buffer)) == [calltree, event_calltree]
+
+
+def test_decode_invalid(calltree):
+    with pytest.raises(ValueError, match="Not an encoded call tree"):
+        decode(b"\x01")
+
+    data = encode(calltree).replace(b"evmtrace\x01", b"evmtrace\x02", 1)
+    with pytest.raises(ValueError, match="Unsupported call tree encoding version"):
+        decode(data)
+
+    with pytest.raises(ValueError, match="Truncated"):
+        list(decode_stream(io.BytesIO(b"\x00\x00\x00\xff\x01")))
@@ -0,0 +1,100 @@
+import pytest
+
+from evm_trace.base import CallTreeNode, CompactCallTreeNode
+from evm_trace.diff import DiffType, diff_calltrees, get_subtree_hashes
+from evm_trace.geth import get_calltree_from_geth_call_trace
+
+ADDRESS = "0x274b028b03A250cA03644E6c578D81f019eE1323"
+
+
+@pytest.fixture
+def calltree(call_trace_data):
+    return get_calltree_from_geth_call_trace(call_trace_data)
+
+
+def test_identical(calltree):
+    other = calltree.model_copy(deep=True)
+    assert diff_calltrees(calltree, other) is None
+
+
+def test_subtree_hashes(calltree):
+    other = calltree.model_copy(deep=True)
+    hashes = get_subtree_hashes(calltree)
+    other_hashes = get_subtree_hashes(other)
+    assert hashes[id(calltree)] == other_hashes[id(other)]
+
+    other.calls[-1].calls[0].returndata = b"\x01"
+    other_hashes = get_subtree_hashes(other)
+    assert hashes[id(calltree)] != other_hashes[id(other)]
+    assert hashes[id(calltree.calls[0])] == other_hashes[id(other.calls[0])]
+
+
+def test_changes(calltree):
+    other = calltree.model_copy(deep=True)
+    removed = other.calls.pop(0)
+    other.calls[0].calls[1].gas_cost += 100
+    other.calls[0].calls[1].failed = True
+    added = other.calls[-1].model_copy(deep=True)
+    added.calldata = b"\x12\x34\x56\x78"
+    other.calls.append(added)
+
+    diff = diff_calltrees(calltree, other)
+    assert diff.diff_type == DiffType.CHANGED
+    assert diff.changes == {}
+
+    # Only the differing calls are included, the shift does not misalign the rest.
+    assert [d.diff_type for d in diff.calls] == [DiffType.REMOVED, DiffType.CHANGED, DiffType.ADDED]
+    assert diff.calls[0].before is calltree.calls[0]
+    assert diff.calls[0].before == removed
+    changed = diff.calls[1].calls[0]
+    assert changed.changes == {"gas_cost": (41458, 41558), "failed": (False, True)}
+    assert diff.calls[1].calls[0].calls == []
+    assert diff.calls[2].after is added
+
+    expected = """
+~ CALL: 0xF2Df0b975c0C9eFa2f8CA0491C2d1685104d2488.<0x372dca07> [280038 gas]
+├── - CALL: 0xBcF7FFFD8B256Ec51a36782a52D0c34f6474D951.<0x045856de> [34004 gas]
+├── ~ CALL: 0xBcF7FFFD8B256Ec51a36782a52D0c34f6474D951.<0xbeed0f85> [62443 gas]
+│   └── ~ CALL: 0x274b028b03A250cA03644E6c578D81f019eE1323.<0x878fb701> [41458 gas] (gas_cost: 41458 -> 41558, failed: False -> True)
+└── + CALL: 0xBcF7FFFD8B256Ec51a36782a52D0c34f6474D951.<0x12345678> [32643 gas]
+    """
+    assert str(diff) == expected.strip()
+
+
+def test_compact(calltree):
+    compact = CompactCallTreeNode.from_pydantic(calltree)
+    assert diff_calltrees(compact, compact) is None
+    other = CompactCallTreeNode.from_pydantic(calltree)
+    other.calls[0].returndata = b"\x01"
+    diff = diff_calltrees(compact, other)
+    assert diff.calls[0].changes == {"returndata": (compact.calls[0].returndata, b"\x01")}
+
+
+def test_event_topic_boundaries():
+    def get_calltree(*topics):
+        event = {"depth": 0, "topics": list(topics)}
+        return CallTreeNode(call_type="CALL", address=ADDRESS, events=[event])
+
+    # The same bytes, split into different topics.
+    before = get_calltree("0x0102", "0x03")
+    after = get_calltree("0x01", "0x0203")
+    assert get_subtree_hashes(before)[id(before)] != get_subtree_hashes(after)[id(after)]
+    assert diff_calltrees(before, after).changes.keys() == {"events"}
+
+
+def test_deep_calltrees():
+    def get_calltree(value):
+        node = CallTreeNode(call_type="CALL", address=ADDRESS, depth=1500, value=value)
+        for depth in reversed(range(1500)):
+            node = CallTreeNode(call_type="CALL", address=ADDRESS, depth=depth, calls=[node])
+
+        return node
+
+    diff = diff_calltrees(get_calltree(1), get_calltree(2))
+    lines = str(diff).splitlines()
+    assert len(lines) == 1501
+    assert lines[-1].endswith("(value: 1 -> 2)")
+    for _ in range(1500):
+        diff = diff.calls[0]
+
+    assert diff.changes == {"value": (1, 2)}
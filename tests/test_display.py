@@ -0,0 +1,90 @@
+from io import StringIO
+
+from evm_trace.base import CompactCallTreeNode
+from evm_trace.display import (
+    SUMMARY_MAX_NODES,
+    TreeRepresentation,
+    get_tree_display,
+    write_tree_display,
+)
+from evm_trace.enums import CallType
+from evm_trace.geth import get_calltree_from_geth_call_trace
+
+ADDRESS = bytes.fromhex("274b028b03a250ca03644e6c578d81f019ee1323")
+
+
+def test_write_tree_display(call_trace_data):
+    calltree = get_calltree_from_geth_call_trace(call_trace_data)
+    stream = StringIO()
+    write_tree_display(calltree, stream)
+    expected = "\n".join(str(t) for t in TreeRepresentation.make_tree(calltree))
+    assert stream.getvalue() == expected
+    assert get_tree_display(calltree) == expected
+
+
+def test_get_tree_display_deep():
+    # Deeper than the recursion limit.
+    root = node = CompactCallTreeNode(call_type=CallType.CALL, address=ADDRESS)
+    for depth in range(1, 2000):
+        call = CompactCallTreeNode(
+            call_type=CallType.CALL, address=ADDRESS, depth=depth, calldata=b"\x01\x02\x03\x04"
+        )
+        node.calls.append(call)
+        node = call
+
+    lines = get_tree_display(root).splitlines()
+    assert len(lines) == 2000
+    assert lines[0] == "CALL: 0x274b028b03A250cA03644E6c578D81f019eE1323"
+    assert lines[-1] == (
+        f"{TreeRepresentation.PARENT_PREFIX_MIDDLE * 1998}└── "
+        "CALL: 0x274b028b03A250cA03644E6c578D81f019eE1323.<0x01020304>"
+    )
+
+
+def _wide_calltree(size: int) -> CompactCallTreeNode:
+    root = CompactCallTreeNode(call_type=CallType.CALL, address=ADDRESS)
+    root.calls = [
+        CompactCallTreeNode(call_type=CallType.STATICCALL, address=ADDRESS, depth=1)
+        for _ in range(size)
+    ]
+    root.calls.append(CompactCallTreeNode(call_type=CallType.CALL, address=ADDRESS, depth=1))
+    return root
+
+
+def test_get_tree_display_collapse_repeats():
+    lines = get_tree_display(_wide_calltree(5), collapse_repeats=True).splitlines()
+    assert lines[1:] == [
+        "├── STATICCALL: 0x274b028b03A250cA03644E6c578D81f019eE1323",
+        "├── … ×4",
+        "└── CALL: 0x274b028b03A250cA03644E6c578D81f019eE1323",
+    ]
+
+    # Too few repeats to collapse.
+    calltree = _wide_calltree(2)
+    assert get_tree_display(calltree, collapse_repeats=True) == get_tree_display(calltree)
+
+
+def test_get_tree_display_limits(call_trace_data):
+    calltree = get_calltree_from_geth_call_trace(call_trace_data)
+    lines = get_tree_display(calltree, max_siblings=1).splitlines()
+    assert lines[1].startswith("├── CALL")
+    assert lines[-1] == f"└── … {len(calltree.calls) - 1} more"
+
+    lines = get_tree_display(calltree, max_depth=0).splitlines()
+    assert lines[1:] == [f"└── … {len(calltree.calls)} more"]
+
+    lines = get_tree_display(calltree, max_nodes=3).splitlines()
+    assert len(lines) == 4
+    assert lines[-1] == "… display limited to 3 nodes"
+
+
+def test_repr_bounded():
+    calltree = _wide_calltree(100_000)
+    lines = repr(calltree).splitlines()
+    # Even collapsing the repeats stops at the node limit.
+    assert lines[1:] == [
+        "├── STATICCALL: 0x274b028b03A250cA03644E6c578D81f019eE1323",
+        f"├── … ×{SUMMARY_MAX_NODES - 2}",
+        f"… display limited to {SUMMARY_MAX_NODES} nodes",
+    ]
+    assert len(str(calltree).splitlines()) == 100_002
@@ -1,6 +1,7 @@
 import pytest
 
 from evm_trace import CallType
+from evm_trace.enums import CALL_TYPE_IDS, CALL_TYPES
 
 
 class TestCallType:
@@ -8,3 +9,7 @@ class TestCallType:
     def test_eq(self, val):
         call_type = CallType.CALL
         assert call_type == val
+
+
+def test_call_type_ids():
+    assert [CALL_TYPES[CALL_TYPE_IDS[c]] for c in CallType] == list(CallType)
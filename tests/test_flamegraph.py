@@ -0,0 +1,45 @@
+from io import StringIO
+
+from evm_trace.base import CompactCallTreeNode
+from evm_trace.enums import CallType
+from evm_trace.flamegraph import FoldedStackAggregator, get_folded_stacks, write_folded_stacks
+from evm_trace.geth import get_calltree_from_geth_call_trace
+
+ADDRESS = bytes.fromhex("274b028b03a250ca03644e6c578d81f019ee1323")
+NAME = "0x274b028b03A250cA03644E6c578D81f019eE1323"
+
+
+def test_get_folded_stacks(call_trace_data):
+    calltree = get_calltree_from_geth_call_trace(call_trace_data)
+    stacks = list(get_folded_stacks(calltree))
+    # Self-gas adds up to the total.
+    assert sum(gas for _, gas in stacks) == calltree.gas_cost
+    root = "0xF2Df0b975c0C9eFa2f8CA0491C2d1685104d2488.0x372dca07"
+    assert stacks[0][0] == root
+    call = next(c for c in calltree.calls if c.calldata[:4] == bytes.fromhex("bff2e095"))
+    assert (f"{root};{NAME}.0xbff2e095", call.gas_cost) in stacks
+
+
+def test_get_folded_stacks_no_selector():
+    create = CompactCallTreeNode(
+        call_type=CallType.CREATE, address=ADDRESS, depth=1, gas_cost=100, calldata=b"\x60" * 8
+    )
+    calltree = CompactCallTreeNode(
+        call_type=CallType.CALL, address=ADDRESS, gas_cost=100, calls=[create]
+    )
+    # The root has no self-gas.
+    assert list(get_folded_stacks(calltree)) == [(f"{NAME};{NAME}", 100)]
+
+
+def test_write_folded_stacks(call_trace_data):
+    calltree = get_calltree_from_geth_call_trace(call_trace_data)
+    aggregator = FoldedStackAggregator()
+    aggregator.add(calltree)
+    expected = {
+        line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) * 3 for line in aggregator.lines()
+    }
+
+    stream = StringIO()
+    write_folded_stacks((calltree for _ in range(3)), stream)
+    lines = stream.getvalue().splitlines()
+    assert {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines} == expected
@@ -0,0 +1,69 @@
+import pytest
+
+from evm_trace.base import CallTreeNode, CompactCallTreeNode
+from evm_trace.enums import CallType
+from evm_trace.flat import FlatCallTree
+from evm_trace.geth import get_calltree_from_geth_call_trace
+
+
+@pytest.fixture
+def calltree(call_trace_data):
+    return get_calltree_from_geth_call_trace(call_trace_data)
+
+
+@pytest.fixture
+def flat_tree(calltree):
+    return FlatCallTree.from_calltree(calltree)
+
+
+def test_from_calltree(calltree, flat_tree):
+    nodes = []
+    stack = [calltree]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(reversed(node.calls))
+
+    assert len(flat_tree) == len(nodes) == 19
+    assert [flat_tree.get_address(i) for i in flat_tree] == [n.address for n in nodes]
+    assert [flat_tree.get_gas_cost(i) for i in flat_tree] == [n.gas_cost for n in nodes]
+    assert flat_tree.get_call_type(3) == CallType.STATICCALL
+    assert len(flat_tree.addresses) == 3
+
+
+def test_queries(calltree, flat_tree):
+    assert flat_tree.get_parent(0) is None
+    assert flat_tree.get_subtree_size(0) == len(flat_tree)
+    children = list(flat_tree.get_children(0))
+    assert len(children) == len(calltree.calls)
+
+    # The second sub-call has two sub-calls of its own.
+    second = children[1]
+    assert flat_tree.get_subtree(second) == range(second, second + 3)
+    assert list(flat_tree.get_children(second)) == [second + 1, second + 2]
+    assert flat_tree.get_parent(second + 2) == second
+    assert list(flat_tree.get_ancestors(second + 2)) == [second, 0]
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_to_calltree(calltree, flat_tree, compact):
+    actual = flat_tree.to_calltree(compact=compact)
+    if compact:
+        assert isinstance(actual, CompactCallTreeNode)
+        actual = actual.to_pydantic()
+
+    assert isinstance(actual, CallTreeNode)
+    assert actual == calltree
+
+
+def test_gas_over_int64():
+    calltree = CallTreeNode(
+        call_type=CallType.CALL,
+        gas_limit=2**64 - 1,
+        gas_cost=21_000,
+        calls=[CallTreeNode(call_type=CallType.CALL, depth=1, gas_limit=2**255)],
+    )
+    flat_tree = FlatCallTree.from_calltree(calltree)
+    assert [flat_tree.get_gas_limit(i) for i in flat_tree] == [2**64 - 1, 2**255]
+    assert [flat_tree.get_gas_cost(i) for i in flat_tree] == [21_000, None]
+    assert flat_tree.to_calltree() == calltree
@@ -1,7 +1,24 @@
+import json
+import random
+import statistics
+
+import pytest
 from eth_pydantic_types import HexBytes
 
 from evm_trace import CallTreeNode
-from evm_trace.gas import GasReport, get_gas_report, merge_reports
+from evm_trace.gas import (
+    GasReport,
+    GasReportBuilder,
+    GasStats,
+    get_gas_report,
+    get_parallel_gas_report,
+    merge_reports,
+)
+from evm_trace.geth import get_calltree_from_geth_call_trace
+from evm_trace.parity import ParityTraceList, get_calltree_from_parity_trace
+from evm_trace.vmtrace import from_rpc_response, get_calltree_from_vmtrace
+
+from .conftest import GETH_DATA, PARITY_DATA, VMTRACE_CALL_RESPONSE
 
 # Simplified version of gas reports only for testing purposes
 CONTRACT_A = HexBytes("0x0000000000000000000000000000000000000001")
@@ -36,6 +53,23 @@ def test_get_gas_report(call_tree_data):
     assert_all(tree)
 
 
+def test_get_gas_report_matches_merged_reports(call_tree_data):
+    tree = CallTreeNode(**call_tree_data)
+    expected = merge_reports(
+        {tree.address: {tree.calldata[:4]: [tree.gas_cost] if tree.gas_cost else []}},
+        *map(get_gas_report, tree.calls),
+    )
+    assert get_gas_report(tree) == expected
+
+
+def test_gas_report_builder(call_tree_data):
+    tree = CallTreeNode(**call_tree_data)
+    builder = GasReportBuilder()
+    builder.add(tree)
+    builder.add(tree)
+    assert builder.report == merge_reports(get_gas_report(tree), get_gas_report(tree))
+
+
 def test_merge_reports():
     merged = merge_reports(*reports)
     assert merged == {
@@ -53,3 +87,110 @@ def test_merge_single_report():
 
 def test_merge_no_reports():
     assert merge_reports() == {}
+
+
+def test_gas_stats():
+    values = [random.Random(i).randint(21_000, 5_000_000) for i in range(1000)]
+    stats = GasStats.from_values(values)
+    assert stats.count == len(values)
+    assert stats.min == min(values)
+    assert stats.max == max(values)
+    assert stats.mean == statistics.fmean(values)
+    assert stats.variance == pytest.approx(statistics.pvariance(values))
+    assert len(stats.buckets) < 500
+
+    ordered = sorted(values)
+    for q in (0.5, 0.9, 0.99):
+        expected = ordered[int(q * (len(values) - 1))]
+        assert stats.quantile(q) == pytest.approx(expected, rel=GasStats.RELATIVE_ACCURACY)
+
+    assert stats.quantile(0) == min(values)
+    assert stats.quantile(1) == max(values)
+    assert GasStats().quantile(0.5) is None
+
+
+def test_merge_stats_reports():
+    stats_reports = [
+        {c: {m: GasStats.from_values(v) for m, v in methods.items()} for c, methods in r.items()}
+        for r in reports
+    ]
+    merged = merge_reports(*stats_reports)
+    expected = merge_reports(*reports)
+    assert merged == {
+        c: {m: GasStats.from_values(v) for m, v in methods.items()}
+        for c, methods in expected.items()
+    }
+    # The given reports are not modified.
+    assert stats_reports[1][CONTRACT_A][METHOD_A].count == 2
+    assert merge_reports(*reversed(stats_reports)) == merged
+
+
+def test_gas_report_builder_stats(call_tree_data):
+    tree = CallTreeNode(**call_tree_data)
+    builder = GasReportBuilder(stats=True)
+    builder.add(tree)
+    builder.add(tree)
+    expected = merge_reports(get_gas_report(tree), get_gas_report(tree))
+    assert builder.report == {
+        c: {m: GasStats.from_values(v) for m, v in methods.items()}
+        for c, methods in expected.items()
+    }
+
+
+@pytest.fixture(scope="module")
+def trace_payloads():
+    payloads: list = [json.loads((GETH_DATA / "call.json").read_text())]
+    payloads.extend(json.loads(p.read_text()) for p in sorted(PARITY_DATA.glob("*.json")))
+    payloads.append(VMTRACE_CALL_RESPONSE)
+    return payloads * 3
+
+
+def _get_calltree(payload):
+    if isinstance(payload, dict):
+        return get_calltree_from_geth_call_trace(payload, compact=True)
+
+    elif isinstance(payload, list):
+        traces = ParityTraceList.model_validate(payload)
+        return get_calltree_from_parity_trace(traces, compact=True)
+
+    return get_calltree_from_vmtrace(from_rpc_response(payload), compact=True)
+
+
+@pytest.mark.parametrize("stats", (False, True))
+def test_get_parallel_gas_report(trace_payloads, stats):
+    builder = GasReportBuilder(stats=stats)
+    for payload in trace_payloads:
+        builder.add(_get_calltree(payload))
+
+    actual = get_parallel_gas_report(iter(trace_payloads), stats=stats, max_workers=2, chunk_size=4)
+    assert actual == builder.report
+    # The gas costs are in the same order.
+    assert list(actual) == list(builder.report)
+
+
+def test_get_parallel_gas_report_unsupported_payload():
+    with pytest.raises(TypeError):
+        get_parallel_gas_report([123], max_workers=1)
+
+
+def _with_root_trace(response: bytes) -> bytes:
+    data = json.loads(response)
+    action = {"callType": "call", "to": "0x" + "aa" * 20, "value": "0x0", "input": "0x"}
+    data["result"]["trace"] = [{"type": "call", "action": action, "traceAddress": []}]
+    return json.dumps(data).encode()
+
+
+@pytest.mark.parametrize("payload_type", ("dict", "list", "bytes"))
+def test_get_parallel_gas_report_has_gas(trace_payloads, payload_type):
+    payload = next(p for p in trace_payloads if type(p).__name__ == payload_type)
+    if isinstance(payload, bytes):
+        payload = _with_root_trace(payload)
+
+    report = get_parallel_gas_report([payload], max_workers=1)
+    gas_costs = [
+        gas for methods in report.values() for values in methods.values() for gas in values
+    ]
+    assert gas_costs
+    assert all(gas > 0 for gas in gas_costs)
+    if isinstance(payload, bytes):
+        assert HexBytes("aa" * 20) in report
@@ -6,13 +6,21 @@ from eth_pydantic_types import HexBytes
 from eth_utils import to_hex
 from pydantic import ValidationError
 
+from evm_trace.address import CreateAddressResolver, get_create2_address, get_create_address
+from evm_trace.analysis import CallTreeAnalyzer, analyze_geth_trace
+from evm_trace.base import BuildOptions, CompactCallTreeNode, CompactEventNode
 from evm_trace.enums import CallType
 from evm_trace.geth import (
+    GethCallTreeStream,
     TraceFrame,
     create_trace_frames,
     get_calltree_from_geth_call_trace,
     get_calltree_from_geth_trace,
+    stream_calltree_from_geth_trace,
+    stream_events_from_geth_trace,
 )
+from evm_trace.interning import CallTreeInterner
+from evm_trace.stream import CallStreamEventType, build_calltree
 
 
 class TestTraceFrame:
@@ -247,3 +255,289 @@ def test_create_trace_frames_from_geth_create2_struct_logs(
             create2_found = create2_found or frame.op == "CREATE2"
 
     assert create2_found
+
+
+def test_get_calltree_from_geth_call_trace_compact(call_trace_data):
+    expected = get_calltree_from_geth_call_trace(call_trace_data)
+    node = get_calltree_from_geth_call_trace(call_trace_data, compact=True)
+    assert isinstance(node, CompactCallTreeNode)
+    assert node.calls[1].calls[0].depth == 2
+    assert node.to_pydantic() == expected
+
+
+def test_get_calltree_from_geth_call_trace_lazy_bytes(call_trace_data):
+    expected = get_calltree_from_geth_call_trace(call_trace_data)
+    node = get_calltree_from_geth_call_trace(call_trace_data, compact=True, lazy_bytes=True)
+    assert node == get_calltree_from_geth_call_trace(call_trace_data, compact=True)
+    assert node.to_pydantic() == expected
+    assert node.calls[0].calldata.selector == expected.calls[0].calldata[:4]
+
+    with pytest.raises(ValueError):
+        get_calltree_from_geth_call_trace(call_trace_data, lazy_bytes=True)
+
+
+def test_get_call_tree_from_create2_struct_logs_compact(geth_create2_trace_frames):
+    kwargs = {"call_type": CallType.CALL, "address": "0x274b028b03A250cA03644E6c578D81f019eE1323"}
+    expected = get_calltree_from_geth_trace(iter(geth_create2_trace_frames), **kwargs)
+    node = get_calltree_from_geth_trace(iter(geth_create2_trace_frames), compact=True, **kwargs)
+    assert isinstance(node, CompactCallTreeNode)
+    assert node.to_pydantic() == expected
+
+
+def test_get_calltree_from_geth_call_trace_options(call_trace_data):
+    expected = get_calltree_from_geth_call_trace(call_trace_data)
+    options = BuildOptions(max_depth=1, include_calldata=False, include_returndata=False)
+    node = get_calltree_from_geth_call_trace(call_trace_data, options=options)
+    assert len(node.calls) == len(expected.calls)
+    assert all(not c.calls for c in node.calls)
+    assert not node.calldata
+    assert not node.calls[1].returndata
+
+    # The given data is not modified.
+    assert get_calltree_from_geth_call_trace(call_trace_data) == expected
+
+    excluded = expected.calls[1].calls[0].address
+    options = BuildOptions(exclude_addresses=[excluded])
+    node = get_calltree_from_geth_call_trace(call_trace_data, options=options)
+    assert len(node.calls) == len(expected.calls) - 1
+    assert all(c.address != excluded and not c.calls for c in node.calls)
+
+
+def test_get_calltree_from_geth_trace_options(geth_create2_struct_logs, geth_create2_trace_frames):
+    expected = get_calltree_from_geth_trace(iter(geth_create2_trace_frames))
+    options = BuildOptions(max_depth=1, include_calldata=False, include_returndata=False)
+    node = get_calltree_from_geth_trace(iter(geth_create2_trace_frames), options=options)
+    assert [c.call_type for c in node.calls] == [c.call_type for c in expected.calls]
+    assert [c.address for c in node.calls] == [c.address for c in expected.calls]
+    assert all(not c.calls and not c.calldata and not c.returndata for c in node.calls)
+
+    # Only the calls to the included addresses are built.
+    # NOTE: CREATE addresses are only known with the look-ahead of `create_trace_frames()`.
+    included = expected.calls[1].address
+    options = BuildOptions(include_addresses=[included])
+    frames = create_trace_frames(geth_create2_struct_logs)
+    node = get_calltree_from_geth_trace(frames, options=options)
+    assert [c.address for c in node.calls] == [included, included]
+    assert not node.calls[1].calls
+
+
+@pytest.mark.parametrize(
+    "disabled,expected_unavailable",
+    (
+        (("memory",), {"calldata", "returndata"}),
+        (("stack", "storage"), {"address", "calldata", "returndata", "value"}),
+    ),
+)
+def test_get_calltree_from_geth_trace_reduced_fidelity(
+    geth_create2_struct_logs, disabled, expected_unavailable
+):
+    kwargs = {"call_type": CallType.CALL, "address": "0x274b028b03A250cA03644E6c578D81f019eE1323"}
+    expected = get_calltree_from_geth_trace(create_trace_frames(geth_create2_struct_logs), **kwargs)
+    struct_logs = [
+        {k: v for k, v in f.items() if k not in disabled} for f in geth_create2_struct_logs
+    ]
+    unavailable: set[str] = set()
+    actual = get_calltree_from_geth_trace(
+        create_trace_frames(struct_logs), unavailable=unavailable, **kwargs
+    )
+    assert unavailable == expected_unavailable
+
+    # The structure is the same.
+    def get_structure(node):
+        return (node.call_type, node.depth, [get_structure(c) for c in node.calls])
+
+    assert get_structure(actual) == get_structure(expected)
+    if "stack" not in disabled:
+        assert actual == expected
+
+
+def _get_create_struct_logs(sender: bytes) -> list[dict]:
+    # A CREATE and a CREATE2 of the same init code, which is in memory.
+    init_code = "60006000"
+    memory = [init_code.ljust(64, "0")]
+    salt = "0x" + "01".rjust(64, "0")
+    create_address = get_create_address(sender, 5)
+    create2_address = get_create2_address(sender, HexBytes(salt), bytes.fromhex(init_code))
+    frame = {"gas": 1000, "gasCost": 3, "memory": memory}
+    # NOTE: The look-ahead reads the init code using the offset and size below the address.
+    args = ["0x04", "0x00", "0x00", "0x00"]
+    return [
+        {**frame, "pc": 0, "op": "CREATE", "depth": 1, "stack": ["0x04", "0x00", "0x00"]},
+        {**frame, "pc": 0, "op": "STOP", "depth": 2, "memory": []},
+        {**frame, "pc": 1, "op": "POP", "depth": 1, "stack": [*args, to_hex(create_address)]},
+        {**frame, "pc": 2, "op": "CREATE2", "depth": 1, "stack": [salt, "0x04", "0x00", "0x00"]},
+        {**frame, "pc": 0, "op": "STOP", "depth": 2, "memory": []},
+        {**frame, "pc": 3, "op": "POP", "depth": 1, "stack": [*args, to_hex(create2_address)]},
+        {**frame, "pc": 4, "op": "STOP", "depth": 1},
+    ]
+
+
+def test_get_calltree_from_geth_trace_create_resolver():
+    kwargs = {"call_type": CallType.CALL, "address": "0x274b028b03A250cA03644E6c578D81f019eE1323"}
+    sender = HexBytes(kwargs["address"])
+    struct_logs = _get_create_struct_logs(sender)
+    expected = get_calltree_from_geth_trace(create_trace_frames(struct_logs), **kwargs)
+
+    # Without the look-ahead, the addresses are computed at the CREATE frames.
+    resolver = CreateAddressResolver({kwargs["address"]: 5})
+    frames = create_trace_frames(struct_logs, lookahead=False)
+    actual = get_calltree_from_geth_trace(frames, create_resolver=resolver, **kwargs)
+    assert actual == expected
+    assert actual.calls[0].calldata == HexBytes("0x60006000")
+
+    # The CREATE exits at its last frame, instead of the next one.
+    stream = GethCallTreeStream(create_resolver=CreateAddressResolver({sender: 5}), **kwargs)
+    list(stream.start())
+    frames = create_trace_frames(struct_logs, lookahead=False)
+    events = [list(stream.feed(f)) for f in frames]
+    assert events[1][0].event_type == CallStreamEventType.CALL_EXIT
+    assert events[1][0].call.address == expected.calls[0].address
+    assert stream.opcodes is not None
+
+
+def _get_event_struct_logs() -> list[dict]:
+    # The root emits an event, calls a contract which emits events (also using a
+    # DELEGATECALL) then reverts, and deploys a contract emitting an event.
+    memory = ["01".rjust(64, "0")]
+    frame = {"pc": 0, "gas": 1000, "gasCost": 3, "memory": memory}
+
+    def log(depth, *topics):
+        stack = ["0x00", *reversed(topics), "0x20", "0x00"]
+        return {**frame, "op": f"LOG{len(topics)}", "depth": depth, "stack": stack}
+
+    return [
+        log(1, "0x0a"),
+        {**frame, "op": "CALL", "depth": 1, "stack": ["0x00", to_hex(CALLEE), "0xffff"]},
+        log(2, "0x0b", "0x01"),
+        {**frame, "op": "DELEGATECALL", "depth": 2, "stack": ["0x00", to_hex(LIBRARY), "0xff"]},
+        log(3, "0x0c"),
+        {**frame, "op": "RETURN", "depth": 3, "stack": ["0x00", "0x00"]},
+        # Back in the caller, with the result of the call on the top of the stack.
+        {**frame, "op": "POP", "depth": 2, "stack": ["0x01"]},
+        {**frame, "op": "REVERT", "depth": 2, "stack": ["0x00", "0x00"]},
+        {**frame, "op": "CREATE", "depth": 1, "stack": ["0x00", "0x00", "0x00", "0x00"]},
+        log(2, "0x0d"),
+        {**frame, "op": "RETURN", "depth": 2, "stack": ["0x00", "0x00"]},
+        {**frame, "op": "POP", "depth": 1, "stack": ["0x00", "0x00", to_hex(DEPLOYED)]},
+        {**frame, "op": "STOP", "depth": 1, "stack": []},
+    ]
+
+
+ROOT = HexBytes("0x274b028b03A250cA03644E6c578D81f019eE1323")
+CALLEE = HexBytes("0x" + "11" * 20)
+LIBRARY = HexBytes("0x" + "22" * 20)
+DEPLOYED = HexBytes("0x" + "33" * 20)
+
+
+def test_stream_events_from_geth_trace():
+    struct_logs = _get_event_struct_logs()
+    events = list(stream_events_from_geth_trace(struct_logs, address=ROOT))
+    # Reverted events are yielded once the call reverts.
+    assert [(e.address, e.reverted, e.index) for e in events] == [
+        (CALLEE, True, 1),
+        (CALLEE, True, 2),
+        (ROOT, False, 0),
+        (DEPLOYED, False, 3),
+    ]
+    assert events[0].event.topics == [HexBytes("0x0b"), HexBytes("0x01")]
+
+    # The same events as in the call tree.
+    calltree = get_calltree_from_geth_trace(
+        create_trace_frames(struct_logs), call_type=CallType.CALL, address=ROOT
+    )
+    expected = [*calltree.events, *calltree.calls[0].events, *calltree.calls[0].calls[0].events]
+    expected.extend(calltree.calls[1].events)
+    assert [e.event for e in sorted(events, key=lambda e: e.index)] == expected
+
+    # Decoded frames work the same, and a failed transaction reverts every event.
+    frames = [TraceFrame.model_validate(f) for f in struct_logs]
+    events = list(stream_events_from_geth_trace(frames, compact=True, failed=True, address=ROOT))
+    assert len(events) == 4
+    assert all(e.reverted for e in events)
+    assert isinstance(events[-1].event, CompactEventNode)
+
+
+def test_stream_events_from_geth_trace_failed_create():
+    # The first CREATE fails before running, so it does not use the nonce of the root.
+    memory = ["01".rjust(64, "0")]
+    frame = {"pc": 0, "gas": 1000, "gasCost": 3, "memory": memory}
+    create = {**frame, "op": "CREATE", "depth": 1, "stack": ["0x00", "0x00", "0x00", "0x00"]}
+    address = get_create_address(ROOT, 5)
+    struct_logs = [
+        create,
+        {**frame, "op": "POP", "depth": 1, "stack": ["0x00"]},
+        create,
+        {**frame, "op": "LOG0", "depth": 2, "stack": ["0x00", "0x20", "0x00"]},
+        {**frame, "op": "STOP", "depth": 2, "stack": []},
+        {**frame, "op": "POP", "depth": 1, "stack": [to_hex(address)]},
+        {**frame, "op": "STOP", "depth": 1, "stack": []},
+    ]
+    resolver = CreateAddressResolver({ROOT: 5})
+    events = list(
+        stream_events_from_geth_trace(struct_logs, create_resolver=resolver, address=ROOT)
+    )
+    assert [e.address for e in events] == [address]
+    assert resolver.nonces[ROOT] == 6
+
+    frames = create_trace_frames(struct_logs, lookahead=False)
+    resolver = CreateAddressResolver({ROOT: 5})
+    stream = stream_calltree_from_geth_trace(frames, create_resolver=resolver, address=ROOT)
+    calltree = build_calltree(stream)
+    assert [(c.address, c.failed) for c in calltree.calls] == [
+        (HexBytes(20 * b"\x00"), True),
+        (address, False),
+    ]
+    assert calltree.calls[1].events
+    assert resolver.nonces[ROOT] == 6
+
+
+def test_get_calltree_from_geth_trace_compact_events():
+    struct_logs = _get_event_struct_logs()
+    expected = get_calltree_from_geth_trace(create_trace_frames(struct_logs), address=ROOT)
+    node = get_calltree_from_geth_trace(
+        create_trace_frames(struct_logs), compact=True, address=ROOT
+    )
+    assert isinstance(node.events[0], CompactEventNode)
+    assert node.to_pydantic() == expected
+
+    interner = CallTreeInterner()
+    frames = create_trace_frames(struct_logs)
+    node = get_calltree_from_geth_trace(frames, compact=True, interner=interner, address=ROOT)
+    assert node.to_pydantic() == expected
+
+    analyzer = CallTreeAnalyzer(compact=True, address=ROOT)
+    assert analyze_geth_trace(struct_logs, [analyzer])[0].to_pydantic() == expected
+
+
+def test_create_resolver_reverted_call():
+    # The root calls itself, deploys a contract then reverts, so the nonce is reverted and
+    # the next deployment gets the same address.
+    kwargs = {"call_type": CallType.CALL, "address": ROOT}
+    address = get_create_address(ROOT, 5)
+    frame = {"gas": 1000, "gasCost": 3, "memory": []}
+    args = ["0x04", "0x00", "0x00", "0x00"]
+    call_stack = ["0x00", "0x00", "0x00", "0x00", "0x00", to_hex(ROOT), "0xffff"]
+    struct_logs = [
+        {**frame, "pc": 0, "op": "CALL", "depth": 1, "stack": call_stack},
+        {**frame, "pc": 0, "op": "CREATE", "depth": 2, "stack": ["0x04", "0x00", "0x00"]},
+        {**frame, "pc": 0, "op": "STOP", "depth": 3},
+        {**frame, "pc": 1, "op": "POP", "depth": 2, "stack": [*args, to_hex(address)]},
+        {**frame, "pc": 2, "op": "REVERT", "depth": 2, "stack": ["0x00", "0x00"]},
+        {**frame, "pc": 1, "op": "POP", "depth": 1, "stack": ["0x00"]},
+        {**frame, "pc": 2, "op": "CREATE", "depth": 1, "stack": ["0x04", "0x00", "0x00"]},
+        {**frame, "pc": 0, "op": "STOP", "depth": 2},
+        {**frame, "pc": 3, "op": "POP", "depth": 1, "stack": [*args, to_hex(address)]},
+        {**frame, "pc": 4, "op": "STOP", "depth": 1},
+    ]
+    expected = get_calltree_from_geth_trace(create_trace_frames(struct_logs), **kwargs)
+    assert expected.calls[1].address == address
+
+    frames = create_trace_frames(struct_logs, lookahead=False)
+    resolver = CreateAddressResolver({ROOT: 5})
+    assert get_calltree_from_geth_trace(frames, create_resolver=resolver, **kwargs) == expected
+
+    resolver = CreateAddressResolver({ROOT: 5})
+    stream = stream_calltree_from_geth_trace(
+        create_trace_frames(struct_logs, lookahead=False), create_resolver=resolver, **kwargs
+    )
+    assert build_calltree(stream) == expected
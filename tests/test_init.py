@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import pytest
+
+import evm_trace
+
+HEAVY_MODULES = ("cchecksum", "eth", "eth_pydantic_types", "eth_utils", "msgspec", "pydantic")
+
+
+def _get_loaded_modules(code: str) -> set[str]:
+    # A fresh interpreter, since the tests have already imported everything.
+    code = f"import sys; {code}; print(','.join(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return set(result.stdout.strip().split(","))
+
+
+def test_import_does_not_load_heavy_modules():
+    loaded = _get_loaded_modules("import evm_trace")
+    assert not loaded.intersection(HEAVY_MODULES)
+
+
+def test_import_does_not_load_submodules():
+    # NOTE: Checked instead of timing the import, which is flaky on busy machines.
+    loaded = _get_loaded_modules("import evm_trace")
+    assert {m for m in loaded if m.startswith("evm_trace.")} == set()
+
+
+def test_attribute_access_loads_submodule():
+    loaded = _get_loaded_modules("import evm_trace; evm_trace.CallType")
+    assert "evm_trace.enums" in loaded
+    assert "evm_trace.geth" not in loaded
+
+
+@pytest.mark.parametrize("name", evm_trace.__all__)
+def test_lazy_attributes(name):
+    value = getattr(evm_trace, name)
+    module = __import__(evm_trace._LAZY_IMPORTS[name], fromlist=[name])
+    assert value is getattr(module, name)
+    assert name in dir(evm_trace)
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        evm_trace.potato
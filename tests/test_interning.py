@@ -0,0 +1,118 @@
+import pytest
+
+from evm_trace.base import CallTreeNode, LazyHexBytes
+from evm_trace.diff import diff_calltrees
+from evm_trace.geth import get_calltree_from_geth_call_trace, get_calltree_from_geth_trace
+from evm_trace.interning import CallTreeInterner
+from evm_trace.parity import get_calltree_from_parity_trace
+
+
+def _count_nodes(root) -> tuple[int, int]:
+    total = 0
+    unique = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        total += 1
+        unique.add(id(node))
+        stack.extend(node.calls)
+
+    return total, len(unique)
+
+
+@pytest.fixture
+def repeated_calltree(call_trace_data):
+    calltree = get_calltree_from_geth_call_trace(call_trace_data)
+    call = calltree.calls[0]
+    calltree.calls = [call.model_copy(deep=True) for _ in range(10)]
+    return calltree
+
+
+def test_intern_tree(repeated_calltree):
+    expected = repeated_calltree.model_copy(deep=True)
+    interner = CallTreeInterner()
+    actual = interner.intern_tree(repeated_calltree)
+    assert actual == expected
+    assert diff_calltrees(expected, actual) is None
+    assert all(c is actual.calls[0] for c in actual.calls)
+
+    total, unique = _count_nodes(actual)
+    assert total == _count_nodes(expected)[0]
+    assert unique < total
+    assert len(interner) <= unique
+
+
+def test_intern_tree_shares_bytes(repeated_calltree):
+    other = repeated_calltree.model_copy(deep=True)
+    interner = CallTreeInterner()
+    first = interner.intern_tree(repeated_calltree)
+    second = interner.intern_tree(other)
+    assert second is first
+    assert interner.intern_bytes(bytes(first.address)) is not first.address
+    assert interner.intern_bytes(type(first.address)(first.address)) is first.address
+
+
+def test_intern_tree_compact(call_trace_data):
+    expected = get_calltree_from_geth_call_trace(call_trace_data, compact=True)
+    actual = get_calltree_from_geth_call_trace(
+        call_trace_data, compact=True, interner=CallTreeInterner()
+    )
+    assert actual == expected
+
+
+def test_get_calltree_from_geth_trace(geth_create2_trace_frames):
+    expected = get_calltree_from_geth_trace(geth_create2_trace_frames)
+    actual = get_calltree_from_geth_trace(
+        iter(list(geth_create2_trace_frames)), interner=CallTreeInterner()
+    )
+    assert isinstance(actual, CallTreeNode)
+    assert actual.model_dump() == expected.model_dump()
+
+
+def test_get_calltree_from_parity_trace(parity_create2_trace_list):
+    expected = get_calltree_from_parity_trace(parity_create2_trace_list)
+    interner = CallTreeInterner()
+    actual = get_calltree_from_parity_trace(parity_create2_trace_list, interner=interner)
+    assert actual == expected
+    assert len(interner) == _count_nodes(actual)[1]
+
+
+def test_intern_node_hash_collision(monkeypatch):
+    # Every node hashes the same, only equal nodes may be shared.
+    monkeypatch.setattr("evm_trace.interning.hash_node", lambda *_, **__: b"\x00" * 16)
+    address = "0x274b028b03A250cA03644E6c578D81f019eE1323"
+    nodes = [
+        CallTreeNode(call_type="CALL", address=address, events=[{"depth": 0, "topics": topics}])
+        for topics in (["0x0102", "0x03"], ["0x01", "0x0203"], ["0x0102", "0x03"])
+    ]
+    interner = CallTreeInterner()
+    first, second, third = [interner.intern_node(n) for n in nodes]
+    assert second is not first
+    assert second.events[0].topics == nodes[1].events[0].topics
+    assert third is first
+    assert len(interner) == 2
+
+
+def test_intern_tree_lazy_bytes(call_trace_data):
+    expected = get_calltree_from_geth_call_trace(call_trace_data, compact=True)
+    calltrees = [
+        get_calltree_from_geth_call_trace(call_trace_data, compact=True, lazy_bytes=True)
+        for _ in range(2)
+    ]
+    interner = CallTreeInterner()
+    first, second = (interner.intern_tree(calltree) for calltree in calltrees)
+    assert second is first
+
+    # Nothing was decoded.
+    stack = [first]
+    while stack:
+        node = stack.pop()
+        assert all(
+            isinstance(v, LazyHexBytes) and v._get_undecoded() is not None
+            for v in (node.calldata, node.returndata)
+            if isinstance(v, LazyHexBytes)
+        )
+        stack.extend(node.calls)
+
+    assert isinstance(first.calldata, LazyHexBytes)
+    assert first.to_pydantic() == expected.to_pydantic()
@@ -2,6 +2,7 @@ from pathlib import Path
 
 import pytest
 
+from evm_trace.base import BuildOptions, CompactCallTreeNode
 from evm_trace.parity import ParityTraceList, get_calltree_from_parity_trace
 
 from .expected_traces import (
@@ -46,3 +47,40 @@ def test_create2(parity_create2_trace_list):
     actual = repr(call_tree)
     expected = PARITY_CREATE2_EXPECTED_OUTPUT.strip()
     assert actual == expected
+
+
+def test_compact(parity_create2_trace_list):
+    call_tree = get_calltree_from_parity_trace(parity_create2_trace_list, compact=True)
+    assert isinstance(call_tree, CompactCallTreeNode)
+    assert repr(call_tree) == PARITY_CREATE2_EXPECTED_OUTPUT.strip()
+
+
+def test_lazy_bytes(parity_create2_trace_list):
+    expected = get_calltree_from_parity_trace(parity_create2_trace_list)
+    call_tree = get_calltree_from_parity_trace(
+        parity_create2_trace_list, compact=True, lazy_bytes=True
+    )
+    assert call_tree == get_calltree_from_parity_trace(parity_create2_trace_list, compact=True)
+    assert call_tree.to_pydantic() == expected
+    assert repr(call_tree) == PARITY_CREATE2_EXPECTED_OUTPUT.strip()
+
+
+def test_options():
+    traces = ParityTraceList.model_validate_json((DATA_PATH / "call.json").read_text())
+    expected = get_calltree_from_parity_trace(traces)
+    options = BuildOptions(max_depth=2, include_calldata=False, include_returndata=False)
+    call_tree = get_calltree_from_parity_trace(traces, options=options)
+    assert call_tree.address == expected.address
+    assert not call_tree.calldata
+    assert not call_tree.calls[0].calls[0].returndata
+    assert all(not c.calls for c in call_tree.calls[0].calls)
+
+    dai = "0x6b175474e89094c44da98b954eedeac495271d0f"
+    call_tree = get_calltree_from_parity_trace(
+        traces, options=BuildOptions(exclude_addresses=[dai])
+    )
+    stack = [call_tree]
+    while stack:
+        node = stack.pop()
+        assert node.address.hex() != dai[2:]
+        stack.extend(node.calls)
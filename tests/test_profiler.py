@@ -0,0 +1,42 @@
+from evm_trace.geth import create_trace_frames
+from evm_trace.profiler import OpcodeProfiler, get_opcode_profile
+from evm_trace.vmtrace import from_rpc_response, to_trace_frames
+
+ADDRESS = bytes.fromhex("274b028b03a250ca03644e6c578d81f019ee1323")
+
+
+def test_get_opcode_profile(geth_create2_struct_logs):
+    profile = get_opcode_profile(create_trace_frames(geth_create2_struct_logs), address=ADDRESS)
+    first, last = geth_create2_struct_logs[0], geth_create2_struct_logs[-1]
+    # Exclusive gas adds up to the gas used by the transaction.
+    total_gas = first["gas"] - last["gas"] + last["gasCost"]
+    assert sum(e.exclusive_gas for e in profile.values()) == total_gas
+
+    (call_key,) = [k for k in profile if k[0] == ADDRESS and k[2] == "CALL"]
+    call = profile[call_key]
+    assert call.count == 1
+    assert call.exclusive_gas < call.inclusive_gas
+    # The sub-call runs within the root call.
+    assert call.inclusive_gas < total_gas
+
+    sstore = next(e for k, e in profile.items() if k[2] == "SSTORE")
+    assert sstore.inclusive_gas == sstore.exclusive_gas
+
+
+def test_get_opcode_totals(geth_create2_struct_logs):
+    profiler = OpcodeProfiler(address=ADDRESS)
+    profiler.add_frames(create_trace_frames(geth_create2_struct_logs))
+    totals = profiler.get_opcode_totals()
+    assert totals[(ADDRESS, "CALL")].count == 1
+    push1_count = sum(e.count for k, e in profiler.profile.items() if k[2] == "PUSH1")
+    assert sum(e.count for k, e in totals.items() if k[1] == "PUSH1") == push1_count
+
+
+def test_get_opcode_profile_vmtrace(vmtrace_call_response):
+    trace = from_rpc_response(vmtrace_call_response)
+    profile = get_opcode_profile(to_trace_frames(trace, address=f"0x{'aa' * 20}"))
+    assert {address for address, _, _ in profile} == {b"\xaa" * 20, b"\xbb" * 20}
+    # Both contracts run SSTOREs, in separate calls.
+    sstores = {k[0]: e for k, e in profile.items() if k[2] == "SSTORE"}
+    assert sstores[b"\xbb" * 20].inclusive_gas == 20000
+    assert sum(e.count for k, e in profile.items() if k[2] == "CALL") == 2
@@ -0,0 +1,70 @@
+import pytest
+
+from evm_trace.base import CompactCallTreeNode
+from evm_trace.enums import CallType
+from evm_trace.geth import get_calltree_from_geth_call_trace
+from evm_trace.query import CallTreeQuery
+
+CONTRACT_A = "0xBcF7FFFD8B256Ec51a36782a52D0c34f6474D951"
+CONTRACT_B = "0x274b028b03A250cA03644E6c578D81f019eE1323"
+TOPIC = "0x" + "ab" * 32
+
+
+@pytest.fixture
+def query(call_trace_data):
+    return CallTreeQuery(get_calltree_from_geth_call_trace(call_trace_data))
+
+
+def test_find_calls_by_address(query):
+    calls = query.find_calls(address=CONTRACT_B)
+    assert len(calls) == 11
+    assert all(c.address == bytes.fromhex(CONTRACT_B[2:]) for c in calls)
+
+
+def test_find_calls_by_selector(query):
+    calls = query.find_calls(selector="0x878fb701")
+    assert [c.gas_cost for c in calls] == [41458, 33858, 25758, 25758]
+
+
+def test_find_calls_combined(query):
+    calls = query.find_calls(address=CONTRACT_A, call_type=CallType.STATICCALL)
+    assert len(calls) == 1
+    assert calls[0].calldata[:4] == bytes.fromhex("9155fd57")
+    assert query.find_calls(address=CONTRACT_A, selector="0x878fb701") == []
+    assert len(query.find_calls(call_type="STATICCALL", failed=False)) == 6
+
+
+def test_find_calls_no_criteria(query):
+    assert query.find_calls() == query.nodes
+    assert len(query.nodes) == 19
+
+
+def test_indexes_are_cached(query):
+    assert query.by_address is query.by_address
+
+
+def test_find_failed_calls_and_events():
+    tree = CompactCallTreeNode.from_kwargs(
+        call_type="CALL",
+        calls=[
+            {"call_type": "CALL", "failed": True, "depth": 1},
+            {
+                "call_type": "DELEGATECALL",
+                "depth": 1,
+                "events": [{"depth": 1, "topics": [TOPIC]}, {"depth": 1, "topics": ["0x01"]}],
+            },
+        ],
+    )
+    query = CallTreeQuery(tree)
+    assert query.find_calls(failed=True) == [tree.calls[0]]
+    assert query.find_calls(call_type=CallType.DELEGATECALL, failed=True) == []
+    assert query.find_events(TOPIC) == [tree.calls[1].events[0]]
+
+
+def test_id_sets_are_cached(query):
+    calls = query.find_calls(address=CONTRACT_A, call_type=CallType.STATICCALL)
+    # Only the larger index is converted to a set.
+    assert len(query._id_sets) == 1
+    (ids,) = query._id_sets.values()
+    assert query.find_calls(address=CONTRACT_A, call_type=CallType.STATICCALL) == calls
+    assert next(iter(query._id_sets.values())) is ids
@@ -0,0 +1,147 @@
+import copy
+import json
+
+import pytest
+
+from evm_trace.enums import CallType
+from evm_trace.geth import (
+    get_calltree_from_geth_call_trace,
+    get_calltree_from_geth_trace,
+    stream_calltree_from_geth_call_trace,
+    stream_calltree_from_geth_trace,
+)
+from evm_trace.parity import get_calltree_from_parity_trace, stream_calltree_from_parity_trace
+from evm_trace.stream import CallStreamEventType, CallTreeListener, build_calltree, dispatch
+from evm_trace.vmtrace import from_rpc_response, get_calltree_from_vmtrace
+
+CALLER = f"0x{'aa' * 20}"
+
+
+class RecordingListener(CallTreeListener):
+    def __init__(self):
+        self.open_calls = []
+        self.max_open_calls = 0
+        self.exited = []
+
+    def on_call_enter(self, call):
+        self.open_calls.append(call)
+        self.max_open_calls = max(self.max_open_calls, len(self.open_calls))
+
+    def on_call_exit(self, call):
+        assert self.open_calls.pop() is call
+        self.exited.append(call)
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_stream_calltree_from_geth_trace(geth_create2_trace_frames, compact):
+    expected = get_calltree_from_geth_trace(iter(geth_create2_trace_frames), compact=compact)
+    actual = build_calltree(
+        stream_calltree_from_geth_trace(iter(geth_create2_trace_frames), compact=compact)
+    )
+    assert actual == expected
+    # The CREATE addresses are set by the time the calls exit.
+    assert actual.calls[0].call_type == CallType.CREATE2
+    assert actual.calls[0].address == expected.calls[0].address
+
+
+def test_stream_calltree_from_geth_trace_listener(geth_create2_trace_frames):
+    listener = RecordingListener()
+    dispatch(stream_calltree_from_geth_trace(iter(geth_create2_trace_frames)), listener)
+    assert not listener.open_calls
+    assert len(listener.exited) == 5
+    assert listener.max_open_calls == 4
+    # Calls exit in postorder.
+    assert listener.exited[-1].call_type == CallType.CALL
+    assert listener.exited[0].call_type == CallType.CREATE2
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_stream_calltree_from_geth_call_trace(call_trace_data, compact):
+    expected = get_calltree_from_geth_call_trace(copy.deepcopy(call_trace_data), compact=compact)
+    stream = list(
+        stream_calltree_from_geth_call_trace(copy.deepcopy(call_trace_data), compact=compact)
+    )
+    assert stream[0].event_type == CallStreamEventType.CALL_ENTER
+    assert stream[-1].event_type == CallStreamEventType.CALL_EXIT
+    assert stream[0].call is stream[-1].call
+    assert not stream[0].call.calls
+    assert build_calltree(stream) == expected
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_stream_calltree_from_parity_trace(parity_create2_trace_list, compact):
+    expected = get_calltree_from_parity_trace(
+        parity_create2_trace_list, compact=compact, gas_cost=123
+    )
+    actual = build_calltree(
+        stream_calltree_from_parity_trace(parity_create2_trace_list, compact=compact, gas_cost=123)
+    )
+    assert actual == expected
+
+
+def test_get_calltree_from_vmtrace(vmtrace_call_response):
+    trace = from_rpc_response(vmtrace_call_response)
+    calltree = get_calltree_from_vmtrace(trace, address=CALLER)
+    assert calltree.address == bytes.fromhex("aa" * 20)
+    assert calltree.depth == 0
+    assert not calltree.failed
+    assert [c.address for c in calltree.calls] == [
+        bytes.fromhex("aa" * 20),
+        bytes.fromhex("bb" * 20),
+    ]
+    failed_call, call = calltree.calls
+    assert failed_call.failed
+    assert not call.failed
+    assert call.depth == 1
+    assert call.calldata == bytes.fromhex("a9059cbb")
+
+    compact = get_calltree_from_vmtrace(trace, address=CALLER, compact=True)
+    assert compact.to_pydantic() == calltree
+
+
+def _get_vmtrace_response(*ops: tuple[str, list[str], dict | None]) -> bytes:
+    vm_ops = [
+        {
+            "pc": pc,
+            "cost": 3,
+            "ex": {"used": 1000 - pc, "push": push, "mem": mem, "store": None},
+            "sub": None,
+            "op": op,
+            "idx": str(pc),
+        }
+        for pc, (op, push, mem) in enumerate(ops)
+    ]
+    vmtrace = {"code": "0x", "ops": vm_ops}
+    result = {"output": "0x", "stateDiff": None, "trace": [], "vmTrace": vmtrace}
+    return json.dumps({"jsonrpc": "2.0", "id": 1, "result": result}).encode()
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_get_calltree_from_vmtrace_log0_and_huge_sizes(compact):
+    topic = "0x" + "ab" * 32
+    response = _get_vmtrace_response(
+        ("PUSH1", ["0x40"], None),
+        ("PUSH1", ["0x0"], None),
+        ("PUSH1", ["0x0"], None),
+        ("CALLDATACOPY", [], {"off": 0, "data": "0x" + "11" * 64}),
+        # LOG0 without topics, then LOG1 with a size far larger than memory.
+        ("PUSH1", ["0x20"], None),
+        ("PUSH1", ["0x0"], None),
+        ("LOG0", [], None),
+        ("PUSH32", [topic], None),
+        ("PUSH32", [f"0x{2**255:x}"], None),
+        ("PUSH1", ["0x20"], None),
+        ("LOG1", [], None),
+        ("PUSH32", [f"0x{2**255:x}"], None),
+        ("PUSH1", ["0x0"], None),
+        ("RETURN", [], None),
+    )
+    calltree = get_calltree_from_vmtrace(
+        from_rpc_response(response), address=CALLER, compact=compact
+    )
+    assert len(calltree.events) == 1
+    (event,) = calltree.events
+    assert event.topics == [bytes.fromhex("ab" * 32)]
+    assert event.selector == bytes.fromhex("ab" * 32)
+    assert event.data == bytes.fromhex("11" * 32)
+    assert calltree.returndata == bytes.fromhex("11" * 64)
@@ -0,0 +1,116 @@
+import pytest
+
+from evm_trace.vmtrace import (
+    MemorySnapshot,
+    PagedMemory,
+    StorageOverlay,
+    from_rpc_response,
+    to_trace_frames,
+)
+
+ROOT_ADDRESS = "0x" + "aa" * 20
+OTHER_ADDRESS = "0x" + "bb" * 20
+
+
+@pytest.fixture
+def vmtrace(vmtrace_call_response):
+    return from_rpc_response(vmtrace_call_response)
+
+
+class TestStorageOverlay:
+    def test_checkpoint_and_rollback(self):
+        storage = StorageOverlay()
+        storage.set(ROOT_ADDRESS, 1, 5)
+        checkpoint = storage.checkpoint()
+        before = storage.view(ROOT_ADDRESS)
+        storage.set(ROOT_ADDRESS, 1, 6)
+        storage.set(ROOT_ADDRESS, 2, 7)
+        during = storage.view(ROOT_ADDRESS)
+
+        storage.rollback(checkpoint)
+        assert storage.view(ROOT_ADDRESS) == {1: 5}
+        assert storage.get(ROOT_ADDRESS, 2) is None
+
+        # Views are unaffected by later writes or rollbacks.
+        assert before == {1: 5}
+        assert during == {1: 6, 2: 7}
+
+    def test_addresses_are_case_insensitive(self):
+        storage = StorageOverlay()
+        storage.set(ROOT_ADDRESS.upper(), 1, 5)
+        assert storage.get(ROOT_ADDRESS, 1) == 5
+
+
+def test_to_trace_frames_storage(vmtrace):
+    frames = list(to_trace_frames(vmtrace, address=ROOT_ADDRESS))
+    sub_frames = [f for f in frames if f.depth == 2]
+
+    # Storage written by the root is visible when it is re-entered.
+    reverted_call = [f for f in sub_frames if f.address.lower() == ROOT_ADDRESS]
+    assert reverted_call[0].storage == {1: 5}
+    assert reverted_call[-1].op == "REVERT"
+    assert reverted_call[-1].storage == {1: 5, 2: 7}
+
+    # The reverted write is rolled back, the other contract's storage is separate.
+    assert frames[-1].op == "STOP"
+    assert frames[-1].storage == {1: 5}
+    other_call = [f for f in sub_frames if f.address.lower() == OTHER_ADDRESS]
+    assert other_call[-1].storage == {3: 9}
+
+
+class TestPagedMemory:
+    def test_snapshot_is_copy_on_write(self):
+        memory = PagedMemory(page_size=64)
+        memory.extend(0, 128)
+        memory.write(0, 4, b"\x01\x02\x03\x04")
+        snapshot = memory.snapshot()
+
+        # Nothing changed, so the snapshot is re-used.
+        assert memory.snapshot() is snapshot
+
+        memory.write(64, 2, b"\xff\xff")
+        new_snapshot = memory.snapshot()
+        assert snapshot[64:66] == b"\x00\x00"
+        assert new_snapshot[64:66] == b"\xff\xff"
+
+        # The untouched page is shared, the written one is not.
+        assert new_snapshot._get_page(0) is snapshot._get_page(0)
+        assert new_snapshot._get_page(1) is not snapshot._get_page(1)
+
+    def test_snapshot_shares_clean_chunks(self):
+        memory = PagedMemory(page_size=64, chunk_pages=2)
+        memory.extend(0, 64 * 5)
+        snapshot = memory.snapshot()
+        assert [len(c) for c in snapshot._chunks] == [2, 2, 1]
+
+        memory.write(64 * 2, 1, b"\x01")
+        memory.extend(0, 64 * 6)
+        new_snapshot = memory.snapshot()
+        assert [len(c) for c in new_snapshot._chunks] == [2, 2, 2]
+        assert new_snapshot._chunks[0] is snapshot._chunks[0]
+        assert new_snapshot._chunks[1] is not snapshot._chunks[1]
+        assert new_snapshot._get_page(3) is snapshot._get_page(3)
+        assert snapshot[128:129] == b"\x00"
+        assert new_snapshot[128:129] == b"\x01"
+        assert bytes(new_snapshot) == bytes(128) + b"\x01" + bytes(255)
+
+    def test_write_across_pages(self):
+        memory = PagedMemory(page_size=64)
+        memory.extend(0, 100)
+        assert len(memory) == 128
+        data = bytes(range(40))
+        memory.write(50, 40, data)
+        assert memory.read(50, 40) == data
+        assert bytes(memory.snapshot()) == bytes(50) + data + bytes(38)
+
+    def test_write_out_of_bounds(self):
+        memory = PagedMemory()
+        with pytest.raises(ValueError):
+            memory.write(0, 1, b"\x01")
+
+
+def test_to_trace_frames_snapshot_memory(vmtrace):
+    expected = [f.memory for f in to_trace_frames(vmtrace, address=ROOT_ADDRESS)]
+    frames = list(to_trace_frames(vmtrace, address=ROOT_ADDRESS, snapshot_memory=True))
+    assert all(isinstance(f.memory, MemorySnapshot) for f in frames)
+    assert [f.memory for f in frames] == expected